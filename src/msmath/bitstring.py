@@ -5,7 +5,7 @@ __all__ = ['bitstrings']
 # big-endian version implemented with list of ints
 
 from . conversions import isint, lmap, xrange, bit_length
-from . numfuns import xm2gcd
+from . numfuns import xm2gcd, m2mul
 
 inf = float('inf');
 
@@ -867,12 +867,8 @@ def __imul__(self,n) :
       raise TypeError('bitstrings must have same length');
     if l :
       B = self._B;
-      k = l-1;
-      s = __int__(self);
-      x = s if n[k] else 0;
-      for i in xrange(k) :
-        s = (s>>1) | ((s&1) << k);
-        if n[i] : x ^= s;
+      x = m2mul(__int__(self),__int__(n));
+      x = x&((1<<l)-1) ^ x>>l;    # mod x^l-1
       if l <= B :
         self._x = x;
       else :
@@ -0,0 +1,406 @@
+""" arrays of finite field elements """
+from __future__ import division
+
+__all__ = ['ffarray']
+
+from functools import reduce
+
+from . ffield import ffield
+from . conversions import isint, isffield, xrange
+from . numfuns import m2mul, xm2gcd
+from . matrix import batch_inverse
+
+try :
+  import numpy as np
+  U = np.uint64;
+except Exception :
+  np = None;
+
+_nptables = {};    # ffield -> (_exp, numpy _exp, numpy _log)
+
+def _npt(F) :
+  """Return numpy versions of F's exp/log tables, or None if F has no tables"""
+  if not '_exp' in F.__dict__ : return None;
+  try :
+    t = _nptables[F];
+    if t[0] is F._exp : return t[1:];
+  except KeyError :
+    pass;
+  t = _nptables[F] = (F._exp,np.array(F._exp,dtype=U),np.array(F._log,dtype=U));
+  return t[1:];
+
+def _digits(F,a) :
+  """Return a list of the n coefficient arrays of a, constant term first"""
+  p = U(F._p);
+  d = [];
+  for _ in xrange(F._n) :
+    d.append(a%p);
+    a = a//p;
+  return d;
+
+def _undigits(F,d) :
+  """Return the packed array with coefficient arrays d, constant term first"""
+  p = U(F._p);
+  a = d[-1].copy();
+  for c in reversed(d[:-1]) :
+    a *= p;
+    a += c;
+  return a;
+
+def _npadd(F,a,b) :
+  """Return the elementwise sum of packed arrays a and b"""
+  p = F._p;
+  if p == 2 : return a^b;
+  if F._n == 1 :
+    d = U(p)-b;
+    return np.where(a>=d,a-d,a+b);
+  p = U(p);
+  return _undigits(F,[(u+v)%p for u,v in zip(_digits(F,a),_digits(F,b))]);
+
+def _npneg(F,a) :
+  """Return the elementwise additive inverse of packed array a"""
+  p = F._p;
+  if p == 2 : return a.copy();
+  p = U(p);
+  if F._n == 1 : return np.where(a,p-a,a);
+  return _undigits(F,[(p-u)%p for u in _digits(F,a)]);
+
+def _npmul(F,a,b) :
+  """Return the elementwise product of packed arrays a and b"""
+  t = _npt(F);
+  if t :
+    exp,log = t;
+    c = exp[log[a]+log[b]];
+    c[(a==0)|(b==0)] = 0;
+    return c;
+  p = F._p;
+  n = F._n;
+  if n == 1 :
+    if p <= 1<<32 : return a*b%U(p);
+    return (a.astype(object)*b.astype(object)%p).astype(U);
+  if p == 2 :
+    g = U(F._poly);
+    h = U(n-1);
+    N = U((1<<(n-1))-1);
+    one = U(1);
+    c = np.zeros_like(a);
+    for i in reversed(xrange(n)) :
+      c = ((c&N)<<one)^(c>>h)*g;
+      c ^= a*((b>>U(i))&one);
+    return c;
+  p = U(p);
+  A = _digits(F,a);
+  B = _digits(F,b);
+  C = [np.zeros_like(a) for _ in xrange(2*n-1)];
+  for i in xrange(n) :
+    for j in xrange(n) :
+      C[i+j] = (C[i+j]+A[i]*B[j]%p)%p;
+  m = F._tupoly;    # x**n = -(m[1]*x**(n-1)+...+m[n])
+  for k in reversed(xrange(n,2*n-1)) :
+    c = C[k];
+    for j in xrange(n) :
+      if m[n-j] :
+        C[k-n+j] = (C[k-n+j]+c*(p-U(m[n-j]))%p)%p;
+  return _undigits(F,C[:n]);
+
+def _nppow(F,a,e) :
+  """Return the elementwise e-th power of packed array a, e >= 0"""
+  t = _npt(F);
+  if t :
+    exp,log = t;
+    o = U(F._q-1);
+    c = exp[log[a]*(U(e)%o)%o];
+    if e : c[a==0] = 0;
+    return c;
+  c = np.ones_like(a);
+  if not e : return c;
+  b = a;
+  e0 = e;
+  e %= F._q-1;
+  while e :
+    if e&1 : c = _npmul(F,c,b);
+    e >>= 1;
+    if e : b = _npmul(F,b,b);
+  if not e0%(F._q-1) : c[a==0] = 0;
+  return c;
+
+def _npinv(F,a) :
+  """Return the elementwise multiplicative inverse of packed array a"""
+  if not a.all() : raise ZeroDivisionError;
+  t = _npt(F);
+  if t :
+    exp,log = t;
+    return exp[U(F._q-1)-log[a]];
+  return _nppow(F,a,F._q-2);
+
+def _npsum(F,a) :
+  """Return the packed sum of the elements of packed array a"""
+  while len(a) > 1 :
+    if len(a)&1 : a = np.append(a,U(0));
+    h = len(a)>>1;
+    a = _npadd(F,a[:h],a[h:]);
+  return int(a[0]) if len(a) else 0;
+
+def _ops(F) :
+  """Return add, neg, mul, inv functions of packed values of field F"""
+  p = F._p;
+  if not isinstance(F,ffield) :
+    return (lambda x,y: (F(x)+F(y))._x, lambda x: (-F(x))._x,
+            lambda x,y: (F(x)*F(y))._x, lambda x: (1/F(x))._x);
+  if F._n == 1 :
+    add = lambda x,y: (x+y)%p;
+    neg = lambda x: -x%p;
+    mul = lambda x,y: x*y%p;
+    inv = lambda x: pow(x,p-2,p);
+  elif p == 2 :
+    f = F._fpoly;
+    add = lambda x,y: x^y;
+    neg = lambda x: x;
+    mul = lambda x,y: m2mul(x,y,f);
+    inv = lambda x: xm2gcd(f,x)[2];
+  else :
+    add = lambda x,y: (F(x)+F(y))._x;
+    neg = lambda x: (-F(x))._x;
+    mul = lambda x,y: (F(x)*F(y))._x;
+    inv = lambda x: (1/F(x))._x;
+  if '_exp' in F.__dict__ :
+    exp = F._exp;
+    log = F._log;
+    o = F._q-1;
+    mul = lambda x,y: exp[log[x]+log[y]] if x and y else 0;
+    inv = lambda x: exp[o-log[x]];
+  return add,neg,mul,inv;
+
+class ffarray(object) :
+  """Class for a one-dimensional array of elements of a finite field
+ffarray(F,x) : F, a finite field; x, an iterable of elements of F, or of
+  integers interpreted by F (so nonnegative integers < F.q are packed values)
+  or a numpy array of packed values or another ffarray of F
+The packed values (each element's _x) are stored contiguously:
+  in a numpy uint64 array if numpy is available, F is an ffield, and F.q <= 2**64;
+  otherwise in a list
+Arithmetic is elementwise, done on the packed values without creating elements;
+the other operand can be an ffarray of F of the same length, or a scalar,
+which is an element of F or an integer (interpreted mod p), applied to every element
+Instance variables (treat as read-only!):
+  _f: the finite field
+  _a: the packed values
+Methods: __init__, __len__, __iter__, __getitem__, __setitem__, __repr__,
+         __eq__, __ne__, __pos__, __neg__,
+         __add__, __radd__, __sub__, __rsub__,
+         __mul__, __rmul__, __div__, __rdiv__, __truediv__, __rtruediv__,
+         __pow__, dot, sum, tolist
+Descriptors: field, x [the packed values]"""
+
+  def __init__(self,F,x=()) :
+    if not isffield(F) :
+      raise TypeError('F must be a finite field');
+    self._f = F;
+    q = F._q;
+    if isinstance(x,ffarray) :
+      if x._f is not F :
+        raise TypeError('ffarray must be of the same field');
+      a = x._a;
+    elif np is not None and isinstance(x,np.ndarray) :
+      if x.ndim != 1 or x.dtype.kind not in 'iu' :
+        raise TypeError('numpy array must be one-dimensional integer');
+      if len(x) and (x.min() < 0 or int(x.max()) >= q) :
+        raise ValueError('packed values must be nonnegative and < %d'%(q));
+      a = x;
+    else :
+      a = [];
+      for c in x :
+        if not (isint(c) and 0 <= c < q) :
+          c = F(c)._x;
+        a.append(c);
+    if np is not None and isinstance(F,ffield) and q <= 1<<64 :
+      a = np.array(a,dtype=U);
+    else :
+      a = a.tolist() if np is not None and isinstance(a,np.ndarray) else list(a);
+    self._a = a;
+
+  def _new(self,a) :
+    """Return an ffarray of the same field with packed values a"""
+    r = object.__new__(ffarray);
+    r._f = self._f;
+    r._a = a;
+    return r;
+
+  def _other(self,y) :
+    """Return packed values of y, another operand, or None if not an operand"""
+    F = self._f;
+    if isinstance(y,ffarray) :
+      if y._f is not F :
+        raise TypeError('ffarrays must be of the same field');
+      if len(y._a) != len(self._a) :
+        raise ValueError('ffarrays must be of the same length');
+      return y._a;
+    if isint(y) :
+      y = F(y%F._p);
+    elif isffield(type(y)) and y in F :
+      y = F(y);
+    else :
+      return None;
+    if isinstance(self._a,list) :
+      return [y._x]*len(self._a);
+    return np.full(len(self._a),y._x,dtype=U);
+
+  @property
+  def field(self) :
+    """the finite field"""
+    return self._f;
+
+  @property
+  def x(self) :
+    """a copy of the packed values"""
+    return self._a[:] if isinstance(self._a,list) else self._a.copy();
+
+  def __len__(self) :
+    return len(self._a);
+
+  def __iter__(self) :
+    """Return an iterator of the elements"""
+    F = self._f;
+    return (F(int(x)) for x in self._a);
+
+  def tolist(self) :
+    """Return a list of the elements"""
+    return list(self);
+
+  def __getitem__(self,key) :
+    """Return an element, or, if key is a slice, an ffarray"""
+    if isinstance(key,slice) :
+      a = self._a[key];
+      return self._new(a if isinstance(a,list) else a.copy());
+    return self._f(int(self._a[key]));
+
+  def __setitem__(self,key,value) :
+    """Set an element, or, if key is a slice, elements from an iterable"""
+    F = self._f;
+    if isinstance(key,slice) :
+      v = ffarray(F,value)._a;
+      if isinstance(self._a,list) :
+        if len(range(*key.indices(len(self._a)))) != len(v) :
+          raise ValueError('slice and value lengths differ');
+        self._a[key] = v;
+      else :
+        self._a[key] = v;
+    else :
+      self._a[key] = F(value)._x;
+
+  def __repr__(self) :
+    return 'ffarray(%s,[%s])'%(self._f.__name__,','.join(map(str,self)));
+
+  def __eq__(self,other) :
+    """Return True iff other is an ffarray of the same field with the same elements"""
+    if not isinstance(other,ffarray) : return NotImplemented;
+    if self._f is not other._f : return False;
+    if isinstance(self._a,list) : return self._a == other._a;
+    return np.array_equal(self._a,other._a);
+
+  def __ne__(self,other) :
+    return not self == other;
+
+  __hash__ = None;
+
+  def __pos__(self) :
+    return self;
+
+  def __neg__(self) :
+    F = self._f;
+    if isinstance(self._a,list) :
+      neg = _ops(F)[1];
+      return self._new([neg(x) for x in self._a]);
+    return self._new(_npneg(F,self._a));
+
+  def __add__(self,y) :
+    """Return the elementwise sum"""
+    b = self._other(y);
+    if b is None : return NotImplemented;
+    F = self._f;
+    a = self._a;
+    if isinstance(a,list) :
+      add = _ops(F)[0];
+      return self._new([add(x,y) for x,y in zip(a,b)]);
+    return self._new(_npadd(F,a,b));
+
+  __radd__ = __add__;
+
+  def __sub__(self,y) :
+    """Return the elementwise difference"""
+    b = self._other(y);
+    if b is None : return NotImplemented;
+    return self+(-self._new(b));
+
+  def __rsub__(self,y) :
+    """Return the elementwise difference y-self"""
+    b = self._other(y);
+    if b is None : return NotImplemented;
+    return self._new(b)+(-self);
+
+  def __mul__(self,y) :
+    """Return the elementwise product"""
+    b = self._other(y);
+    if b is None : return NotImplemented;
+    F = self._f;
+    a = self._a;
+    if isinstance(a,list) :
+      mul = _ops(F)[2];
+      return self._new([mul(x,y) for x,y in zip(a,b)]);
+    return self._new(_npmul(F,a,b));
+
+  __rmul__ = __mul__;
+
+  def _inverse(self) :
+    """Return the elementwise multiplicative inverse"""
+    F = self._f;
+    a = self._a;
+    if isinstance(a,list) :
+      if not all(a) : raise ZeroDivisionError;
+      if '_exp' in F.__dict__ :
+        inv = _ops(F)[3];
+        return self._new([inv(x) for x in a]);
+      return self._new([x._x for x in batch_inverse(F(x) for x in a)]);
+    return self._new(_npinv(F,a));
+
+  def __div__(self,y) :
+    """Return the elementwise quotient"""
+    b = self._other(y);
+    if b is None : return NotImplemented;
+    return self*self._new(b)._inverse();
+
+  __truediv__ = __div__;
+
+  def __rdiv__(self,y) :
+    """Return the elementwise quotient y/self"""
+    b = self._other(y);
+    if b is None : return NotImplemented;
+    return self._new(b)*self._inverse();
+
+  __rtruediv__ = __rdiv__;
+
+  def __pow__(self,e) :
+    """Raise each element to the integer power e, 0**0=1"""
+    if not isint(e) :
+      raise TypeError('power must be integer');
+    if e < 0 :
+      return self._inverse()**-e;
+    F = self._f;
+    a = self._a;
+    if isinstance(a,list) :
+      return self._new([(F(x)**e)._x for x in a]);
+    return self._new(_nppow(F,a,e));
+
+  def sum(self) :
+    """Return the sum of the elements"""
+    F = self._f;
+    a = self._a;
+    if isinstance(a,list) :
+      return F(reduce(_ops(F)[0],a,0));
+    return F(_npsum(F,a));
+
+  def dot(self,y) :
+    """Return the dot product with y, an ffarray of the same field and length"""
+    if not isinstance(y,ffarray) :
+      raise TypeError('dot requires an ffarray');
+    return (self*y).sum();
@@ -4,16 +4,19 @@ from __future__ import division
 __all__ = ['ffield','ffieldx','conwaypoly']
 
 import sys
+import os
+import hashlib
 
 import random
 random.seed();
 
-from itertools import chain, count
-from . matrix import matrix, product
+from itertools import count
+from . matrix import product
 from . rational import root, rational, rint
 from . poly import polynomial
+from . import fftables
 
-from . conversions import isint, isstr, isffield, xrange, lmap, bit_length, bit_reverse, bump_bits, zits, stradix, pack, unpack
+from . conversions import isint, isstr, isffield, xrange, bit_length, bit_reverse, bump_bits, zits, stradix, pack, unpack
 
 from . numfuns import factors, ffactors, primepower, isirreducible, isirreducible2, irreducibleg, isprimitive, isprimitive2, mpadd, mpmul, mppow, xmpgcd, m2mul, m2sq, m2pow, m2mod, xm2gcd
 
@@ -373,6 +376,7 @@ def __div__(self,y) :
   yx = y._x;
   if yx < p : return self/yx;
   if p == 2 : return self*type(self)(xm2gcd(self._fpoly,yx)[2]);
+  if self._n <= itohtsujiilimit : return self*type(self)(_inverse(type(self),yx));
   return self*type(self)(pack(p,xmpgcd(p,self._tupoly,unpack(p,yx))[2]));
 
 def __rdiv__(self,y) :    # y/self
@@ -390,12 +394,16 @@ def __rdiv__(self,y) :    # y/self
     return type(self)(xm2gcd(self._fpoly,x)[2]);
   elif x < p :
     z = y*pow(x,p-2,p)%p;
+  elif self._n <= itohtsujiilimit :
+    z = _pmul(type(self),_inverse(type(self),x),y);
   else :
     z = 0;
     for i in xmpgcd(p,self._tupoly,unpack(p,x))[2] :
       z = p*z+i*y%p;
   return type(self)(z);
 
+shiftlimit = 28;    # GF(2**n) * and ** use inline shift loops rather than m2mul if n < this
+
 def __mul__(self,y) :
   """Return the product of the two finite field elements; integers are treated mod p"""
   p = self._p;
@@ -423,6 +431,8 @@ def __mul__(self,y) :
   if self._n == 1 :
     return type(self)(x*y._x%p);
   if p == 2 :
+    if self._n >= shiftlimit :
+      return type(self)(m2mul(x,y._x,self._fpoly));
     y = y._x;
     g = self._poly;
     xy = 0;
@@ -456,6 +466,8 @@ def __pow__(self,e) :
     x = pow(x,e,p);
   elif o-e <= o//8 :
     return 1/self**(o-e);
+  elif p == 2 and self._n >= shiftlimit :
+    x = m2pow(x,e,self._fpoly);
   elif p == 2 :
     g = self._poly;
     f = self._q | g;
@@ -475,37 +487,232 @@ def __pow__(self,e) :
       else :
         x = z;
       n >>= 1;
+  elif p < 4*self._n :    # cheap Frobenius steps beat squarings
+    x = _frobpow(type(self),x,e);
   else :
     x = pack(p,mppow(p,unpack(p,x),e,self._tupoly));
   return type(self)(x);
 
+itohtsujiilimit = 5;    # invert by Itoh-Tsujii rather than gcd if odd p and n <= this
+
+def _pmul(f,x,y) :
+  """Return the packed product of packed elements x and y of ffield f"""
+  p = f._p;
+  if p == 2 : return m2mul(x,y,f._fpoly);
+  if f._n == 1 : return x*y%p;
+  return pack(p,mpmul(p,unpack(p,x),unpack(p,y),f._tupoly));
+
+def _frobmap(f,k) :
+  """Return the table for x -> x**(p**k) on packed elements of ffield f, n > 1:
+  if p == 2, for each byte of x, the images of the 256 possible bytes;
+  else, the images of x**i, for i < n, packed with each coefficient
+  in its own w-hexit field, and w"""
+  n = f._n;
+  k %= n;
+  try :
+    return f._frobs[k];
+  except AttributeError :
+    f._frobs = {};
+  except KeyError :
+    pass;
+  p = f._p;
+  if k == 1 :    # images of x**i are powers of x**p
+    xp = pack(p,mppow(p,(1,0),p,f._tupoly));
+    X = [1];
+    for i in xrange(n-1) :
+      X.append(_pmul(f,X[-1],xp));
+  else :    # compose smaller maps
+    j = k>>1;
+    X = [_frobenius(f,_frobenius(f,p**i,k-j),j) for i in xrange(n)];
+  if p == 2 :
+    t = [];
+    for i in xrange(0,n,8) :
+      b = [0];
+      for x in X[i:i+8] :
+        b += [c^x for c in b];
+      t.append(b);
+  else :
+    w = (bit_length(n*(p-1)**2)+3)//4;
+    t = ([int(''.join(['%0*x'%(w,c) for c in unpack(p,x)]) or '0',16) for x in X],w);
+  f._frobs[k] = t;
+  return t;
+
+def _frobenius(f,x,k=1) :
+  """Return x**(p**k), x a packed element of ffield f, using a precomputed linear map"""
+  k %= f._n;
+  if not (k and x) : return x;
+  if k == 1 and f._p == 2 : return m2sq(x,f._fpoly);
+  t = _frobmap(f,k);
+  if f._p == 2 :
+    y = 0;
+    for b in t :
+      if not x : break;
+      y ^= b[x&255];
+      x >>= 8;
+    return y;
+  p = f._p;
+  X,w = t;
+  y = 0;
+  for i,c in enumerate(reversed(unpack(p,x))) :
+    if c : y += c*X[i];
+  z = '%x'%(y);
+  return pack(p,[int(z[max(i-w,0):i],16)%p for i in xrange(len(z),0,-w)][::-1]);
+
+def _frobpow(f,x,e) :
+  """Return x**e, x a packed element of ffield f, n > 1, 0 < e < q,
+  by a Horner chain in base p: x**(e*p+c) = (x**e)**p*x**c"""
+  p = f._p;
+  d = unpack(p,e);
+  w = [1,x];    # x**c for each needed base p digit c
+  for _ in xrange(2,max(d)+1) :
+    w.append(_pmul(f,w[-1],x));
+  y = w[d[0]];
+  for c in d[1:] :
+    y = _frobenius(f,y);
+    if c : y = _pmul(f,y,w[c]);
+  return y;
+
+def _inverse(f,x) :
+  """Return the packed inverse of nonzero packed element x of ffield f, n > 1,
+  by Itoh-Tsujii: x**-1 = x**(r-1)/x**r, where r = (q-1)/(p-1) and x**r is in GF(p)"""
+  p = f._p;
+  b = x;    # x**((p**k-1)/(p-1)), for k = 1 and then along a chain to n-1
+  k = 1;
+  for c in bin(f._n-1)[3:] :
+    b = _pmul(f,_frobenius(f,b,k),b);
+    k <<= 1;
+    if c == '1' :
+      b = _pmul(f,_frobenius(f,b),x);
+      k += 1;
+  b = _frobenius(f,b);    # x**(r-1)
+  d = pow(_pmul(f,b,x),p-2,p);
+  return b if d == 1 else _pmul(f,b,d);
+
+def _bsgs(g,h,n) :
+  """Return k, 0 <= k < n, such that g**k == h, where g has order n,
+     using baby-step giant-step; raise ValueError if there is no such k"""
+  if h._x == 1 : return 0;
+  m = root(n,2)+1;    # m*m >= n
+  t = {};
+  y = type(g)(1);
+  for j in xrange(m) :
+    t.setdefault(y._x,j);
+    y *= g;
+  y = 1/y;    # g**-m
+  for i in xrange(m+1) :
+    j = t.get(h._x);
+    if j is not None : return (i*m+j)%n;
+    h *= y;
+  raise ValueError('not in multiplicative group');
+
 def _log(self,base=None,alt=False) :
   """Return the discrete log base base (default: least generator) of self
-     if alt, values are signed; always searched by increasing magnitude"""
+     if alt, values are signed, of least magnitude, positive if a tie;
+     computed by Pohlig-Hellman, using baby-step giant-step for each prime"""
   x = self._x;
   if x : 
     if base is None :
       base = type(self).generator;
     elif not base :
       raise ValueError('bad base');
-    q,r = divmod(base.order,self.order);
-    if not r :
-      if alt :
-        for i,g in enumerate(type(self).iterpow(base**q,alt),1) :
-          if g._x == x : return (-(i>>1) if i&1 else (i>>1))*q;
-      else :
-        for i,g in enumerate(type(self).iterpow(base**q)) :
-          if g._x == x : return i*q;
-  raise ValueError('not in multiplicative group');  
-
-def _vector(x) :
-  """A generator of the coefficients of the polynomial representation"""
-  p = x._p;
-  n = x._n;
-  x = x._x;
-  for _ in xrange(n) :
-    yield x%p;
-    x //= p;
+    o = base.order;
+    if not o%self.order :
+      l = 0;    # log mod m
+      m = 1;
+      for p in ffactors(self._q-1) :
+        pe = 1;
+        while not o%(pe*p) :
+          pe *= p;
+        if pe == 1 : continue;
+        c = o//pe;
+        g = base**c;    # order pe
+        h = self**c;
+        gp = g**(pe//p);    # order p
+        gi = 1/g;
+        k = 0;    # log of h base g mod pk
+        pk = 1;
+        while pk < pe :
+          k += _bsgs(gp,(h*gi**k)**(pe//pk//p),p)*pk;
+          pk *= p;
+        l += m*((k-l)*pow(m,pe//p*(p-1)-1,pe)%pe);    # combine by CRT
+        m = pe*m;
+      return l-o if alt and 2*l > o else l;
+  raise ValueError('not in multiplicative group');
+
+# exp/log tables for small fields
+
+tablelimit = 1<<10;    # fields no larger than this get exp/log tables by default
+tablemax = 1<<20;      # fields larger than this can't have exp/log tables
+
+_tabled = ('__mul__','__rmul__','__div__','__truediv__','__rdiv__','__rtruediv__','__pow__');
+
+def _tables(f,build=True) :
+  """Build (or, if not build, discard) exp/log tables for finite field f;
+while f has tables, same-field *, /, and ** are done by table lookup:
+  f._exp[i] is generator**i, for 0 <= i < 2*(q-1)
+  f._log[x] is the log of f(x) base generator, for 0 < x < q"""
+  d = f.__dict__;
+  if not build :
+    if '_exp' in d :
+      for k in _tabled :
+        setattr(f,k,f._notables[k]);
+      del f._exp, f._log;
+    return;
+  if '_exp' in d : return;
+  q = f._q;
+  if q > tablemax :
+    raise ValueError('field too large for tables');
+  f._notables = t = dict((k,d[k]) for k in _tabled);
+  o = q-1;
+  exp = [];
+  log = [0]*q;
+  g = f.generator;
+  x = f(1);
+  for i in xrange(o) :
+    exp.append(x._x);
+    log[x._x] = i;
+    x *= g;
+  exp += exp;
+  mul = t['__mul__'];
+  div = t['__div__'];
+  rdiv = t['__rdiv__'];
+  pow = t['__pow__'];
+  def __mul__(self,y) :
+    """Return the product of the two finite field elements; integers are treated mod p"""
+    if type(y) is not type(self) : return mul(self,y);
+    x = self._x;
+    y = y._x;
+    if not (x and y) : return type(self)(0);
+    return type(self)(exp[log[x]+log[y]]);
+  def __div__(self,y) :
+    """Return the quotient of the two finite field elements; integers are treated mod p"""
+    if type(y) is not type(self) : return div(self,y);
+    y = y._x;
+    if not y : raise ZeroDivisionError;
+    x = self._x;
+    return type(self)(exp[log[x]-log[y]+o]) if x else self;
+  def __rdiv__(self,y) :    # y/self
+    """Return y/self; y must be an integer and is interpreted mod p"""
+    y = rint(y);
+    if not isint(y) : return rdiv(self,y);
+    x = self._x;
+    if not x : raise ZeroDivisionError;
+    y %= self._p;
+    return type(self)(exp[log[y]-log[x]+o] if y else 0);
+  def __pow__(self,e) :
+    """Raise the finite field element to the specified power mod p**n-1, 0**0=0"""
+    e = rint(e);
+    if not isint(e) :
+      raise TypeError('power must be integer');
+    x = self._x;
+    if x <= 1 : return pow(self,e);
+    return type(self)(exp[log[x]*e%o]);
+  f._exp = exp;
+  f._log = log;
+  f.__mul__ = f.__rmul__ = __mul__;
+  f.__div__ = f.__truediv__ = __div__;
+  f.__rdiv__ = f.__rtruediv__ = __rdiv__;
+  f.__pow__ = __pow__;
 
 def minpolynomial(self,m=1) :
   """Return, as a polynomial with coeffs in the subfield GF(self._p**m),
@@ -526,60 +733,20 @@ over the subfield. Raise an exception if m does not divide self._n."""
   O = p**m-1;    # order of subfield
   if not O%(o or 1) :    # already in subfield
     return (G1,-self);
-  d = 1;    # calculate degree of minpoly...
-  while (p**(m*d)-1)%o :    # order of element must divide order of subfield
-    d += 1;
-  if m > 1 :
-    # brute force algorithm...
-    # ceil(ceil(log(o+1,p))/m) is min possible degree of minpoly
-    # n/m is the max possible degree
-    G0 = G(0);
-    P = [G0]*(n//m) + [G1];    # coeffs of 1, x, x**2, x**3, ... x**(n/m)
-    for i in xrange(p,G._q) :  # find generator of superfield of subfield
-      g = G(i);
-      if not g.order % O: break;
-    g **= g.order // O;   # generator of subfield
-    P[d] = G1;
-    while True :
-      # evaluate P(self)
-      v = G0;
-      for i in xrange(d,0,-1) :
-        v = (v+P[i])*self;
-      if not O%(v.order or 1) :    # evaluates to element of subfield
-        P[0] = -v;
-        return tuple(P[d::-1]);
-      # try next
-      for i in xrange(1,d+1) :
-        if P[i] :
-          if P[i] == G1 :
-            P[i] = G0;
-          else :
-            P[i] *= g;
-            break;
-        else:
-          P[i] = g;
-          break;
-      else :
-        # d += 1;    # should never happen
-        # P[d] = G1;
-        raise ValueError('Math failure');
-  # get minpoly over GF(p) ...
-  X = [];
-  x = G1;
-  for i in xrange(d) :
-    X.append(tuple(map(G,_vector(x))));
-    x *= self;
-  v = list(_vector(x));    # self**d
-  M = matrix(n,d,list(chain.from_iterable(X))).T;
-  if n > d :
-    for c in reversed(xrange(n)) :  # eliminate redundant columns from M and v
-      N = matrix(M);
-      del N[:,c];
-      if N.rank == d :
-        M = N;
-        del v[c];
-        if len(v) == d : break;
-  return (G(1),)+tuple(-(lmap(G,v)*M.inverse))[::-1];
+  # the roots are the conjugates self**(p**(m*i)), found by a Frobenius chain
+  if isinstance(G,ffield) :
+    frob = lambda x: G(_frobenius(G,x._x,m));
+  else :
+    frob = lambda x: x**(O+1);
+  c = [self];
+  x = frob(self);
+  while x != self :
+    c.append(x);
+    x = frob(x);
+  P = [G1];    # product of (X-c[i]), constant term last
+  for x in c :
+    P = [a-x*b for a,b in zip(P+[0],[0]+P)];
+  return tuple(P);
 
 def _create(p,n,poly,x=None) :
   """Return an ffield instance or, if x present, an instance of an ffield instance"""
@@ -590,8 +757,151 @@ def __reduce__(self) :
   """Return a tuple for pickling"""
   return (_create,type(self).id+(self._x,));
 
+internlimit = 1<<10;    # fields no larger than this share one instance per element
+
+def _slots(d,intern) :
+  """Give element class dict d __slots__ and, if intern, a __new__ returning
+shared instances [see _intern], with the original __init__ moved to _init"""
+  d['__slots__'] = ('_x',);
+  if intern :
+    d['_init'] = d.pop('__init__');
+    d['__new__'] = _internednew;
+  return d;
+
+def _intern(f) :
+  """Create f._elements, the list of shared instances of the elements of f"""
+  e = [];
+  for x in xrange(len(f)) :
+    a = object.__new__(f);
+    a._x = x;
+    e.append(a);
+  f._elements = e;
+
+def _internednew(cls,x) :
+  """Return the shared instance of the element given by x"""
+  try :
+    if x >= 0 : return cls._elements[x];
+  except Exception :
+    pass;
+  a = object.__new__(cls);
+  cls._init(a,x);
+  return cls._elements[a._x];
+
 _ffield = {}; # (p,n,poly) -> ffield
 
+polycache = None;    # file of found polys, e.g. ~/.cache/msmath/ffpolys.txt; None for no file
+                     # [its entries are trusted to be least, so they can set field moduli]
+_polys = None;    # (kind,p,n) -> packed poly with x**n term elided
+_unchecked = set();    # keys of _polys read from polycache, not yet checked
+
+def _polylookup(kind,p,n) :
+  """Return the known packed poly of the given kind for GF(p**n), or None;
+kind is 'irreducible', 'primitive', 'sparse' [p == 2 with fewest 1s], or 'conway';
+polys come from fftables and then, except Conway polys, from the polycache file"""
+  global _polys;
+  if _polys is None :
+    _polys = {};
+    for k in fftables.kinds :
+      for (r,m),g in getattr(fftables,k).items() :
+        _polys[k,r,m] = g;
+    if polycache :
+      try :
+        with open(polycache) as f :
+          for line in f :
+            try :
+              k,r,m,g,c = line.split();
+              k = (k,int(r),int(m));
+              if line.rstrip('\r\n') != _polyline(k[0],k[1],k[2],int(g)) : continue;
+              if k[0] == 'conway' : continue;    # not checkable cheaply
+              if k not in _polys or k in _unchecked :    # later lines win
+                _polys[k] = int(g);
+                _unchecked.add(k);
+            except ValueError :
+              pass;
+      except (IOError,OSError) :
+        pass;
+  return _polys.get((kind,p,n));
+
+def _polyline(kind,p,n,poly) :
+  """Return the polycache line for a poly, without newline; it ends with a checksum,
+so that lines not written by _polystore (edited or truncated) are ignored"""
+  s = '%s %d %d %d'%(kind,p,n,poly);
+  return '%s %s'%(s,hashlib.sha1(s.encode()).hexdigest()[:16]);
+
+def _polystore(kind,p,n,poly) :
+  """Remember a newly found packed poly, appending it to polycache if possible
+and not a Conway poly"""
+  _polylookup(kind,p,n);
+  _polys[kind,p,n] = poly;
+  _unchecked.discard((kind,p,n));
+  if polycache and kind != 'conway' :
+    try :
+      d = os.path.dirname(polycache);
+      if d and not os.path.isdir(d) : os.makedirs(d);
+      with open(polycache,'a') as f :
+        f.write(_polyline(kind,p,n,poly)+'\n');
+    except (IOError,OSError) :
+      pass;
+
+def _haskind(p,n,kind,poly) :
+  """Return True iff packed poly (x**n term elided) for GF(p**n) is irreducible,
+and primitive if kind is 'primitive', or with the fewest possible 1s if 'sparse'"""
+  q = p**n;
+  if not 0 <= poly < q : return False;
+  if p != 2 :
+    g = unpack(p,q+poly)[1:];
+    return isirreducible(g,p) and (kind != 'primitive' or isprimitive(g,p));
+  if not isirreducible2(q|poly) : return False;
+  if kind == 'primitive' : return isprimitive2(q|poly);
+  if kind == 'sparse' :
+    w = bin(poly).count('1');
+    if w == 2 : return True;    # trinomial
+    return w == 4 and not any(isirreducible2(q|1|1<<i) for i in xrange(1,(n>>1)+1));
+  return True;
+
+def _leastpoly(p,n,kind) :
+  """Return the least packed poly of the given kind for GF(p**n), n > 1,
+kind as for _polylookup but not 'conway'; search only if not known"""
+  poly = _polylookup(kind,p,n);
+  if poly is not None :
+    if (kind,p,n) not in _unchecked : return poly;
+    _unchecked.discard((kind,p,n));
+    if _haskind(p,n,kind,poly) : return poly;
+  notprimitive = kind != 'primitive';
+  q = p**n;
+  if p != 2 :
+    d = p if (p-1)%product(factors(n),1 if n&3 else 2) else 0;
+    for poly in xrange(1+d+q,q+q) :
+      g = unpack(p,poly)[1:];
+      if isirreducible(g,p) and (notprimitive or isprimitive(g,p)): break;
+    poly -= q;
+  elif kind != 'sparse' :
+    for poly in xrange(3,q,2) :
+      g = poly|q;
+      if isirreducible2(g) and (notprimitive or isprimitive2(g)) : break;
+  else :    # with fewest possible bits
+    poly = 3;    # first, special case 3 bits, for speed
+    for _ in xrange(n>>1) :
+      if isirreducible2(q|poly) :
+        break;
+      poly = (poly<<1)-1;
+    else :    # if no irreducibles with 3 bits, try bigger odds
+      q1 = q|1;
+      hq = q>>1;
+      for b in xrange(3,n,2) :    # number of inner bits
+        hpoly = (1<<b)-1;    # inner bits
+        while hpoly < hq :
+          poly = q1|(hpoly<<1);    # only try if poly <= bit_reverse(poly)
+          if poly <= bit_reverse(poly) and isirreducible2(poly) :
+            poly -= q;
+            break;
+          hpoly = bump_bits(hpoly);
+        else :
+          continue; 
+        break;
+  _polystore(kind,p,n,poly);
+  return poly;
+
 class ffield(type) :
   """Class to create finite field class for GF(p**n)
 Field elements are represented as polynomials over GF(p) with degree < n.
@@ -610,6 +920,7 @@ Instance variables (treat as read-only!):
   _fpoly: an integer giving the value of the polynomial modulus at x = _p
   _nzi: minus the length of the tuple representing the elided polynomial modulus
   _basefield: ffield(_p)
+  _exp, _log: exp/log tables, present only if the field has tables
 Methods: __new__, __init__, __hash__, __eq__, __ne__, __lt__, __le__, __ge__, __gt__,
          __len__, __iter__, __getitem__,  __contains__, iterpow, __reduce__
 Descriptors: p, n, q, poly, fpoly, tupoly, ftupoly, id,
@@ -626,10 +937,18 @@ Signatures:
    if poly == (), use least primitive polynomial [WARNING: factors q-1]
    if poly == 0 and p==2, use least irreducible polynomial with fewest 1s
    else, use least irreducible polynomial
+  Least polynomials are looked up in fftables and then, if polycache
+   (default None) names a file, in it; those not found are searched for and
+   appended to that file; entries read from it must have been written by this
+   module and are checked to be of their kind, but are trusted to be least
+  Keyword tables: if True, build exp/log tables so same-field *, /, ** are
+   table lookups; if False, discard them; if omitted, fields with q <= tablelimit
+   get tables when created [tables are shared by all references to the field]
 
 Each instance of the created type is an element of the finite field:
 Instance variable (treat as read-only!):
   _x: the value at _p of the polynomial representing the element
+Elements have __slots__; if q <= internlimit, each element has one shared instance
 
 Methods: __init__, __hash__, __repr__, __str__, __int__,
          __pos__, __neg__, __abs__,
@@ -652,12 +971,13 @@ WARNING: log, minpoly, minpolynomial, order and generator
     p,n = q;
     poly = kwargs.pop('poly',None);
     dn = kwargs.pop('n',None);
+    tables = kwargs.pop('tables',None);
     if dn != None :
       if n != 1 :
         raise ValueError('n specified for prime power');
       n = dn;
     if len(kwargs) :
-      raise TypeError('Allowed keywords: n poly')
+      raise TypeError('Allowed keywords: n poly tables')
     if args :
       if len(args) == 1 :
         if (dn or n != 1) and poly != None :
@@ -678,38 +998,10 @@ WARNING: log, minpoly, minpolynomial, order and generator
     if  n < 1 or not isint(n) :
       raise ValueError('Bad power');
     q = p**n;
-    if not poly and n > 1:    # pick least irreducible poly
-      notprimitive = poly != ();
-      if p != 2 :
-        d = p if (p-1)%product(factors(n),1 if n&3 else 2) else 0;
-        for poly in xrange(1+d+q,q+q) :
-          g = unpack(p,poly)[1:];
-          if isirreducible(g,p) and (notprimitive or isprimitive(g,p)): break;
-        poly -= q;
-      elif poly != 0 :
-        for poly in xrange(3,q,2) :
-          g = poly|q;
-          if isirreducible2(g) and (notprimitive or isprimitive2(g)) : break;
-      else :    # with fewest possible bits
-        poly = 3;    # first, special case 3 bits, for speed
-        for _ in xrange(n>>1) :
-          if isirreducible2(q|poly) :
-            break;
-          poly = (poly<<1)-1;
-        else :    # if no irreducibles with 3 bits, try bigger odds
-          q1 = q|1;
-          hq = q>>1;
-          for b in xrange(3,n,2) :    # number of inner bits
-            hpoly = (1<<b)-1;    # inner bits
-            while hpoly < hq :
-              poly = q1|(hpoly<<1);    # only try if poly <= bit_reverse(poly)
-              if poly <= bit_reverse(poly) and isirreducible2(poly) :
-                poly -= q;
-                break;
-              hpoly = bump_bits(hpoly);
-            else :
-              continue; 
-            break;
+    known = not poly and n > 1;
+    if known :    # pick least irreducible poly
+      poly = _leastpoly(p,n,'primitive' if poly == () else
+                            'sparse' if p == 2 and poly == 0 else 'irreducible');
     poly = poly or 0;
     if isint(poly) :
       if not 0 <= poly < q : raise ValueError('Bad poly');
@@ -725,13 +1017,16 @@ WARNING: log, minpoly, minpolynomial, order and generator
     tupoly = unpack(p,poly);
     _nzi = -len(tupoly);
     _tupoly = (1,)+(n+_nzi)*(0,)+tupoly;
-    if not isirreducible(_tupoly[1:],p) :
+    if not known and not isirreducible(_tupoly[1:],p) :
       raise ValueError('Composite poly');
     id = (p,n,poly);
     try :
-      return _ffield[id];
+      f = _ffield[id];
     except Exception :
       pass;
+    else :
+      if tables is not None : _tables(f,tables);
+      return f;
     d = dict(_p=p, _n=n, _q=q, _poly=poly, _tupoly=_tupoly, _nzi=_nzi,
              _fpoly=q+poly, p=field_p, n=field_n, q=field_q,
              poly=field_poly, fpoly=field_fpoly, ftupoly=field_ftupoly,
@@ -773,8 +1068,10 @@ WARNING: log, minpoly, minpolynomial, order and generator
             'GF%d_%s'%(p,zits[poly] if p <= 36 else str(poly)) if n == 1 else
             'GF%d^%d_%s'%(p,n,''.join([zits[c] for c in tupoly])) if p <= 36 else
             'GF%d^%d_%s'%(p,n,'_'.join(['%d'%(c) for c in tupoly])));
-    _ffield[id] = f = type.__new__(cls,name,(),d);
+    _ffield[id] = f = type.__new__(cls,name,(),_slots(d,q <= internlimit));
+    if q <= internlimit : _intern(f);
     f._basefield = f if f._n == 1 else ffield(f._p);
+    if tables or tables is None and q <= tablelimit : _tables(f);
     return f;
 
   def __init__(self,q,*args,**kwargs) :
@@ -1101,6 +1398,197 @@ def r__rsub__(self,y) :
   y %= p;
   return type(self)(y)-self if y else -self;
 
+def _padd(p,x,y) :
+  """Return the sum of packed elements x and y of a field of odd characteristic p"""
+  s = 0;
+  P = 1;
+  while x or y :
+    x,u = divmod(x,p);
+    y,v = divmod(y,p);
+    s += (u+v)%p*P;
+    P *= p;
+  return s;
+
+def _pneg(p,x) :
+  """Return the negative of packed element x of a field of odd characteristic p"""
+  P = 1;
+  y = -x;
+  while x :
+    P *= p;
+    x,r = divmod(x,p);
+    if r : y += P;
+  return y;
+
+def _arith(f) :
+  """Return add, neg, and mul functions on packed elements of finite field f,
+compiled on first use and cached in f._arith; odd p tabled fields add using
+Zech logarithms: x+y = x*(1+y/x); ffieldx fields multiply as polynomials
+over the packed basefield, with Karatsuba formulas for degree 2 and 3"""
+  try :
+    return f.__dict__['_arith'];
+  except KeyError :
+    pass;
+  p = f._p;
+  q = f._q;
+  if '_exp' in f.__dict__ :
+    o = q-1;
+    exp = f._exp;
+    log = f._log;
+    mul = lambda x,y: exp[log[x]+log[y]] if x and y else 0;
+  else :
+    exp = None;
+    mul = (lambda x,y: _pmul(f,x,y)) if isinstance(f,ffield) else None;
+  if p == 2 :
+    add = lambda x,y: x^y;
+    neg = lambda x: x;
+  elif f._n == 1 :
+    add = lambda x,y: (x+y)%p;
+    neg = lambda x: -x%p;
+  elif exp :
+    h = o>>1;    # log of -1
+    zech = [0]*o;    # zech[i] = log(1+g**i), or -1 if 1+g**i == 0
+    for i in xrange(o) :
+      x = exp[i];
+      x = x-x%p+(x+1)%p;
+      zech[i] = log[x] if x else -1;
+    zech += zech;
+    def add(x,y) :
+      if not (x and y) : return x or y;
+      a = log[x];
+      z = zech[log[y]-a+o];
+      return exp[a+z] if z >= 0 else 0;
+    neg = lambda x: exp[log[x]+h] if x else 0;
+  else :
+    add = lambda x,y: _padd(p,x,y);
+    neg = lambda x: _pneg(p,x);
+  if not mul :
+    mul = _rmulfun(f);
+  f._arith = a = (add,neg,mul);
+  return a;
+
+def _rmulfun(f) :
+  """Return a function multiplying packed elements of ffieldx f"""
+  s = f._basefield;
+  add,neg,mul = _arith(s);
+  q = s._q;
+  P = f._polynomial;
+  k = P.degree;
+  m = [neg(P[i]._x) for i in xrange(k)];    # t**k = sum(m[i]*t**i)
+  if k == 2 :
+    m0,m1 = m;
+    def rmul(x,y) :
+      a1,a0 = divmod(x,q);
+      b1,b0 = divmod(y,q);
+      c0 = mul(a0,b0);
+      c2 = mul(a1,b1);
+      c1 = add(mul(add(a0,a1),add(b0,b1)),neg(add(c0,c2)));
+      if c2 :
+        c0 = add(c0,mul(c2,m0));
+        c1 = add(c1,mul(c2,m1));
+      return c1*q+c0;
+    return rmul;
+  def reduce(c) :
+    for i in xrange(2*k-2,k-1,-1) :
+      h = c[i];
+      if h :
+        for j in xrange(k) :
+          c[i-k+j] = add(c[i-k+j],mul(h,m[j]));
+    z = 0;
+    for i in xrange(k-1,-1,-1) :
+      z = z*q+c[i];
+    return z;
+  if k == 3 :
+    qq = q*q;
+    def rmul(x,y) :
+      a2,a1 = divmod(x,qq);
+      a1,a0 = divmod(a1,q);
+      b2,b1 = divmod(y,qq);
+      b1,b0 = divmod(b1,q);
+      d0 = mul(a0,b0);
+      d1 = mul(a1,b1);
+      d2 = mul(a2,b2);
+      return reduce([d0,
+                     add(mul(add(a0,a1),add(b0,b1)),neg(add(d0,d1))),
+                     add(mul(add(a0,a2),add(b0,b2)),add(d1,neg(add(d0,d2)))),
+                     add(mul(add(a1,a2),add(b1,b2)),neg(add(d1,d2))),
+                     d2]);
+    return rmul;
+  def rmul(x,y) :
+    a = [];
+    b = [];
+    for _ in xrange(k) :
+      x,r = divmod(x,q);
+      a.append(r);
+      y,r = divmod(y,q);
+      b.append(r);
+    c = [0]*(2*k-1);
+    for i,u in enumerate(a) :
+      if u :
+        for j,v in enumerate(b) :
+          if v : c[i+j] = add(c[i+j],mul(u,v));
+    return reduce(c);
+  return rmul;
+
+def _rfrobenius(f,x) :
+  """Return x**Q, x a packed element of ffieldx f, Q the size of its basefield,
+using the cached images of t**i"""
+  s = f._basefield;
+  add,neg,mul = _arith(s);
+  q = s._q;
+  try :
+    T = f.__dict__['_rfrob'];
+  except KeyError :
+    k = f._polynomial.degree;
+    y = _rpow(f,q,q);    # t**Q
+    T = [];
+    z = 1;
+    for i in xrange(k) :
+      T.append(unpack(q,z)[::-1]);
+      z = _arith(f)[2](z,y);
+    f._rfrob = T;
+  c = [0]*len(T);
+  i = 0;
+  while x :
+    x,a = divmod(x,q);
+    if a :
+      for j,t in enumerate(T[i]) :
+        c[j] = add(c[j],mul(a,t));
+    i += 1;
+  z = 0;
+  for a in reversed(c) :
+    z = z*q+a;
+  return z;
+
+def _rinverse(f,x) :
+  """Return the packed inverse of nonzero packed element x of ffieldx f:
+the product r of the other conjugates x**(Q**i), 0 < i < k, times 1/(x*r),
+which is in the basefield of size Q"""
+  s = f._basefield;
+  add,neg,mul = _arith(s);
+  rmul = _arith(f)[2];
+  y = r = _rfrobenius(f,x);
+  for _ in xrange(f._polynomial.degree-2) :
+    y = _rfrobenius(f,y);
+    r = rmul(r,y);
+  d = (1/s(rmul(r,x)))._x;
+  q = s._q;
+  z = 0;
+  P = 1;
+  while r :
+    r,a = divmod(r,q);
+    z += mul(a,d)*P;
+    P *= q;
+  return z;
+
+def _rpow(f,x,e) :
+  """Return x**e, x a packed element of ffieldx f, e > 0"""
+  rmul = _arith(f)[2];
+  y = x;
+  for c in bin(e)[3:] :
+    y = rmul(y,y);
+    if c == '1' : y = rmul(y,x);
+  return y;
+
 def r__mul__(self,y) :
   """Return the product of the two finite field elements; integers are treated mod p"""
   p = self._p;
@@ -1130,12 +1618,7 @@ def r__mul__(self,y) :
         P *= p;
       return type(self)(s);
     else : return NotImplemented;
-  s = self._basefield;
-  q = s._q;
-  xt = polynomial(*map(s,unpack(q,x)));
-  yt = polynomial(*map(s,unpack(q,y._x)));
-  zt = (xt*yt)%self._polynomial;
-  return type(self)(pack(q,map(_x,zt[::-1])));
+  return type(self)(_arith(type(self))[2](x,y._x));
 
 def r__div__(self,y) :
   """Return the quotient of the two finite field elements; integers are treated mod p"""
@@ -1164,10 +1647,7 @@ def r__div__(self,y) :
     else : return NotImplemented;
   yx = y._x;
   if yx < p : return self/yx;
-  s = self._basefield;
-  q = s._q;
-  yt = polynomial(*map(s,unpack(q,yx)));
-  return self*type(self)(pack(q,map(_x,self._polynomial.xgcd(yt)[2][::-1])));
+  return type(self)(_arith(type(self))[2](x,_rinverse(type(self),yx)));
 
 def r__rdiv__(self,y) :    # y/self
   """Return y/self; y must be in subfield, or an integer interpreted mod p"""
@@ -1186,11 +1666,8 @@ def r__rdiv__(self,y) :    # y/self
   elif x < p :
     z = y*pow(x,p-2,p)%p;
   else :
-    s = self._basefield;
-    q = s._q;
-    xt = polynomial(*map(s,unpack(q,x)));
     z = 0;
-    for i in unpack(p,pack(q,map(_x,self._polynomial.xgcd(xt)[2][::-1]))) :
+    for i in unpack(p,_rinverse(type(self),x)) :
       z = p*z+i*y%p;
   return type(self)(z);
 
@@ -1216,10 +1693,7 @@ def r__pow__(self,e) :
   elif o-e <= o//8 :
     return 1/self**(o-e);
   else :
-    s = self._basefield;
-    q = s._q;
-    xt = polynomial(*map(s,unpack(q,x)));
-    x = pack(q,map(_x,xt.__pow__(e,self._polynomial)[::-1]));
+    x = _rpow(type(self),x,e);
   return type(self)(x);
 
 class ffieldx(type) :
@@ -1246,6 +1720,7 @@ WARNING: generator requires factoring q-1, so may take inordinately long
 
 Signatures:
   ffieldx(poly) : poly an irreducible monic poly with coefficients in some finite field
+  ffieldx(poly,tables) : tables as for ffield
 
 Methods: __init__, __hash__, __repr__, __str__, __int__,
          __pos__, __neg__,
@@ -1261,7 +1736,7 @@ WARNING: log, minpoly, minpolynomial, order and generator
          require factoring q-1, so may take inordinately long
 """
 
-  def __new__(cls,poly) :
+  def __new__(cls,poly,tables=None) :
     i = 0;
     subfield = None;
     for c in poly :
@@ -1287,14 +1762,17 @@ WARNING: log, minpoly, minpolynomial, order and generator
     if d == 1 : return subfield;
     _poly = pack(subfield._q,map(_x,poly[d-1::-1]));
     m = subfield._n;
-    if m == 1 : return ffield(p,d,_poly);
+    if m == 1 : return ffield(p,d,_poly,tables=tables);
     n = d*m;
     q = p**n;
     id = (n,_poly,subfield.id);
     try :
-      return _ffield[id];
+      f = _ffield[id];
     except Exception :
       pass;
+    else :
+      if tables is not None : _tables(f,tables);
+      return f;
     d = dict(_p=p, _n=n, _q=q, _basefield = subfield, _polynomial = poly,
              p=field_p, n=field_n, q=field_q, _poly = _poly,
              x=element, tupoly=elementtuple, polynomial=elementpolynomial,
@@ -1331,9 +1809,14 @@ WARNING: log, minpoly, minpolynomial, order and generator
             );
 
     name = ('GF%d^%d>%s:%s'%(p,n,subfield.__name__,'_'.join(['%s'%(c) for c in poly.mapcoeffs(_x)])));
-    _ffield[id] = f = type.__new__(cls,name,(),d);
+    _ffield[id] = f = type.__new__(cls,name,(),_slots(d,q <= internlimit));
+    if q <= internlimit : _intern(f);
+    if tables or tables is None and q <= tablelimit : _tables(f);
     return f;
 
+  def __init__(self,poly,tables=None) :
+    return;
+
   def __hash__(self) :
     return hash(type(self))^hash(self.id);
 
@@ -1476,19 +1959,15 @@ g_{q} such that if n/m is a prime, g_{q}(x) | g_{p^m}(x^((p^n-1)/(p^m-1))}.
 The ordering of polynomials x^n - a_{n-1}x^(n-1) + a_{n-2}x^(n-2) ... (-1)^n a_0
 is lexicographically by a_{n-1} a_{n-2} ... a_0."""
 
-_cpdict = {};    # q -> packed Conway polynomial for GF(q) with leading term elided
-
 def conwaypoly(q) :
   """Return the Conway polynomial for GF(q) as a packed GF(p) polynomial,
   where q = p**n, with the coefficient of x**n elided"""
-  try :
-    return _cpdict[q];
-  except Exception :
-    pass;
   try :
     p,n = primepower(q);
   except Exception :
     raise ValueError('Not prime power');
+  c = _polylookup('conway',p,n);
+  if c is not None : return c;
   if p == 2 :
     for g in xrange(1,q,2) :
       gq = g|q;
@@ -1507,7 +1986,7 @@ def conwaypoly(q) :
             b >>= 1;
           if m2pow(2,d*m,gq)^a : break;
         else :
-          _cpdict[q] = g;
+          _polystore('conway',p,n,g);
           return g;
   else :
     for g in irreducibleg(p,n) :
@@ -1526,6 +2005,7 @@ def conwaypoly(q) :
           s = mpmul(p,s,xd,g,a);
         if mpadd(p,mppow(p,x,d*m,g),s) : break;
       else :
-        _cpdict[q] = c = pack(p,g[1:]);
+        c = pack(p,g[1:]);
+        _polystore('conway',p,n,c);
         return c;
   raise SystemError('Did not find Conway polynomial');
@@ -0,0 +1,1338 @@
+""" precomputed polynomials for ffield.py
+Each table maps (p,n) to a packed polynomial over GF(p) with the x**n term elided:
+  irreducible: the least irreducible polynomial, as used by ffield(p,n)
+  primitive: the least primitive polynomial, as used by ffield(p,n,())
+  sparse: the least irreducible polynomial with fewest 1s, as used by ffield(2,n,0)
+  conway: the Conway polynomial, as returned by conwaypoly(p**n)
+Regenerate with python -m msmath.fftables [seconds] > fftables.py
+(seconds [default 60] bounds the search time for each prime and table)"""
+
+kinds = ('irreducible','primitive','sparse','conway');
+
+irreducible = {
+  (2,2):3,
+  (2,3):3,
+  (2,4):3,
+  (2,5):5,
+  (2,6):3,
+  (2,7):3,
+  (2,8):27,
+  (2,9):3,
+  (2,10):9,
+  (2,11):5,
+  (2,12):9,
+  (2,13):27,
+  (2,14):33,
+  (2,15):3,
+  (2,16):43,
+  (2,17):9,
+  (2,18):9,
+  (2,19):39,
+  (2,20):9,
+  (2,21):5,
+  (2,22):3,
+  (2,23):33,
+  (2,24):27,
+  (2,25):9,
+  (2,26):27,
+  (2,27):39,
+  (2,28):3,
+  (2,29):5,
+  (2,30):3,
+  (2,31):9,
+  (2,32):141,
+  (2,33):75,
+  (2,34):27,
+  (2,35):5,
+  (2,36):53,
+  (2,37):63,
+  (2,38):99,
+  (2,39):17,
+  (2,40):57,
+  (2,41):9,
+  (2,42):39,
+  (2,43):89,
+  (2,44):33,
+  (2,45):27,
+  (2,46):3,
+  (2,47):33,
+  (2,48):45,
+  (2,49):113,
+  (2,50):29,
+  (2,51):75,
+  (2,52):9,
+  (2,53):71,
+  (2,54):125,
+  (2,55):71,
+  (2,56):149,
+  (2,57):17,
+  (2,58):99,
+  (2,59):123,
+  (2,60):3,
+  (2,61):39,
+  (2,62):105,
+  (2,63):3,
+  (2,64):27,
+  (2,65):27,
+  (2,66):9,
+  (2,67):39,
+  (2,68):163,
+  (2,69):101,
+  (2,70):43,
+  (2,71):43,
+  (2,72):95,
+  (2,73):29,
+  (2,74):71,
+  (2,75):75,
+  (2,76):53,
+  (2,77):101,
+  (2,78):95,
+  (2,79):29,
+  (2,80):175,
+  (2,81):17,
+  (2,82):215,
+  (2,83):149,
+  (2,84):33,
+  (2,85):263,
+  (2,86):101,
+  (2,87):163,
+  (2,88):63,
+  (2,89):105,
+  (2,90):45,
+  (2,91):237,
+  (2,92):101,
+  (2,93):5,
+  (2,94):99,
+  (2,95):119,
+  (2,96):111,
+  (2,97):65,
+  (2,98):153,
+  (2,99):75,
+  (2,100):101,
+  (2,101):195,
+  (2,102):105,
+  (2,103):189,
+  (2,104):27,
+  (2,105):17,
+  (2,106):99,
+  (2,107):175,
+  (2,108):83,
+  (2,109):53,
+  (2,110):83,
+  (2,111):149,
+  (2,112):57,
+  (2,113):45,
+  (2,114):45,
+  (2,115):175,
+  (2,116):23,
+  (2,117):39,
+  (2,118):101,
+  (2,119):257,
+  (2,120):27,
+  (2,121):291,
+  (2,122):71,
+  (2,123):5,
+  (2,124):125,
+  (2,125):175,
+  (2,126):149,
+  (2,127):3,
+  (2,128):135,
+  (3,2):1,
+  (3,3):7,
+  (3,4):5,
+  (3,5):7,
+  (3,6):5,
+  (3,7):11,
+  (3,8):11,
+  (3,9):64,
+  (3,10):19,
+  (3,11):11,
+  (3,12):11,
+  (3,13):7,
+  (3,14):5,
+  (3,15):11,
+  (3,16):37,
+  (3,17):7,
+  (3,18):34,
+  (3,19):11,
+  (3,20):34,
+  (3,21):31,
+  (3,22):37,
+  (3,23):31,
+  (3,24):83,
+  (3,25):55,
+  (3,26):19,
+  (3,27):287,
+  (3,28):11,
+  (3,29):83,
+  (3,30):5,
+  (3,31):31,
+  (3,32):52,
+  (3,33):71,
+  (3,34):19,
+  (3,35):11,
+  (3,36):40,
+  (3,37):44,
+  (3,38):44,
+  (3,39):308,
+  (3,40):5,
+  (3,41):7,
+  (3,42):34,
+  (3,43):31,
+  (3,44):29,
+  (3,45):64,
+  (3,46):104,
+  (3,47):98,
+  (3,48):133,
+  (3,49):64,
+  (3,50):85,
+  (3,51):7,
+  (3,52):13,
+  (3,53):146,
+  (3,54):5,
+  (3,55):71,
+  (3,56):29,
+  (3,57):71,
+  (3,58):37,
+  (3,59):44,
+  (3,60):11,
+  (3,61):44,
+  (3,62):104,
+  (3,63):260,
+  (3,64):29,
+  (5,2):2,
+  (5,3):6,
+  (5,4):2,
+  (5,5):21,
+  (5,6):7,
+  (5,7):6,
+  (5,8):2,
+  (5,9):38,
+  (5,10):33,
+  (5,11):11,
+  (5,12):9,
+  (5,13):42,
+  (5,14):77,
+  (5,15):27,
+  (5,16):2,
+  (5,17):39,
+  (5,18):6,
+  (5,19):137,
+  (5,20):31,
+  (5,21):21,
+  (5,22):6,
+  (5,23):26,
+  (5,24):146,
+  (5,25):267,
+  (5,26):162,
+  (5,27):6,
+  (5,28):31,
+  (5,29):153,
+  (5,30):133,
+  (5,31):6,
+  (5,32):2,
+  (7,2):1,
+  (7,3):2,
+  (7,4):8,
+  (7,5):10,
+  (7,6):2,
+  (7,7):43,
+  (7,8):10,
+  (7,9):2,
+  (7,10):17,
+  (7,11):10,
+  (7,12):58,
+  (7,13):52,
+  (7,14):11,
+  (7,15):69,
+  (7,16):17,
+  (7,17):10,
+  (7,18):2,
+  (7,19):55,
+  (7,20):101,
+  (7,21):71,
+  (7,22):53,
+  (7,23):159,
+  (7,24):74,
+  (7,25):365,
+  (7,26):59,
+  (7,27):2,
+  (7,28):57,
+  (7,29):22,
+  (7,30):61,
+  (7,31):55,
+  (7,32):11,
+  (11,2):1,
+  (11,3):15,
+  (11,4):13,
+  (11,5):2,
+  (11,6):13,
+  (11,7):15,
+  (11,8):15,
+  (11,9):16,
+  (11,10):3,
+  (11,11):111,
+  (11,12):18,
+  (11,13):26,
+  (11,14):125,
+  (11,15):23,
+  (11,16):137,
+  (11,17):15,
+  (11,18):15,
+  (11,19):139,
+  (11,20):138,
+  (11,21):122,
+  (11,22):15,
+  (11,23):152,
+  (11,24):13,
+  (11,25):2,
+  (11,26):34,
+  (11,27):123,
+  (11,28):15,
+  (11,29):24,
+  (11,30):171,
+  (11,31):172,
+  (11,32):988,
+  (13,2):2,
+  (13,3):2,
+  (13,4):2,
+  (13,5):54,
+  (13,6):2,
+  (13,7):41,
+  (13,8):2,
+  (13,9):2,
+  (13,10):191,
+  (13,11):18,
+  (13,12):2,
+  (13,13):157,
+  (13,14):15,
+  (13,15):19,
+  (13,16):2,
+  (13,17):373,
+  (13,18):2,
+  (13,19):53,
+  (13,20):191,
+  (13,21):176,
+  (13,22):174,
+  (13,23):19,
+  (13,24):2,
+  (13,25):202,
+  (13,26):184,
+  (13,27):2,
+  (13,28):171,
+  (13,29):272,
+  (13,30):23,
+  (13,31):174,
+  (13,32):2,
+  (17,2):3,
+  (17,3):20,
+  (17,4):3,
+  (17,5):20,
+  (17,6):24,
+  (17,7):22,
+  (17,8):3,
+  (17,9):20,
+  (17,10):24,
+  (17,11):58,
+  (17,12):19,
+  (17,13):40,
+  (17,14):25,
+  (17,15):57,
+  (17,16):3,
+  (17,17):273,
+  (17,18):20,
+  (17,19):52,
+  (17,20):296,
+  (17,21):290,
+  (17,22):328,
+  (17,23):421,
+  (17,24):330,
+  (17,25):20,
+  (17,26):26,
+  (17,27):296,
+  (17,28):317,
+  (17,29):298,
+  (17,30):25,
+  (17,31):24,
+  (17,32):3,
+  (19,2):1,
+  (19,3):2,
+  (19,4):27,
+  (19,5):22,
+  (19,6):4,
+  (19,7):20,
+  (19,8):21,
+  (19,9):2,
+  (19,10):77,
+  (19,11):45,
+  (19,12):20,
+  (19,13):20,
+  (19,14):28,
+  (19,15):46,
+  (19,16):29,
+  (19,17):40,
+  (19,18):4,
+  (19,19):343,
+  (19,20):21,
+  (19,21):24,
+  (19,22):383,
+  (19,23):404,
+  (19,24):27,
+  (19,25):384,
+  (19,26):362,
+  (19,27):2,
+  (19,28):371,
+  (19,29):39,
+  (19,30):393,
+  (19,31):394,
+  (19,32):28,
+  (23,2):1,
+  (23,3):26,
+  (23,4):25,
+  (23,5):26,
+  (23,6):38,
+  (23,7):126,
+  (23,8):28,
+  (23,9):26,
+  (23,10):30,
+  (23,11):2,
+  (23,12):212,
+  (23,13):33,
+  (23,14):29,
+  (23,15):34,
+  (23,16):43,
+  (23,17):118,
+  (23,18):38,
+  (23,19):120,
+  (23,20):28,
+  (23,21):31,
+  (23,22):2,
+  (23,23):507,
+  (23,24):30,
+  (23,25):29,
+  (23,26):33,
+  (23,27):28,
+  (23,28):24,
+  (23,29):595,
+  (23,30):541,
+  (23,31):32,
+  (23,32):549,
+  (29,2):2,
+  (29,3):33,
+  (29,4):2,
+  (29,5):37,
+  (29,6):32,
+  (29,7):2,
+  (29,8):2,
+  (29,9):32,
+  (29,10):34,
+  (29,11):33,
+  (29,12):31,
+  (29,13):33,
+  (29,14):2,
+  (29,15):204,
+  (29,16):2,
+  (29,17):60,
+  (29,18):41,
+  (29,19):33,
+  (29,20):53,
+  (29,21):842,
+  (29,22):31,
+  (29,23):64,
+  (29,24):50,
+  (29,25):60,
+  (29,26):36,
+  (29,27):37,
+  (29,28):2,
+  (29,29):813,
+  (29,30):32,
+  (29,31):33,
+  (29,32):2,
+  (31,2):1,
+  (31,3):3,
+  (31,4):32,
+  (31,5):2,
+  (31,6):5,
+  (31,7):34,
+  (31,8):35,
+  (31,9):3,
+  (31,10):2,
+  (31,11):125,
+  (31,12):49,
+  (31,13):94,
+  (31,14):43,
+  (31,15):3,
+  (31,16):218,
+  (31,17):35,
+  (31,18):5,
+  (31,19):35,
+  (31,20):37,
+  (31,21):127,
+  (31,22):47,
+  (31,23):98,
+  (31,24):991,
+  (31,25):2,
+  (31,26):34,
+  (31,27):3,
+  (31,28):973,
+  (31,29):41,
+  (31,30):7,
+  (31,31):931,
+  (31,32):43,
+  (37,2):2,
+  (37,3):2,
+  (37,4):2,
+  (37,5):42,
+  (37,6):2,
+  (37,7):38,
+  (37,8):2,
+  (37,9):2,
+  (37,10):77,
+  (37,11):51,
+  (37,12):2,
+  (37,13):188,
+  (37,14):59,
+  (37,15):44,
+  (37,16):2,
+  (37,17):82,
+  (37,18):2,
+  (37,19):1373,
+  (37,20):48,
+  (37,21):120,
+  (37,22):117,
+  (37,23):1374,
+  (37,24):2,
+  (37,25):336,
+  (37,26):45,
+  (37,27):2,
+  (37,28):298,
+  (37,29):1425,
+  (37,30):49,
+  (41,2):3,
+  (41,3):42,
+  (41,4):3,
+  (41,5):2,
+  (41,6):44,
+  (41,7):44,
+  (41,8):3,
+  (41,9):42,
+  (41,10):6,
+  (41,11):126,
+  (41,12):46,
+  (41,13):42,
+  (41,14):44,
+  (41,15):54,
+  (41,16):3,
+  (41,17):166,
+  (41,18):48,
+  (41,19):56,
+  (41,20):6,
+  (41,21):44,
+  (41,22):79,
+  (41,23):60,
+  (41,24):51,
+  (41,25):2,
+  (41,26):86,
+  (41,27):1744,
+  (41,28):51,
+  (41,29):49,
+  (43,2):1,
+  (43,3):3,
+  (43,4):46,
+  (43,5):50,
+  (43,6):6,
+  (43,7):2,
+  (43,8):95,
+  (43,9):3,
+  (43,10):130,
+  (43,11):97,
+  (43,12):45,
+  (43,13):52,
+  (43,14):4,
+  (43,15):605,
+  (43,16):304,
+  (43,17):64,
+  (43,18):6,
+  (43,19):311,
+  (43,20):61,
+  (43,21):3,
+  (43,22):130,
+  (43,23):92,
+  (43,24):1851,
+  (43,25):268,
+  (43,26):50,
+  (43,27):3,
+  (43,28):142,
+  (47,2):1,
+  (47,3):51,
+  (47,4):52,
+  (47,5):50,
+  (47,6):48,
+  (47,7):50,
+  (47,8):56,
+  (47,9):60,
+  (47,10):64,
+  (47,11):57,
+  (47,12):64,
+  (47,13):50,
+  (47,14):70,
+  (47,15):63,
+  (47,16):50,
+  (47,17):58,
+  (47,18):63,
+  (47,19):251,
+  (47,20):67,
+  (47,21):2278,
+  (47,22):50,
+  (47,23):2,
+  (47,24):2259,
+  (47,25):54,
+  (47,26):57,
+  (47,27):54,
+  (47,28):54,
+  (47,29):54,
+  (47,30):79,
+}
+
+primitive = {
+  (2,2):3,
+  (2,3):3,
+  (2,4):3,
+  (2,5):5,
+  (2,6):3,
+  (2,7):3,
+  (2,8):29,
+  (2,9):17,
+  (2,10):9,
+  (2,11):5,
+  (2,12):83,
+  (2,13):27,
+  (2,14):43,
+  (2,15):3,
+  (2,16):45,
+  (2,17):9,
+  (2,18):39,
+  (2,19):39,
+  (2,20):9,
+  (2,21):5,
+  (2,22):3,
+  (2,23):33,
+  (2,24):27,
+  (2,25):9,
+  (2,26):71,
+  (2,27):39,
+  (2,28):9,
+  (2,29):5,
+  (2,30):83,
+  (2,31):9,
+  (2,32):175,
+  (2,33):83,
+  (2,34):231,
+  (2,35):5,
+  (2,36):119,
+  (2,37):63,
+  (2,38):99,
+  (2,39):17,
+  (2,40):57,
+  (2,41):9,
+  (2,42):63,
+  (2,43):89,
+  (2,44):101,
+  (2,45):27,
+  (2,46):303,
+  (2,47):33,
+  (2,48):183,
+  (2,49):113,
+  (2,50):29,
+  (2,51):75,
+  (2,52):9,
+  (2,53):71,
+  (2,54):125,
+  (2,55):71,
+  (2,56):149,
+  (2,57):45,
+  (2,58):99,
+  (2,59):123,
+  (2,60):3,
+  (2,61):39,
+  (2,62):105,
+  (2,63):3,
+  (2,64):27,
+  (2,65):27,
+  (2,66):365,
+  (2,67):39,
+  (2,68):163,
+  (2,69):101,
+  (2,70):43,
+  (2,71):43,
+  (2,72):95,
+  (2,73):29,
+  (2,74):153,
+  (2,75):75,
+  (2,76):53,
+  (2,77):101,
+  (2,78):135,
+  (2,79):29,
+  (2,80):175,
+  (2,81):17,
+  (2,82):467,
+  (2,83):149,
+  (2,84):427,
+  (2,85):263,
+  (2,86):101,
+  (2,87):163,
+  (2,88):315,
+  (2,89):105,
+  (2,90):45,
+  (2,91):237,
+  (2,92):101,
+  (2,93):5,
+  (2,94):99,
+  (2,95):119,
+  (2,96):221,
+  (2,97):65,
+  (2,98):159,
+  (2,99):177,
+  (2,100):389,
+  (3,2):5,
+  (3,3):7,
+  (3,4):5,
+  (3,5):7,
+  (3,6):5,
+  (3,7):16,
+  (3,8):29,
+  (3,9):64,
+  (3,10):32,
+  (3,11):16,
+  (3,12):215,
+  (3,13):7,
+  (3,14):5,
+  (3,15):16,
+  (3,16):116,
+  (3,17):7,
+  (3,18):269,
+  (3,19):16,
+  (3,20):248,
+  (3,21):31,
+  (3,22):53,
+  (3,23):31,
+  (3,24):197,
+  (3,25):55,
+  (3,26):32,
+  (3,27):385,
+  (3,28):332,
+  (3,29):91,
+  (3,30):5,
+  (3,31):31,
+  (3,32):116,
+  (3,33):262,
+  (3,34):32,
+  (3,35):16,
+  (3,36):380,
+  (3,37):52,
+  (3,38):44,
+  (3,39):316,
+  (3,40):5,
+  (3,41):7,
+  (3,42):365,
+  (3,43):31,
+  (3,44):29,
+  (3,45):64,
+  (5,2):7,
+  (5,3):17,
+  (5,4):37,
+  (5,5):22,
+  (5,6):7,
+  (5,7):17,
+  (5,8):38,
+  (5,9):38,
+  (5,10):33,
+  (5,11):17,
+  (5,12):138,
+  (5,13):42,
+  (5,14):162,
+  (5,15):27,
+  (5,16):142,
+  (5,17):62,
+  (5,18):637,
+  (5,19):137,
+  (5,20):38,
+  (5,21):22,
+  (5,22):33,
+  (5,23):48,
+  (5,24):157,
+  (5,25):267,
+  (5,26):162,
+  (5,27):22,
+  (5,28):138,
+  (5,29):153,
+  (5,30):683,
+  (5,31):17,
+  (5,32):172,
+  (7,2):10,
+  (7,3):23,
+  (7,4):75,
+  (7,5):11,
+  (7,6):159,
+  (7,7):44,
+  (7,8):10,
+  (7,9):58,
+  (7,10):257,
+  (7,11):11,
+  (7,12):164,
+  (7,13):58,
+  (7,14):115,
+  (7,15):172,
+  (7,16):17,
+  (7,17):11,
+  (7,18):159,
+  (7,19):116,
+  (7,20):208,
+  (7,21):172,
+  (7,22):346,
+  (7,23):205,
+  (7,24):514,
+  (7,25):373,
+  (7,26):59,
+  (7,27):67,
+  (7,28):264,
+  (7,29):37,
+  (7,30):61,
+  (7,31):79,
+  (7,32):390,
+  (11,2):18,
+  (11,3):15,
+  (11,4):13,
+  (11,5):136,
+  (11,6):151,
+  (11,7):15,
+  (11,8):149,
+  (11,9):31,
+  (11,10):138,
+  (11,11):113,
+  (11,12):18,
+  (11,13):26,
+  (11,14):184,
+  (11,15):137,
+  (11,16):149,
+  (11,17):15,
+  (11,18):173,
+  (11,19):302,
+  (11,20):138,
+  (11,21):137,
+  (11,22):376,
+  (11,23):152,
+  (11,24):13,
+  (11,25):136,
+  (11,26):1454,
+  (11,27):196,
+  (13,2):15,
+  (13,3):19,
+  (13,4):184,
+  (13,5):54,
+  (13,6):197,
+  (13,7):41,
+  (13,8):695,
+  (13,9):93,
+  (13,10):366,
+  (13,11):19,
+  (13,12):184,
+  (13,13):158,
+  (13,14):15,
+  (13,15):19,
+  (13,16):258,
+  (13,17):401,
+  (13,18):2216,
+  (13,19):119,
+  (13,20):2294,
+  (13,21):176,
+  (13,22):397,
+  (13,23):19,
+  (13,24):249,
+  (13,25):202,
+  (13,26):184,
+  (13,27):171,
+  (13,28):566,
+  (17,2):20,
+  (17,3):20,
+  (17,4):28,
+  (17,5):20,
+  (17,6):29,
+  (17,7):22,
+  (17,8):343,
+  (17,9):122,
+  (17,10):24,
+  (17,11):58,
+  (17,12):906,
+  (17,13):40,
+  (17,14):329,
+  (17,15):57,
+  (17,16):367,
+  (17,17):275,
+  (17,18):20,
+  (17,19):57,
+  (17,20):309,
+  (17,21):499,
+  (17,22):328,
+  (17,23):521,
+  (17,24):330,
+  (17,25):20,
+  (19,2):21,
+  (19,3):23,
+  (19,4):48,
+  (19,5):28,
+  (19,6):22,
+  (19,7):80,
+  (19,8):21,
+  (19,9):386,
+  (19,10):413,
+  (19,11):157,
+  (19,12):34,
+  (19,13):137,
+  (19,14):395,
+  (19,15):365,
+  (19,16):469,
+  (19,17):55,
+  (19,18):395,
+  (19,19):346,
+  (19,20):21,
+  (19,21):24,
+  (19,22):383,
+  (23,2):30,
+  (23,3):26,
+  (23,4):34,
+  (23,5):26,
+  (23,6):38,
+  (23,7):127,
+  (23,8):580,
+  (23,9):26,
+  (23,10):30,
+  (23,11):35,
+  (23,12):605,
+  (23,13):36,
+  (23,14):30,
+  (23,15):35,
+  (23,16):43,
+  (23,17):118,
+  (23,18):769,
+  (23,19):133,
+  (23,20):687,
+  (23,21):31,
+  (29,2):32,
+  (29,3):40,
+  (29,4):48,
+  (29,5):37,
+  (29,6):32,
+  (29,7):40,
+  (29,8):931,
+  (29,9):32,
+  (29,10):901,
+  (29,11):852,
+  (29,12):44,
+  (29,13):39,
+  (29,14):43,
+  (29,15):553,
+  (29,16):1816,
+  (29,17):60,
+  (29,18):72,
+  (29,19):40,
+  (29,20):968,
+  (29,21):872,
+  (29,22):31,
+  (31,2):43,
+  (31,3):45,
+  (31,4):79,
+  (31,5):49,
+  (31,6):65,
+  (31,7):49,
+  (31,8):53,
+  (31,9):41,
+  (31,10):42,
+  (31,11):226,
+  (31,12):2037,
+  (31,13):162,
+  (31,14):43,
+  (31,15):970,
+  (31,16):1231,
+  (31,17):112,
+  (31,18):34,
+  (31,19):38,
+  (31,20):995,
+  (37,2):42,
+  (37,3):50,
+  (37,4):39,
+  (37,5):42,
+  (37,6):57,
+  (37,7):227,
+  (37,8):55,
+  (37,9):42,
+  (37,10):375,
+  (37,11):76,
+  (37,12):52,
+  (37,13):190,
+  (37,14):59,
+  (37,15):89,
+  (37,16):153,
+  (37,17):113,
+  (37,18):59,
+  (37,19):1391,
+  (37,20):59,
+  (37,21):128,
+  (41,2):53,
+  (41,3):47,
+  (41,4):58,
+  (41,5):94,
+  (41,6):48,
+  (41,7):135,
+  (41,8):53,
+  (41,9):52,
+  (41,10):1735,
+  (41,11):130,
+  (41,12):3427,
+  (41,13):89,
+  (41,14):54,
+  (41,15):54,
+  (41,16):339,
+  (41,17):170,
+  (41,18):48,
+  (43,2):46,
+  (43,3):57,
+  (43,4):63,
+  (43,5):56,
+  (43,6):69,
+  (43,7):52,
+  (43,8):147,
+  (43,9):1944,
+  (43,10):320,
+  (43,11):99,
+  (43,12):76,
+  (43,13):52,
+  (43,14):48,
+  (43,15):612,
+  (43,16):304,
+  (47,2):60,
+  (47,3):51,
+  (47,4):86,
+  (47,5):50,
+  (47,6):52,
+  (47,7):50,
+  (47,8):67,
+  (47,9):81,
+  (47,10):67,
+  (47,11):68,
+  (47,12):2297,
+  (47,13):50,
+  (47,14):70,
+  (47,15):74,
+  (47,16):2391,
+}
+
+sparse = {
+  (2,2):3,
+  (2,3):3,
+  (2,4):3,
+  (2,5):5,
+  (2,6):3,
+  (2,7):3,
+  (2,8):27,
+  (2,9):3,
+  (2,10):9,
+  (2,11):5,
+  (2,12):9,
+  (2,13):27,
+  (2,14):33,
+  (2,15):3,
+  (2,16):43,
+  (2,17):9,
+  (2,18):9,
+  (2,19):39,
+  (2,20):9,
+  (2,21):5,
+  (2,22):3,
+  (2,23):33,
+  (2,24):27,
+  (2,25):9,
+  (2,26):27,
+  (2,27):39,
+  (2,28):3,
+  (2,29):5,
+  (2,30):3,
+  (2,31):9,
+  (2,32):141,
+  (2,33):1025,
+  (2,34):129,
+  (2,35):5,
+  (2,36):513,
+  (2,37):83,
+  (2,38):99,
+  (2,39):17,
+  (2,40):57,
+  (2,41):9,
+  (2,42):129,
+  (2,43):89,
+  (2,44):33,
+  (2,45):27,
+  (2,46):3,
+  (2,47):33,
+  (2,48):45,
+  (2,49):513,
+  (2,50):29,
+  (2,51):75,
+  (2,52):9,
+  (2,53):71,
+  (2,54):513,
+  (2,55):129,
+  (2,56):149,
+  (2,57):17,
+  (2,58):524289,
+  (2,59):149,
+  (2,60):3,
+  (2,61):39,
+  (2,62):536870913,
+  (2,63):3,
+  (2,64):27,
+  (2,65):262145,
+  (2,66):9,
+  (2,67):39,
+  (2,68):513,
+  (2,69):101,
+  (2,70):43,
+  (2,71):65,
+  (2,72):1545,
+  (2,73):33554433,
+  (2,74):34359738369,
+  (2,75):75,
+  (2,76):2097153,
+  (2,77):101,
+  (2,78):105,
+  (2,79):513,
+  (2,80):533,
+  (2,81):17,
+  (2,82):267,
+  (2,83):149,
+  (2,84):33,
+  (2,85):263,
+  (2,86):2097153,
+  (2,87):8193,
+  (2,88):197,
+  (2,89):274877906945,
+  (2,90):134217729,
+  (2,91):291,
+  (2,92):2097153,
+  (2,93):5,
+  (2,94):2097153,
+  (2,95):2049,
+  (2,96):1601,
+  (2,97):65,
+  (2,98):2049,
+  (2,99):75,
+  (2,100):32769,
+  (2,101):195,
+  (2,102):536870913,
+  (2,103):513,
+  (2,104):27,
+  (2,105):17,
+  (2,106):32769,
+  (2,107):657,
+  (2,108):131073,
+  (2,109):53,
+  (2,110):8589934593,
+  (2,111):1025,
+  (2,112):57,
+  (2,113):513,
+  (2,114):45,
+  (2,115):417,
+  (2,116):23,
+  (2,117):39,
+  (2,118):8589934593,
+  (2,119):257,
+  (2,120):27,
+  (2,121):262145,
+  (2,122):71,
+  (2,123):5,
+  (2,124):524289,
+  (2,125):225,
+  (2,126):2097153,
+  (2,127):3,
+  (2,128):135,
+}
+
+conway = {
+  (2,1):1,
+  (2,2):3,
+  (2,3):3,
+  (2,4):3,
+  (2,5):5,
+  (2,6):27,
+  (2,7):3,
+  (2,8):29,
+  (2,9):17,
+  (2,10):111,
+  (2,11):5,
+  (2,12):235,
+  (2,13):27,
+  (2,14):169,
+  (2,15):53,
+  (2,16):45,
+  (2,17):9,
+  (2,18):5123,
+  (2,19):39,
+  (2,20):1779,
+  (2,21):101,
+  (2,22):8033,
+  (2,23):33,
+  (2,24):124585,
+  (2,25):325,
+  (2,26):17875,
+  (2,27):5805,
+  (2,28):8421,
+  (2,29):5,
+  (2,30):207023,
+  (2,31):9,
+  (2,32):33433,
+  (2,33):15689,
+  (2,34):104951,
+  (2,35):3237,
+  (3,1):1,
+  (3,2):8,
+  (3,3):7,
+  (3,4):56,
+  (3,5):7,
+  (3,6):179,
+  (3,7):19,
+  (3,8):593,
+  (3,9):76,
+  (3,10):2111,
+  (3,11):19,
+  (3,12):1064,
+  (3,13):7,
+  (3,14):49880,
+  (3,15):13387,
+  (3,16):6071,
+  (3,17):7,
+  (5,1):3,
+  (5,2):22,
+  (5,3):18,
+  (5,4):122,
+  (5,5):23,
+  (5,6):1152,
+  (5,7):18,
+  (5,8):722,
+  (5,9):258,
+  (5,10):11607,
+  (5,11):18,
+  (7,1):4,
+  (7,2):45,
+  (7,3):298,
+  (7,4):276,
+  (7,5):11,
+  (7,6):4357,
+  (7,7):46,
+  (7,8):1683,
+  (7,9):14795,
+  (11,1):9,
+  (11,2):79,
+  (11,3):31,
+  (11,4):1080,
+  (11,5):1219,
+  (11,6):50052,
+  (11,7):53,
+  (13,1):11,
+  (13,2):158,
+  (13,3):37,
+  (13,4):665,
+  (13,5):63,
+  (13,6):23974,
+  (13,7):50,
+  (17,1):14,
+  (17,2):275,
+  (17,3):31,
+  (17,4):2196,
+  (17,5):31,
+  (19,1):17,
+  (19,2):344,
+  (19,3):93,
+  (19,4):933,
+  (19,5):112,
+  (19,6):122856,
+  (19,7):131,
+  (23,1):18,
+  (23,2):488,
+  (23,3):64,
+  (23,4):2029,
+  (23,5):87,
+  (29,1):27,
+  (29,2):698,
+  (29,3):85,
+  (29,4):2119,
+  (29,5):114,
+  (31,1):28,
+  (31,2):902,
+  (31,3):59,
+  (31,4):3382,
+  (31,5):245,
+  (37,1):35,
+  (37,2):1223,
+  (37,3):257,
+  (37,4):9104,
+  (37,5):405,
+  (41,1):35,
+  (41,2):1564,
+  (41,3):76,
+  (41,4):949,
+  (41,5):67849,
+  (43,1):40,
+  (43,2):1809,
+  (43,3):83,
+  (43,4):11054,
+  (43,5):384,
+  (47,1):42,
+  (47,2):2120,
+  (47,3):183,
+  (47,4):19557,
+  (47,5):89,
+}
+
+if __name__ == '__main__' :
+  import sys, signal
+  from time import time
+  from msmath import ffield as ff
+  from msmath.numfuns import primes
+
+  class Timeout(BaseException) :
+    pass
+
+  def timeout(*args) :
+    raise Timeout;
+
+  signal.signal(signal.SIGALRM,timeout);
+  budget = float(sys.argv[1]) if len(sys.argv) > 1 else 60;
+  ff.polycache = None;
+  ff._polys = {};
+  ranges = {2:129, 3:65};    # n limits; 33 for other p < 50
+  tables = dict((k,{}) for k in kinds);
+  for p in primes() :
+    if p >= 50 : break;
+    for k in kinds :
+      if k == 'sparse' and p != 2 : continue;
+      start = time();
+      for n in range(1 if k == 'conway' else 2,ranges.get(p,33)) :
+        signal.alarm(int(max(1,budget+start-time())));
+        try :
+          if k == 'conway' :
+            tables[k][p,n] = ff.conwaypoly(p**n);
+          else :
+            tables[k][p,n] = ff._leastpoly(p,n,k);
+        except Timeout :
+          break;
+        finally :
+          signal.alarm(0);
+        sys.stderr.write('%s %d %d\n'%(k,p,n));
+  src = open(__file__).read();
+  print(src[:src.index('\nirreducible = {')]);
+  for k in kinds :
+    print('%s = {'%(k));
+    for (p,n),g in sorted(tables[k].items()) :
+      print('  (%d,%d):%d,'%(p,n,g));
+    print('}\n');
+  print(src[src.index("if __name__ == '__main__' :"):].rstrip('\n'));
@@ -3,9 +3,11 @@
 
 from . conversions import xrange
 from . numfuns import gcd, lam, rint, isint, getorder
-from . ffield import ffield
+from . ffield import ffield, _slots, _intern
 from . rational import rational
 
+internlimit = 1<<10;    # rings no larger than this share one instance per element
+
 # zm class
 
 def rintm(x,m) :
@@ -200,6 +202,7 @@ Descriptors: m, [multiplicative] order
 Each instance of the created type is an element of the ring:
 Instance variable (treat as read-only!):
   _x: an integer in range [0,m)
+Elements have __slots__; if m <= internlimit, each element has one shared instance
 
 Methods: __init__, __hash__, __repr__, __str__, __int__,
          __pos__, __neg__,
@@ -249,7 +252,8 @@ Descriptors: m, x, order [of element]
              __reduce__=__reduce__,
             );
 
-    _zm[m] = f = type.__new__(cls,'Z%d'%(m),(),d);
+    _zm[m] = f = type.__new__(cls,'Z%d'%(m),(),_slots(d,m <= internlimit));
+    if m <= internlimit : _intern(f);
     return f;
 
   def __init__(self,*args,**kwargs) :
@@ -4,7 +4,7 @@ import sys
 from collections import defaultdict
 from itertools import permutations,product
 from . conversions import range, xrange, lmap, long
-from . matrix import matrix
+from . matrix import matrix, smatrix
 
 class graph(object) :
   """Undirected graph
@@ -17,6 +17,7 @@ class graph(object) :
   components: a list indexed by node number, giving the set of nodes comprising
     the connected component containing the node; connected nodes share their set
   laplacian: the laplacian matrix
+  slaplacian: the laplacian matrix as an smatrix (sparse matrix)
  Methods:  __init__,__hash__,__repr__,__eq__,__ne__,
            __bool__, __nonzero__,__len__,__invert__,__and__,__or__,__xor__,
            complement,__iand__,__ior__,__ixor__
@@ -148,6 +149,17 @@ class graph(object) :
           m[j,j] += 1;
     return m;
 
+  @property
+  def slaplacian(self) :
+    """sparse laplacian matrix"""
+    n = self.__n;
+    d = {};
+    for i,j in self.edges :
+      d[i,j] = d[j,i] = -1;
+      d[i,i] = d.get((i,i),0)+1;
+      d[j,j] = d.get((j,j),0)+1;
+    return smatrix(n,n,d);
+
   def __ne__(self,other) :
     """Return False if self and other are the same graph, True otherwise"""
     return not (self == other);
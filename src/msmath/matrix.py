@@ -4,13 +4,29 @@
 
 from __future__ import division
 
-__all__ = ['matrix','bmatrix']
+__all__ = ['matrix','matrixview','smatrix','bmatrix','sbmatrix','batch_inverse']
 
 import types
+from operator import add as _add, sub as _sub, mul as _mul, xor as _xor
+from functools import reduce
 
-from . conversions import isint, isreal, xrange, gcd
+from . conversions import isint, isreal, isffield, xrange, bit_length, lcma
 
-from math import log
+from math import log, factorial
+from random import getrandbits
+
+try :
+  import numpy as np
+except Exception :
+  np = None;
+
+numpylimit = 8    # use numpy for machine-number matrices of dimension >= this
+mmranklimit = 16    # with numpy, integer rank is computed mod primes if dimension >= this
+mmdetlimit = 64    # with numpy, integer det is computed mod primes if dimension >= this
+m4rmbits = 8    # max number of bmatrix columns combined in each four Russians table
+btlimit = 256    # bmatrix transpose is done bit by bit if it has fewer elements than this
+strassenlimit = 32    # exact matrix products recurse by Strassen-Winograd down to this dimension
+dixonlimit = 16    # rational solve and inverse use p-adic lifting if dimension >= this
 
 def altabs(x) :
   try :
@@ -34,6 +50,23 @@ def product(iterable,start=1) :
     start *= i;
   return start;
 
+def batch_inverse(iterable) :
+  """Return a list of the inverses of the elements of the iterable,
+using one inversion and 3(n-1) multiplications (Montgomery's trick);
+raise ZeroDivisionError if any element is not invertible"""
+  x = list(iterable);
+  n = len(x);
+  if not n : return x;
+  a = [x[0]]*n;    # prefix products
+  for i in xrange(1,n) :
+    a[i] = a[i-1]*x[i];
+  y = 1/a[-1];
+  for i in xrange(n-1,0,-1) :
+    a[i] = y*a[i-1];
+    y *= x[i];
+  a[0] = y;
+  return a;
+
 def dot(v1,v2) :
   """Return the dot product of two vectors"""
   if len(v1) != len(v2) : raise ParameterError('vectors must have same length');
@@ -44,12 +77,933 @@ def dot(v1,v2) :
 
 def matmul(p,q,r,v1,v2) :
   """Multiply pxq array of elements v1 by qxr array of elements v2, result is pxr"""
+  if np and p*q*r >= numpylimit**3 :
+    v = _npmatmul(p,q,r,v1,v2);
+    if v is not None : return v;
+  v = _ffmatmul(p,q,r,v1,v2);
+  if v is not None : return v;
+  v = _ratmatmul(p,q,r,v1,v2);
+  if v is not None : return v;
+  if min(p,q,r) >= strassenlimit and \
+     not set(map(type,v1))|set(map(type,v2)) <= _complexes :
+    c = _swmatmul([v1[i::p] for i in xrange(p)],[v2[j::q] for j in xrange(q)],
+                  _add,_sub,_mul,v1[0]*0);
+    return [x for k in xrange(r) for x in (y[k] for y in c)];
   v = [0]*(p*r);
   for i in xrange(p) :
     for k in xrange(r) :
       v[i+k*p] = dot(v1[i::p],v2[k*q:(k+1)*q]);
   return v;
 
+def _ratmatmul(p,q,r,v1,v2) :
+  """Return matmul(p,q,r,v1,v2) if v1 and v2 are ints and finite rationals, not all
+ints, computed as an int product after scaling rows of v1 and columns of v2 by the
+lcm of their denominators, else None"""
+  from . rational import rational
+  t = set(map(type,v1))|set(map(type,v2));
+  if t <= _ints or not t <= _ints|frozenset((rational,)) : return None;
+  den = lambda x : x.denominator if isinstance(x,rational) else 1;
+  num = lambda x : x.numerator if isinstance(x,rational) else x;
+  if not all(map(den,v1)) or not all(map(den,v2)) : return None;    # infinity or nan
+  a = [lcma(*map(den,v1[i::p])) for i in xrange(p)];
+  b = [lcma(*map(den,v2[k*q:(k+1)*q])) for k in xrange(r)];
+  w1 = [num(x)*(a[i%p]//den(x)) for i,x in enumerate(v1)];
+  w2 = [num(x)*(b[i//q]//den(x)) for i,x in enumerate(v2)];
+  return [rational(x,a[i%p]*b[i//p]) for i,x in enumerate(matmul(p,q,r,w1,w2))];
+
+# Strassen-Winograd recursion: 7 block products and 15 block sums per level
+
+def _swmatmul(a,b,add,sub,mul,z) :
+  """Return the product, as a list of rows, of the matrices with rows a and b, using
+Strassen-Winograd recursion while every dimension is at least strassenlimit;
+add, sub, and mul are the element operations and z is a zero element"""
+  p,q,r = len(a),len(b),len(b[0]);
+  if min(p,q,r) < max(strassenlimit,2) :
+    c = list(zip(*b));    # columns
+    return [[reduce(add,map(mul,x,y)) for y in c] for x in a];
+  if p&1 : a = a+[[z]*q];    # pad to even dimensions
+  if q&1 :
+    a = [x+[z] for x in a];
+    b = b+[[z]*r];
+  if r&1 : b = [x+[z] for x in b];
+  h,k,l = (p+1)//2,(q+1)//2,(r+1)//2;
+  A11,A12 = [x[:k] for x in a[:h]],[x[k:] for x in a[:h]];
+  A21,A22 = [x[:k] for x in a[h:]],[x[k:] for x in a[h:]];
+  B11,B12 = [x[:l] for x in b[:k]],[x[l:] for x in b[:k]];
+  B21,B22 = [x[:l] for x in b[k:]],[x[l:] for x in b[k:]];
+  S = lambda op,X,Y : [list(map(op,x,y)) for x,y in zip(X,Y)];
+  S1 = S(add,A21,A22);
+  S2 = S(sub,S1,A11);
+  S3 = S(sub,A11,A21);
+  S4 = S(sub,A12,S2);
+  T1 = S(sub,B12,B11);
+  T2 = S(sub,B22,T1);
+  T3 = S(sub,B22,B12);
+  T4 = S(sub,T2,B21);
+  M = lambda X,Y : _swmatmul(X,Y,add,sub,mul,z);
+  P1 = M(A11,B11);
+  P5 = M(S1,T1);
+  U2 = S(add,P1,M(S2,T2));
+  U3 = S(add,U2,M(S3,T3));
+  U4 = S(add,U2,P5);
+  C11 = S(add,P1,M(A12,B21));
+  C12 = S(add,U4,M(S4,B22));
+  C21 = S(sub,U3,M(A22,T4));
+  C22 = S(add,U3,P5);
+  return [(x+y)[:r] for x,y in zip(C11,C12)]+[(x+y)[:r] for x,y in zip(C21,C22)][:p-h];
+
+# numpy fast paths, used only when every element is a python int, float or complex
+
+_ints = frozenset((int,type(1<<64)));    # long in python2
+_floats = _ints|frozenset((float,));
+_complexes = _floats|frozenset((complex,));
+
+def _npkind(v) :
+  """Return (kind,m) describing the elements of v:
+kind is 'i' if all are ints, with m the max absolute value,
+'f' if all are ints or floats, 'c' if all are ints, floats, or complex,
+or None if numpy can't be used"""
+  t = set(map(type,v));
+  if t <= _ints : return 'i',max(map(abs,v));
+  if t <= _floats : return 'f',None;
+  if t <= _complexes : return 'c',None;
+  return None,None;
+
+def _nparray(v,k,n) :
+  """Return numpy array with n rows from column-major v (i.e., the transpose),
+of dtype int64, float64, or complex128 according to k, or None if overflow"""
+  try :
+    return np.array(v,dtype=np.int64 if k == 'i' else float if k == 'f' else complex
+                   ).reshape(n,len(v)//n);
+  except OverflowError :
+    return None;
+
+def _npmatmul(p,q,r,v1,v2) :
+  """Return matmul(p,q,r,v1,v2) computed with numpy, or None if not exact"""
+  k1,m1 = _npkind(v1);
+  if not k1 : return None;
+  k2,m2 = _npkind(v2);
+  if not k2 : return None;
+  k = min(k1,k2);    # 'c' < 'f' < 'i'
+  if k == 'i' :
+    m = m1*m2*q;    # bound on all partial sums
+    if m >= 1<<63 : return None;
+    if m < 1<<53 : k = 'f';    # exact in float64, and BLAS is faster
+  a = _nparray(v1,k,q);
+  b = _nparray(v2,k,r);
+  if a is None or b is None : return None;
+  c = np.dot(b,a);    # transpose of product
+  if k == 'f' and k1 == k2 == 'i' : c = c.astype(np.int64);
+  return c.ravel().tolist();
+
+def _nprank(n,v) :
+  """Return the rank of n-row matrix v computed with numpy, or None"""
+  k = _npkind(v)[0];
+  if not k or k == 'i' : return None;    # ints are done exactly by _mmrank
+  return int(np.linalg.matrix_rank(_nparray(v,k,len(v)//n)));
+
+def _npdet(n,v) :
+  """Return the determinant of nxn matrix v computed with numpy, or None"""
+  k = _npkind(v)[0];
+  if not k or k == 'i' : return None;    # ints are done exactly by _mmdet
+  return np.linalg.det(_nparray(v,k,n)).item();
+
+def _npinverse(n,v) :
+  """Return the inverse of nxn matrix v computed with numpy, or None;
+raise ZeroDivisionError if singular"""
+  k = _npkind(v)[0];
+  if not k : return None;
+  a = _nparray(v,'c' if k == 'c' else 'f',n);
+  if a is None : return None;
+  try :
+    return np.linalg.inv(a).ravel().tolist();
+  except np.linalg.LinAlgError :
+    raise ZeroDivisionError('matrix not invertible');
+
+# finite field linear algebra on packed elements (the _x of ffield elements),
+# used when every element is in the same finite field
+
+def _fftype(v) :
+  """Return the finite field containing every element of v, or None"""
+  t = set(map(type,v));
+  if len(t) == 1 :
+    F = t.pop();
+    if isffield(F) : return F;
+  return None;
+
+def _ffmatmul(p,q,r,v1,v2) :
+  """Return matmul(p,q,r,v1,v2) if v1 and v2 are over the same finite field, else None"""
+  F = _fftype(v1);
+  if not F or _fftype(v2) is not F : return None;
+  c = F._p;
+  x = [e._x for e in v1];
+  y = [e._x for e in v2];
+  if F._q != c :
+    from . ffield import _arith
+    add,neg,mul = _arith(F);
+    if c == 2 : add = _xor;
+    x = [x[i::p] for i in xrange(p)];
+    if min(p,q,r) >= strassenlimit :
+      sub = add if c == 2 else lambda a,b : add(a,neg(b));
+      z = _swmatmul(x,[y[j::q] for j in xrange(q)],add,sub,mul,0);
+      return [F(e) for k in xrange(r) for e in (w[k] for w in z)];
+    return [F(reduce(add,map(mul,x[i],y[k*q:(k+1)*q])))
+            for k in xrange(r) for i in xrange(p)];
+  m = q*(c-1)**2;    # bound on unreduced sums of products
+  if np and p*q*r >= numpylimit**3 and m < 1<<63 :
+    d = float if m < 1<<53 else np.int64;
+    a = np.array(x,dtype=d).reshape(q,p);
+    b = np.array(y,dtype=d).reshape(r,q);
+    z = (np.dot(b,a)%c).astype(np.int64).ravel().tolist();
+  else :
+    x = [x[i::p] for i in xrange(p)];
+    z = [sum(map(_mul,x[i],y[k*q:(k+1)*q]))%c for k in xrange(r) for i in xrange(p)];
+  return list(map(F,z));
+
+# LU factorization: P*A = L*U with L unit lower triangular and U in row echelon form,
+# kept as (k,a,perm,piv,s): a holds the rows of U and, below the pivots, of L;
+# row i of a is row perm[i] of A; piv lists the pivot columns; s is the sign of perm;
+# k is the finite field if a holds packed elements, 'f' or 'c' if a is a numpy
+# float or complex array, or None if a holds the elements themselves
+
+def _lufactor(n,m,v) :
+  """Return the LU factorization of n-row column-major v"""
+  F = _fftype(v);
+  if F :
+    x = [e._x for e in v];
+    a = [x[i::n] for i in xrange(n)];
+    if F._q != F._p : return (F,)+_xlu(F,a,m);
+    return (F,)+_primelu(F._p,a,m);
+  if np and n >= numpylimit :
+    k = _npkind(v)[0];
+    if k :
+      k = 'c' if k == 'c' else 'f';
+      a = _nparray(v,k,m);
+      if a is not None : return (k,)+_nplu(a.T.copy(),m);
+  return (None,)+_plu([v[i::n] for i in xrange(n)],m);
+
+def _primelu(p,a,m) :
+  """Return _plu(a,m,p), using numpy if suitable"""
+  if np and p < 1<<31 and len(a) >= numpylimit :
+    return _nplu(np.array(a,dtype=np.int64),m,p);
+  return _plu(a,m,p);
+
+def _plu(a,m,p=None) :
+  """Factor a, a list of rows with m columns, in place, returning (a,perm,piv,s);
+if p, the elements are ints mod prime p, reduced only when needed"""
+  n = len(a);
+  perm = list(xrange(n));
+  piv = [];
+  s = 1;
+  r = 0;
+  for c in xrange(m) :
+    if r == n : break;
+    if p :
+      for i in xrange(r,n) :    # find pivot row (first nonzero pivot element)
+        if a[i][c]%p : break;
+      else :
+        continue;
+    else :
+      x = 0;
+      for j in xrange(r,n) :    # find pivot row (largest pivot element)
+        y = altabs(a[j][c]);
+        if y > x :
+          x = y;
+          i = j;
+      if not x : continue;
+    if i != r :
+      a[i],a[r] = a[r],a[i];
+      perm[i],perm[r] = perm[r],perm[i];
+      s = -s;
+    b = a[r];
+    if p :
+      b[c:] = [z%p for z in b[c:]];
+      y = pow(b[c],p-2,p);
+    else :
+      y = 1/b[c];
+    h = not p and type(y) in _complexes;    # divide a float pivot row by its pivot,
+    b = [w/b[c] for w in b[c+1:]] if h else b[c+1:];    # so equal columns stay equal
+    for i in xrange(r+1,n) :
+      x = a[i];
+      e = x[c];
+      f = x[c] = e*y%p if p else e*y;
+      if f :
+        x[c+1:] = [u-(e if h else f)*w for u,w in zip(x[c+1:],b)];
+    piv.append(c);
+    r += 1;
+  if p :
+    a = [[z%p for z in x] for x in a];
+  return a,perm,piv,s;
+
+def _nplu(a,m,p=None) :
+  """_plu for numpy array a, of int64 (with p < 2**31), float, or complex"""
+  n = len(a);
+  perm = list(xrange(n));
+  piv = [];
+  s = 1;
+  r = 0;
+  if p :
+    q = (p-1)**2;
+    t = p;    # bound on |elements|
+  for c in xrange(m) :
+    if r == n : break;
+    if p :
+      x = np.flatnonzero(a[r:,c]%p);
+      if not x.size : continue;
+      i = r+x[0];
+    else :
+      x = np.abs(a[r:,c]);
+      i = int(np.argmax(x));
+      if not x[i] : continue;
+      i += r;
+    if i != r :
+      a[[r,i]] = a[[i,r]];
+      perm[i],perm[r] = perm[r],perm[i];
+      s = -s;
+    if p :
+      if t > (1<<63)-1-q :
+        a[r:,c:] %= p;
+        t = p;
+      a[r,c:] %= p;
+      f = a[r+1:,c]%p*pow(int(a[r,c]),p-2,p)%p;
+      t += q;
+    else :
+      f = a[r+1:,c]/a[r,c];
+    a[r+1:,c] = f;
+    a[r+1:,c+1:] -= np.outer(f,a[r,c+1:]);
+    piv.append(c);
+    r += 1;
+  if p :
+    a %= p;
+  return a,perm,piv,s;
+
+def _xlu(F,a,m) :
+  """_plu for rows of packed elements of extension field F"""
+  from . ffield import _arith
+  add,neg,mul = _arith(F);
+  n = len(a);
+  perm = list(xrange(n));
+  piv = [];
+  s = 1;
+  r = 0;
+  for c in xrange(m) :
+    if r == n : break;
+    for i in xrange(r,n) :
+      if a[i][c] : break;
+    else :
+      continue;
+    if i != r :
+      a[i],a[r] = a[r],a[i];
+      perm[i],perm[r] = perm[r],perm[i];
+      s = -s;
+    y = (1/F(a[r][c]))._x;
+    b = a[r][c+1:];
+    for i in xrange(r+1,n) :
+      x = a[i];
+      f = x[c] = mul(x[c],y);
+      if f :
+        f = neg(f);
+        x[c+1:] = [add(u,mul(f,w)) for u,w in zip(x[c+1:],b)];
+    piv.append(c);
+    r += 1;
+  return a,perm,piv,s;
+
+def _lusolve(lu,b) :
+  """Return the rows x solving A*x = b, given the LU factorization of nonsingular A
+and b as rows of the same kind as the factorization's"""
+  k,a,perm = lu[:3];
+  if isffield(k) :
+    if k._q != k._p : return _xsolve(k,a,perm,b);
+    if np and isinstance(a,np.ndarray) :
+      return _npsolve(a,perm,np.array(b,dtype=np.int64),k._p).tolist();
+    return _psolve(a,perm,b,k._p);
+  if k :
+    return _npsolve(a,perm,b);
+  return _psolve(a,perm,b);
+
+def _psolve(a,perm,b,p=None) :
+  """_lusolve for a list of rows (of ints mod p, if p)"""
+  n = len(a);
+  b = [b[i] for i in perm];
+  for j in xrange(n) :    # L*y = b
+    w = b[j] = [z%p for z in b[j]] if p else b[j];
+    for i in xrange(j+1,n) :
+      f = a[i][j];
+      if f : b[i] = [u-f*z for u,z in zip(b[i],w)];
+  for j in xrange(n-1,-1,-1) :    # U*x = y
+    if p :
+      y = pow(a[j][j],p-2,p);
+      w = b[j] = [z*y%p for z in b[j]];
+    else :
+      y = 1/a[j][j];
+      w = b[j] = [y*z for z in b[j]];
+    for i in xrange(j) :
+      f = a[i][j];
+      if f : b[i] = [u-f*z for u,z in zip(b[i],w)];
+  return b;
+
+def _npsolve(a,perm,b,p=None) :
+  """_lusolve for numpy arrays (of int64, with p < 2**31)"""
+  n = len(a);
+  b = b[perm];
+  if p :
+    q = (p-1)**2;
+    t = p;    # bound on |elements|
+  for j in xrange(n) :    # L*y = b
+    if p :
+      if t > (1<<63)-1-q :
+        b %= p;
+        t = p;
+      b[j] %= p;
+      t += q;
+    b[j+1:] -= np.outer(a[j+1:,j],b[j]);
+  for j in xrange(n-1,-1,-1) :    # U*x = y
+    if p :
+      if t > (1<<63)-1-q :
+        b %= p;
+        t = p;
+      b[j] = b[j]%p*pow(int(a[j,j]),p-2,p)%p;
+      t += q;
+    else :
+      b[j] /= a[j,j];
+    b[:j] -= np.outer(a[:j,j],b[j]);
+  return b%p if p else b;
+
+def _xsolve(F,a,perm,b) :
+  """_lusolve for rows of packed elements of extension field F"""
+  from . ffield import _arith
+  add,neg,mul = _arith(F);
+  n = len(a);
+  b = [b[i] for i in perm];
+  for j in xrange(n) :    # L*y = b
+    w = b[j];
+    for i in xrange(j+1,n) :
+      f = a[i][j];
+      if f :
+        f = neg(f);
+        b[i] = [add(u,mul(f,z)) for u,z in zip(b[i],w)];
+  for j in xrange(n-1,-1,-1) :    # U*x = y
+    y = (1/F(a[j][j]))._x;
+    w = b[j] = [mul(y,z) for z in b[j]];
+    for i in xrange(j) :
+      f = a[i][j];
+      if f :
+        f = neg(f);
+        b[i] = [add(u,mul(f,z)) for u,z in zip(b[i],w)];
+  return b;
+
+def _ludet(lu,n) :
+  """Return the determinant of nxn A given its LU factorization"""
+  k,a,perm,piv,s = lu;
+  if isffield(k) :
+    if len(piv) < n : return k(0);
+    if k._q == k._p :
+      p = k._p;
+      d = s;
+      for i in xrange(n) :
+        d = d*int(a[i][i])%p;
+      return k(d);
+    from . ffield import _arith
+    add,neg,mul = _arith(k);
+    d = 1;
+    for i in xrange(n) :
+      d = mul(d,a[i][i]);
+    return k(d if s > 0 else neg(d));
+  if len(piv) < n : return a[0][0]*0 if not k else 0*a[0][0].item();
+  if k :
+    return (s*np.prod(a.diagonal())).item();
+  d = a[0][0];
+  for i in xrange(1,n) :
+    d *= a[i][i];
+  return d if s > 0 else -d;
+
+def _luelements(lu) :
+  """Return the factorization's rows as lists of elements"""
+  k,a = lu[:2];
+  if k and not isffield(k) or np and isinstance(a,np.ndarray) :
+    a = a.tolist();
+  if isffield(k) :
+    a = [list(map(k,x)) for x in a];
+  return a;
+
+# exact integer rank and determinant
+
+def _bareiss(n,v) :
+  """Return the rank and the signed last pivot of the n-row column-major integer
+matrix v, by Bareiss fraction-free elimination; for a nonsingular square matrix,
+the signed last pivot is the determinant"""
+  a = [v[i::n] for i in xrange(n)];
+  r = 0;
+  d = s = 1;
+  for c in xrange(len(v)//n) :
+    if r == n : break;
+    x = 0;
+    for i in xrange(r,n) :    # find pivot row (smallest nonzero pivot element)
+      y = a[i][c];
+      if y and (not x or abs(y) < abs(x)) :
+        x = y;
+        pr = i;
+    if not x : continue;
+    if pr != r :
+      a[pr],a[r] = a[r],a[pr];
+      s = -s;
+    b = a[r][c+1:];
+    for i in xrange(r+1,n) :    # all divisions are exact
+      y = a[i];
+      f = y[c];
+      y[c+1:] = [(x*u-f*w)//d for u,w in zip(y[c+1:],b)];
+    d = x;
+    r += 1;
+  return r,s*d;
+
+_mmprimes = [];    # primes just below 2**31, largest first
+
+def _isprime31(p) :
+  """Return True iff odd p, 7 < p < 2**31, is prime, by a Miller-Rabin test
+that is deterministic in this range"""
+  c = p-1;
+  b = 0;
+  while not c&1 :
+    c >>= 1;
+    b += 1;
+  for a in (2,3,5,7) :
+    x = pow(a,c,p);
+    if x == 1 or x == p-1 : continue;
+    for i in xrange(b-1) :
+      x = x*x%p;
+      if x == p-1 : break;
+    else :
+      return False;
+  return True;
+
+def _mmprime(i) :
+  """Return the ith largest prime below 2**31"""
+  while len(_mmprimes) <= i :
+    p = _mmprimes[-1]-2 if _mmprimes else (1<<31)-1;
+    while not _isprime31(p) : p -= 2;
+    _mmprimes.append(p);
+  return _mmprimes[i];
+
+def _hadamard(n,v) :
+  """Return log2 of the product of the larger of 1 and the norm of each column
+of the n-row integer matrix v, a bound on the absolute value of every minor"""
+  return sum(log(max(1,sum(x*x for x in v[j:j+n]))) for j in xrange(0,len(v),n))/log(4);
+
+def _mmrows(n,v) :
+  """Return a function giving the n rows of integer matrix v mod a prime p"""
+  if np and n >= numpylimit and max(map(abs,v)) < 1<<63 :
+    a = np.array(v,dtype=np.int64).reshape(len(v)//n,n).T;
+    return lambda p: a%p;
+  return lambda p: [[x%p for x in v[i::n]] for i in xrange(n)];
+
+def _mmrank(n,v) :
+  """Return the rank of n-row integer matrix v as the max of its ranks mod primes;
+a nonzero maximal minor can't be divisible by primes whose product exceeds it"""
+  m = len(v)//n;
+  k = min(n,m);
+  h = _hadamard(n,v);
+  rows = _mmrows(n,v);
+  r = 0;
+  b = 1;    # product of primes used
+  i = 0;
+  while r < k and bit_length(b) <= h+1 :
+    p = _mmprime(i);
+    i += 1;
+    r = max(r,len(_primelu(p,rows(p),m)[2]));
+    b *= p;
+  return r;
+
+def _mmdet(n,v) :
+  """Return the determinant of nxn integer matrix v, from its values mod primes,
+combined by the Chinese remainder theorem until they determine it"""
+  h = _hadamard(n,v)+1;
+  rows = _mmrows(n,v);
+  x = 0;
+  b = 1;    # product of primes used; x is det mod b
+  i = 0;
+  while bit_length(b) <= h+1 :
+    p = _mmprime(i);
+    i += 1;
+    a,perm,piv,d = _primelu(p,rows(p),n);
+    if len(piv) < n :
+      d = 0;
+    else :
+      for j in xrange(n) :
+        d = d*int(a[j][j])%p;
+    x += b*((d-x)*pow(b%p,p-2,p)%p);
+    b *= p;
+  return x if 2*x < b else x-b;
+
+# p-adic (Dixon) lifting for exact solutions of integer linear systems
+
+def _ratrecon(u,m,N,D) :
+  """Return (a,b) with a == b*u mod m, |a| <= N, and 0 < b <= D, or None"""
+  r0,r1 = m,u%m;
+  s0,s1 = 0,1;
+  while r1 > N :
+    q = r0//r1;
+    r0,r1 = r1,r0-q*r1;
+    s0,s1 = s1,s0-q*s1;
+  if not s1 or abs(s1) > D : return None;
+  return (r1,s1) if s1 > 0 else (-r1,-s1);
+
+def _vecrecon(x,m,N,D) :
+  """Return (w,d) with w/d == x mod m for ints x, with |w| <= N*d/b for each element's
+own denominator b and common denominator d <= D, or None"""
+  d = 1;
+  r = [];
+  for u in x :    # reconstruct x*d, whose denominator is smaller than x's
+    ab = _ratrecon(u*d%m,m,N,D//d);
+    if ab is None : return None;
+    d *= ab[1];
+    r.append((ab[0],d));
+  return [a*(d//e) for a,e in r],d;
+
+def _mmproduct(n,a) :
+  """Return a function giving the rows of a*y, for nxn integer matrix a (column-major)
+and y a list of n rows of ints in [0,2**31), computed with numpy on signed limbs of a
+small enough for the products to be exact in int64, if suitable"""
+  k = 62-31-bit_length(n);    # bits per limb
+  if not (np and n >= numpylimit and k >= 8) :
+    rows = [a[i::n] for i in xrange(n)];
+    return lambda y : [[dot(r,c) for c in zip(*y)] for r in rows];
+  mask = (1<<k)-1;
+  l = (bit_length(max(map(abs,a)))+k-1)//k;
+  limbs = [np.array([(abs(x)>>(j*k)&mask)*(-1 if x < 0 else 1) for x in a],
+                    dtype=np.int64).reshape(n,n).T for j in xrange(l)];
+  def product(y) :
+    y = np.array(y,dtype=np.int64);
+    z = [0]*len(y)*len(y[0]);
+    for j in xrange(l-1,-1,-1) :    # Horner's rule in 2**k
+      z = [(u<<k)+v for u,v in zip(z,np.dot(limbs[j],y).ravel().tolist())];
+    c = len(y[0]);
+    return [z[i:i+c] for i in xrange(0,len(z),c)];
+  return product;
+
+def _padic(d,p) :
+  """Return (x,p**len(d)), with x the rows of the sum of d[i]*p**i, for d a nonempty
+list of matrices given as rows, summing halves recursively"""
+  if len(d) == 1 : return d[0],p;
+  h = len(d)//2;
+  x,m = _padic(d[:h],p);
+  y,q = _padic(d[h:],p);
+  return [[u+m*v for u,v in zip(*w)] for w in zip(x,y)],m*q;
+
+def _dixon(n,a,b) :
+  """Return (w,d) with a*w == d*b, for nxn integer matrix a and integer matrix b with
+n rows, all column-major lists, or None if a is singular mod the primes tried;
+the solution is lifted mod p**k one p-adic digit at a time, so the residual stays
+bounded, and recovered by rational reconstruction"""
+  c = len(b)//n;
+  rows = _mmrows(n,a);
+  for i in xrange(3) :
+    p = _mmprime(i);
+    f,perm,piv,s = _primelu(p,rows(p),n);
+    if len(piv) == n : break;
+  else :
+    return None;
+  h = _hadamard(n,a);    # denominators divide det(a)
+  g = h+max(_hadamard(n,b[j:j+n]) for j in xrange(0,len(b),n));    # bounds numerators
+  N,D = 1<<int(g+1),1<<int(h+1);
+  product = _mmproduct(n,a);
+  r = [b[i::n] for i in xrange(n)];    # residual, as rows
+  x,m = [[0]*c for i in xrange(n)],1;    # the solution mod m
+  ys = [];    # the p-adic digits not yet in x
+  k = 0;
+  t = 1;    # reconstruct early when the number of digits reaches t
+  while True :
+    y = [[u%p for u in v] for v in r];
+    if np and isinstance(f,np.ndarray) :
+      y = _npsolve(f,perm,np.array(y,dtype=np.int64),p).tolist();
+    else :
+      y = _psolve(f,perm,y,p);
+    ys.append(y);
+    k += 1;
+    if k == t or k*30 > bit_length(N*D) :    # p**k > 2*N*D
+      z,q = _padic(ys,p);
+      x = [[u+m*v for u,v in zip(*w)] for w in zip(x,z)];
+      m *= q;
+      ys = [];
+      v = [u for j in xrange(c) for u in (w[j] for w in x)];
+      if k*30 > bit_length(N*D) : return _vecrecon(v,m,N,D);
+      t *= 2;
+      e = 1<<((bit_length(m)-2)//2);
+      wd = _vecrecon(v,m,e,e);
+      if wd and matmul(n,n,c,a,wd[0]) == [wd[1]*u for u in b] : return wd;
+    r = [[(u-v)//p for u,v in zip(*w)] for w in zip(r,product(y))];
+
+def _ratsolve(n,v,w) :
+  """Return x solving v*x == w, for nxn matrix v and matrix w with n rows, all
+column-major lists, using _dixon on the rows scaled to ints, if v and w are ints and
+finite rationals, not all ints, else None"""
+  from . rational import rational
+  t = set(map(type,v))|set(map(type,w));
+  if t <= _ints or not t <= _ints|frozenset((rational,)) : return None;
+  c = len(w)//n;
+  a,b = [0]*(n*n),[0]*(n*c);
+  for i in xrange(n) :
+    x = _ratscale(v[i::n]+w[i::n]);
+    if x is None : return None;    # infinity or nan
+    a[i::n],b[i::n] = x[1][:n],x[1][n:];
+  wd = _dixon(n,a,b);
+  if wd is None : return None;
+  return [rational(x,wd[1]) for x in wd[0]];
+
+# reductions and maps along dimensions of column-major arrays
+
+def _axes(dims,d) :
+  """Return the sorted list of the distinct dimension indices d of an array with dims"""
+  if len(d) == 1 and islistlike(d[0]) : d = d[0];
+  for i in d :
+    if not isint(i) or not 0 <= i < len(dims) :
+      raise ParameterError('dimension index out of range');
+  if len(set(d)) != len(d) : raise ParameterError('dimension indices must be distinct');
+  return sorted(d);
+
+def _offsets(dims,s,axes) :
+  """Return the offsets, in column-major order, of the elements of the subarray
+along the given axes of an array with dims and strides s"""
+  o = [0];
+  for a in axes :
+    o = [x+j*s[a] for j in xrange(dims[a]) for x in o];
+  return o;
+
+def _axisgroups(v,dims,d) :
+  """Return the dims remaining after removing the sorted axes d, and a generator of
+lists, one for each element of the remaining array in column-major order, of the
+elements of column-major array v along the axes d, also in column-major order"""
+  s = [product(dims[:i]) for i in xrange(len(dims))];    # strides
+  o = _offsets(dims,s,[i for i in xrange(len(dims)) if not i in d]);
+  a = s[d[0]];
+  b = a*dims[d[0]];
+  r = _offsets(dims,s,d[1:]);
+  return [dims[i] for i in xrange(len(dims)) if not i in d], \
+    (v[x:x+b:a] for x in o) if len(r) == 1 else \
+    ([y for z in r for y in v[x+z:x+z+b:a]] for x in o);
+
+def _median(v) :
+  """Return the median of the elements of v"""
+  s = sorted(v);
+  z = len(s);
+  if not z : raise ZeroDivisionError;
+  return s[z//2] if z&1 else (s[z//2-1]+s[z//2])/2;
+
+_reducers = dict(sum=sum,product=product,max=max,min=min,median=_median,
+                 mean=lambda v : sum(v)/len(v));
+
+def _npreduce(f,v,dims,d) :
+  """Return, as a column-major list, the reduction f ('sum', 'product', 'max',
+'min', 'median', or 'mean') along the sorted axes d of column-major array v
+computed with numpy, or None if not exactly as without numpy"""
+  k,m = _npkind(v);
+  if k != 'i' or f in ('product','median') :    # numpy sums floats pairwise,
+    return None;    # and orders nans differently
+  c = product(dims[i] for i in d);
+  if m*c >= 1<<63 : return None;    # bound on sums
+  a = np.array(v,dtype=np.int64).reshape(dims,order='F');
+  w = getattr(np,{'product':'prod','mean':'sum'}.get(f,f))(a,axis=tuple(d));
+  w = w.ravel(order='F').tolist();
+  return [x/c for x in w] if f == 'mean' else w;
+
+# strided subarrays of column-major arrays
+
+def _strides(dims) :
+  """Return the strides of a column-major array with dims"""
+  s = [1];
+  for n in dims[:-1] :
+    s.append(s[-1]*n);
+  return s[:len(dims)];
+
+def _subscript(key,dims,s,o=0) :
+  """Return (o,dims,strides) for the subarray selected by key, a tuple of an int or
+slice for each dimension, from the array with dims, strides s, and offset o;
+dimensions selected by ints are removed"""
+  if len(key) != len(dims) :
+    raise ParameterError('length of index list must be number of dimensions');
+  d = [];
+  t = [];
+  for k,n,x in zip(key,dims,s) :
+    if isinstance(k,slice) :
+      a,b,c = k.indices(n);
+      d.append(len(xrange(a,b,c)));
+      t.append(x*c);
+      o += a*x;
+    elif isint(k) :
+      if not 0 <= k < n :
+        raise IndexError('index out of range');
+      o += k*x;
+    else :
+      raise TypeError('index type unsupported');
+  return o,d,t;
+
+def _indices(o,dims,s) :
+  """Return the list of positions, in column-major order, of the elements of the
+strided array with offset o, dims, and strides s"""
+  ix = [o];
+  for n,x in zip(dims,s) :
+    ix = [i+j*x for j in xrange(n) for i in ix];
+  return ix;
+
+# characteristic and minimal polynomials
+
+def _berkowitz(n,v) :
+  """Return the coefficients, leading 1 first, of the characteristic polynomial
+of the nxn matrix with column-major elements v, by Berkowitz's division-free method"""
+  a = [v[i::n] for i in xrange(n)];    # rows
+  p = [1];
+  for r in xrange(n) :
+    q = [1,-a[r][r]];    # first column of Toeplitz matrix
+    R = a[r][:r];
+    c = [a[i][r] for i in xrange(r)];
+    for k in xrange(r) :
+      q.append(-dot(R,c));
+      if k < r-1 :
+        c = [dot(a[i][:r],c) for i in xrange(r)];
+    p = [sum((q[i-j]*p[j] for j in xrange(max(0,i-len(q)+1),min(i+1,len(p))
+              )),0) for i in xrange(r+2)];
+  return p;
+
+def _hessenberg(n,v) :
+  """Return the rows of an upper Hessenberg matrix similar to the nxn matrix with
+column-major field elements v, reduced by Gaussian elimination"""
+  a = [v[i::n] for i in xrange(n)];    # rows
+  approx = set(map(type,v)) <= _complexes;
+  for j in xrange(n-2) :
+    r = [i for i in xrange(j+1,n) if a[i][j]];
+    if not r : continue;
+    i = max(r,key=lambda i : abs(a[i][j])) if approx else r[0];
+    if i != j+1 :    # swap rows and columns i and j+1
+      a[i],a[j+1] = a[j+1],a[i];
+      for x in a :
+        x[i],x[j+1] = x[j+1],x[i];
+    d = 1/a[j+1][j];
+    for i in xrange(j+2,n) :
+      u = a[i][j]*d;
+      if not u : continue;
+      # row i -= u*row j+1; column j+1 += u*column i
+      a[i] = [x-u*y for x,y in zip(a[i],a[j+1])];
+      for x in a :
+        x[j+1] += u*x[i];
+  return a;
+
+def _hesscharpoly(a) :
+  """Return the coefficients, leading 1 first, of the characteristic polynomial
+of the upper Hessenberg matrix with rows a"""
+  n = len(a);
+  p = [[1]];    # p[m] is charpoly of leading mxm submatrix, constant term first
+  for m in xrange(1,n+1) :
+    q = [0]+p[m-1];
+    for k,x in enumerate(p[m-1]) :
+      q[k] -= a[m-1][m-1]*x;
+    t = 1;
+    for i in xrange(1,m) :
+      t *= a[m-i][m-i-1];
+      if not t : break;
+      c = t*a[m-1-i][m-1];
+      for k,x in enumerate(p[m-1-i]) :
+        q[k] -= c*x;
+    p.append(q);
+  return p[n][::-1];
+
+def _vecminpoly(a,u) :
+  """Return the coefficients, constant term first, of the minimal polynomial of
+the vector u with respect to the matrix with rows a of field elements"""
+  z = u[0]*0;
+  w = [];    # reduced Krylov vectors, as (pivot,elements,coefficients)
+  P = u;
+  for k in xrange(len(u)+1) :
+    x = P;
+    c = [z]*k+[z+1];
+    for j,y,d in w :
+      if x[j] :
+        f = x[j]/y[j];
+        x = [s-f*t for s,t in zip(x,y)];
+        c = [s-f*t for s,t in zip(c,d+[z]*(k+1-len(d)))];
+    for j in xrange(len(x)) :
+      if x[j] : break;
+    else :
+      return c;
+    w.append((j,x,c));
+    P = [dot(r,P) for r in a];
+  raise ArithmeticError('no minimal polynomial');    # only if arithmetic is inexact
+
+def _minpoly(n,v) :
+  """Return the coefficients, leading 1 first, of the minimal polynomial of the nxn
+matrix A with column-major field elements v, as the lcm of the minimal polynomials
+of the unit vectors, using lcm(L,minpoly(b)) = L*minpoly(L(A)*b)"""
+  a = [v[i::n] for i in xrange(n)];    # rows
+  z = v[0]*0;
+  L = [z+1];    # constant term first
+  for i in xrange(n) :
+    if len(L) > n : break;
+    u = [z]*n;
+    u[i] = L[-1];
+    for c in reversed(L[:-1]) :    # u = L(A)*b by Horner's rule
+      u = [dot(r,u) for r in a];
+      u[i] += c;
+    if any(u) :
+      g = _vecminpoly(a,u);
+      L = [sum((L[j]*g[k-j] for j in xrange(max(0,k-len(g)+1),min(k+1,len(L)))),z)
+           for k in xrange(len(L)+len(g)-1)];
+  return L[::-1];
+
+def _ratscale(v) :
+  """Return (d,w), with w the ints d*v for the least such d, if v is all ints and
+finite rationals, else None"""
+  from . rational import rational
+  t = set(map(type,v));
+  if not t <= _ints|frozenset((rational,)) : return None;
+  d = lcma(*[x.denominator for x in v if isinstance(x,rational)]);
+  if not d : return None;    # infinity or nan
+  return d,[int(x*d) for x in v];
+
+def _isfield(v) :
+  """Return True if the elements of v are all floats, complex, rationals, or
+xrationals (but not all ints), or are all in the same finite field"""
+  if _fftype(v) : return True;
+  from . rational import rational, xrational
+  t = set(map(type,v));
+  return not t <= _ints and t <= _complexes|frozenset((rational,xrational));
+
+# matrix exponential by scaling and squaring a Pade approximant
+
+_padetheta = ((3,1.495585217958292e-2),(5,2.539398330063230e-1),
+              (7,9.504178996162932e-1),(9,2.097847961257068),(13,5.371920351148152));
+              # max 1-norm for each degree to get double precision [Higham 2005]
+
+def _padecoeffs(m) :
+  """Return the coefficients of the numerator of the [m/m] Pade approximant to exp,
+scaled to be ints; the denominator has the same coefficients with alternating signs"""
+  f = [1];
+  for k in xrange(1,2*m+1) :
+    f.append(f[-1]*k);
+  return [f[2*m-k]*f[m]//(f[k]*f[m-k]) for k in xrange(m+1)];
+
+def _padeexpm(A,m,s,approximate=None) :
+  """Return exp(A) computed as the [m/m] Pade approximant to exp(A/2**s), squared
+s times, applying approximate to the elements of intermediate results"""
+  n = A.dims[0];
+  if approximate : A.map(approximate);
+  c = _padecoeffs(m);
+  P = [matrix.Identity(n),A*A];    # powers of A*A
+  for j in xrange(2,m//2+1) :
+    if approximate : P[-1].map(approximate);
+    P.append(P[-1]*P[1]);
+  if approximate : P[-1].map(approximate);
+  U = sum((c[k]*P[k//2] for k in xrange(3,m+1,2)),c[1]*P[0]);
+  U = A*U;
+  V = sum((c[k]*P[k//2] for k in xrange(2,m+1,2)),c[0]*P[0]);
+  N,D = V+U,V-U;
+  if approximate :
+    N.map(approximate);
+    D.map(approximate);
+  R = D.solve(N);
+  for _ in xrange(s) :
+    if approximate : R.map(approximate);
+    R *= R;
+  if approximate : R.map(approximate);
+  return R;
+
 def listr(v) :    # output string for list, using str rather than repr
   return '[ '+', '.join(map(str,v))+' ]';
 
@@ -66,23 +1020,41 @@ Instance variables:
   dims: a tuple giving the dimensions of the array
   tr or trace: the trace of the [square] matrix
   squeeze: an array with the same elements but all 1s in dims removed
+  view: a matrixview of the array, sharing its elements, that can be indexed,
+    transposed, and squeezed without copying, and assigned to write through
   T or transpose: the transpose of the matrix [of dimension <= 2]
   H or conjugate_transpose: the Hermitian transpose of the matrix [dim <= 2]
   det or determinant: the determinant of the [square] matrix
   inverse: the inverse of the [square] matrix
   rank: the rank of the matrix (may be wrong if any float or complex elements)
+  lu: (P,L,U) with P a permutation matrix, L unit lower triangular, U echelon, P*M==L*U
+  rref: the reduced row echelon form of the matrix
+  nullspace: a list of vectors forming a basis for the null space of the matrix
 Methods:
   __init__, __repr__, __str__, __getitem__, __setitem__, __delitem__,
   __bool__, __nonzero__, __eq__, __ne__, __lt__, __le__, __ge__, __gt__,
   __neg__, __invert__, __iadd__, __add__, __radd__, __isub__, __sub__, __rsub__,
-  __imul__, __mul__, __rmul__, __itruediv__, __idiv__, __truediv__, __div__
+  __imul__, __mul__, __rmul__, __itruediv__, __idiv__, __truediv__, __div__,
+  solve, expm, charpoly, minpoly
 
 NOTE: a 1x1x1x...1 matrix is treated as a scalar [could even be no 1s]
-NOTE: a list or tuple is coerced to a scalar or 1D matrix when multiplying with a matrix"""
+NOTE: a list or tuple is coerced to a scalar or 1D matrix when multiplying with a matrix
+NOTE: if numpy is available, products, rank, det, and inverse of matrices of
+ dimension >= numpylimit whose elements are all python ints, floats, or complex
+ are computed with numpy (int products only when exact)
+NOTE: rank and det of integer matrices are exact, by Bareiss elimination or,
+ for large matrices if numpy is available, modulo enough primes
+NOTE: products, rank, det, and inverse of matrices whose elements are all in the
+ same finite field are computed on the packed elements, using numpy if available
+NOTE: the LU factorization, rank, det, and inverse are cached until the matrix is
+ modified; A/B solves using the factorization of B.T rather than computing B**-1
+NOTE: a 2D matrix can be added to or multiplied by an smatrix (sparse matrix),
+ giving a matrix; matrix(smatrix_arg) makes a dense copy"""
 
   def __init__(self,*dims) :
     """Create a matrix
 matrix(matrix_arg) makes a copy of matrix_arg
+matrix(smatrix_arg) makes a dense copy of smatrix_arg
 matrix(d1,d2,...,dk) or
 matrix(d1,d2,...,dk,[one or prod(di) elements, column by column, ...])
 makes a matrix with dimension d1 x d2 x ... x dk having elements all 0 or
@@ -97,6 +1069,7 @@ to handle elements that look like lists (e.g., quaternions)
     if not dims : raise ParameterError('requires some arguments');
     self.__dict__['_matrix__v'] = [];
     self.__dict__['_matrix__dims'] = [];
+    self.__dict__['_matrix__cache'] = {};    # factorization, rank, det, inverse, T, ...
     if isinstance(dims[0],matrix) :
       if len(dims) != 1 : raise ParameterError('matrix arg must be only one');
       self.__dims[:] = dims[0].__dims;
@@ -107,6 +1080,18 @@ to handle elements that look like lists (e.g., quaternions)
       self.__dims[:] = dims[0].dims;
       self.__v[:] = list(dims[0]);
       return;
+    if isinstance(dims[0],matrixview) :
+      if len(dims) != 1 : raise ParameterError('matrixview arg must be only one');
+      self.__dims[:] = dims[0].dims;
+      self.__v[:] = list(dims[0]);
+      return;
+    if isinstance(dims[0],smatrix) :
+      if len(dims) != 1 : raise ParameterError('smatrix arg must be only one');
+      n,m = self.__dims[:] = dims[0].dims;
+      self.__v[:] = [0]*(n*m);
+      for (i,j),x in dims[0].dok.items() :
+        self.__v[i+n*j] = x;
+      return;
     if islistlike(dims[0]) :
       v = dims[1] if len(dims) == 2 and islistlike(dims[1]) \
           else dims[1:] if dims[1:] else (0,);
@@ -231,6 +1216,8 @@ with successive lines varying the remaining dimensions, earlier faster"""
   def __iadd__(self, other) :
     """Add an array elementwise to this array, or,
 if other is a scalar, add the scalar to each element of this array"""
+    self.__cache.clear();
+    if isinstance(other,matrixview) : other = other.copy();
     if isinstance(other,matrix) :
       if len(other.__v) == 1 :
         for i in xrange(len(self.__v)) :
@@ -244,6 +1231,12 @@ if other is a scalar, add the scalar to each element of this array"""
         for i in xrange(len(self.__v)) :
           self.__v[i] += other;
       else : raise ParameterError('matrices must have same dimensions');
+    elif isinstance(other,smatrix) :
+      if other.dims != self.dims :
+        raise ParameterError('matrices must have same dimensions');
+      n = self.__dims[0];
+      for (i,j),x in other.dok.items() :
+        self.__v[i+n*j] += x;
     else :        # scalar
       for i in xrange(len(self.__v)) :
         self.__v[i] += other;
@@ -261,6 +1254,8 @@ return a copy of the first array with each element incremented by the scalar"""
   def __isub__(self, other) :
     """Subtract an array elementwise from this array, or,
 if other is a scalar, subtract the scalar from each element of this array"""
+    self.__cache.clear();
+    if isinstance(other,matrixview) : other = other.copy();
     if isinstance(other,matrix) :
       if len(other.__v) == 1 :
         for i in xrange(len(self.__v)) :
@@ -269,6 +1264,12 @@ if other is a scalar, subtract the scalar from each element of this array"""
         for i in xrange(len(self.__v)) :
           self.__v[i] -= other.__v[i];
       else : raise ParameterError('matrices must have same dimensions');
+    elif isinstance(other,smatrix) :
+      if other.dims != self.dims :
+        raise ParameterError('matrices must have same dimensions');
+      n = self.__dims[0];
+      for (i,j),x in other.dok.items() :
+        self.__v[i+n*j] -= x;
     else :                # scalar
       for i in xrange(len(self.__v)) :
         self.__v[i] -= other;
@@ -291,6 +1292,8 @@ any * scalar :  scalar multiply
 1D * 1D:  dot product (sum of the elementwise products)
 2D * 2D:  matrix multiply
 2D * 1D  or  1D * 2D:  treat vector as row or column as appropriate"""
+    self.__cache.clear();
+    if isinstance(other,matrixview) : other = other.copy();
     if isinstance(other,matrix) :
       if len(other.__v) == 1 :           # other is scalar
         for i in xrange(len(self.__v)) :
@@ -306,7 +1309,7 @@ any * scalar :  scalar multiply
           if len(self.__v) != len(other.__v) :
             raise ParameterError('vectors must have same length');
           self.__dims[:] = [];
-          self.__v[:] = [dot(self.__v,other.__v)];
+          self.__v[:] = matmul(1,len(self.__v),1,self.__v,other.__v);
         elif len(other.__dims) == 2 :      # 1D x 2D
           if self.__dims[0] != other.__dims[0] :
             raise ParameterError('inner dimensions must agree');
@@ -324,6 +1327,10 @@ any * scalar :  scalar multiply
           if len(other.__dims) < 2 : del self.__dims[1];   # preserve vectorness
         else : raise TypeError('only matrices can be multiplied');
       else : raise TypeError('only matrices can be multiplied');
+    elif isinstance(other,smatrix) :
+      x = other.__rmul__(self);
+      self.__dims[:] = x.__dims;
+      self.__v[:] = x.__v;
     elif islistlike(other) :
       return self.__imul__(type(self)(len(other),other));
     else :    # matrix * scalar
@@ -346,6 +1353,7 @@ any * scalar :  scalar multiply
 
   def _scalardiv(self,b) :
     """Divide self by scalar b"""
+    self.__cache.clear();
     for i in xrange(len(self.__v)) :
       self.__v[i] /= b ;
     return self;
@@ -355,8 +1363,22 @@ any * scalar :  scalar multiply
     if isinstance(other,matrix) :
       if len(other.__v) == 1 :
         return self._scalardiv(other.__v[0]);
-      if len(self.__dims) == 2 and self.__dims[0] == self.__dims[1] :
-        return self.__imul__(other**-1);
+      if len(other.__dims) == 2 and other.__dims[0] == other.__dims[1] :
+        # solve x*other = self as other.T*x.T = self.T
+        try :
+          T = other.__cache['T'];    # keeps its own factorization
+        except KeyError :
+          T = other.__cache['T'] = other.T;
+        if len(self.__dims) == 1 :
+          x = T.solve(self);
+        elif len(self.__dims) == 2 :
+          x = T.solve(self.T).T;
+        else :
+          raise TypeError('only matrices can be divided');
+        self.__cache.clear();
+        self.__dims[:] = x.__dims;
+        self.__v[:] = x.__v;
+        return self;
       raise TypeError('only square matrices can be divisors');
     elif islistlike(other) :
       if len(other) == 1 :
@@ -382,6 +1404,7 @@ any * scalar :  scalar multiply
     """Raise a scalar to a power or a square matrix to an integer power"""
     # compute self**x; self must be square matrix and x must be integer
     # if x < 0, self must be invertible
+    self.__cache.clear();
     if len(self.__v) == 1 :    # scalar
       self.__v[0]**=x;
       return self;
@@ -416,28 +1439,41 @@ any * scalar :  scalar multiply
       return type(self)(self.__dims,b**self.__v[0]);
     n = self.__dims[0];
     if len(self.__dims) != 2 or n != self.__dims[1] :
-      return TypeError('exponent must be square matrix');
+      raise TypeError('exponent must be square matrix');
     if not isreal(b) :
-      approximate = lambda x: x.significate(16);
-      logb = approximate(b.log());    # an exception here is legit
+      logb = b.log().significate(16);    # an exception here is legit
     elif b > 0 :
       logb = log(b);
-      approximate = None;
     else :
-      return TypeError('base must be positive real');
-    P = logb*self;
-    S = self.Identity(n);
-    M = self.Identity(n);
-    for x in xrange(1,10001) :
-      M *= P;
-      M /= x;
-      v = S.__v[:];
-      S += M;
-      if approximate :
-        M.mapply(approximate);
-        S.mapply(approximate);
-      if v == S.__v : break;
-    return S;
+      raise TypeError('base must be positive real');
+    return (logb*self).expm();
+
+  def expm(self,extrabits=0) :
+    """Return e to the power of the square matrix, by scaling and squaring a Pade
+approximant; if the elements are python ints, floats, or complex, the result is
+float or complex to about double precision, otherwise the result is computed with
+elements approximated to rational.set_significance()+extrabits bits"""
+    n = self.__dims[0];
+    if len(self.__dims) != 2 or n != self.__dims[1] :
+      raise TypeError('requires square matrix');
+    A = type(self)(self);
+    a = max(sum(abs(x) for x in self.__v[j*n:(j+1)*n]) for j in xrange(n));
+    k = _npkind(self.__v)[0];
+    if k :    # double precision
+      A.map(complex if k == 'c' else float);
+      for m,t in _padetheta :
+        if a <= t :
+          return _padeexpm(A,m,0);
+      s = max(0,int(log(a/t,2))+1);
+      return _padeexpm(A/(1<<s),m,s);
+    from . rational import set_significance
+    s = bit_length(int(2*a));    # a/2**s <= 1/2
+    e = set_significance()+extrabits+s+8;    # squaring loses about s bits
+    for m in xrange(1,e) :    # [m/m] error bound for norm 1/2 < 2**-e
+      if factorial(m)**2 << e < factorial(2*m)*factorial(2*m+1) << (2*m+1) : break;
+    approximate = lambda x : x.significate(extrabits+s+8) if \
+      hasattr(x,'significate') else x;
+    return _padeexpm(A/(1<<s) if s else A,m,s,approximate);
 
   def __abs__(self) :
     """Return the square root of the sum of the absolute squares of the array elements"""
@@ -466,54 +1502,19 @@ treat the array as a list of its elements in storage order"""
         return v;
       # return the submatrix...
       return type(self)([len(v)] if self.__dims else [] ,v);
-    if len(key) != len(self.__dims) :
-      raise ParameterError('length of index list must be number of dimensions');
-    key = list(key);    # so can modify it
-    # figure out dims of result, which depends on slices
-    dims = [];
-    single = True;
-    for i in xrange(len(self.__dims)) :
-      if isinstance(key[i],slice) :
-        key[i] = key[i].indices(self.__dims[i]);
-        dim = len(xrange(*key[i]));
-        if not dim :
-          raise IndexError('no items selected');
-        dims.append(dim);
-        single = False;
-      elif isint(key[i]) :
-        if not 0 <= key[i] < self.__dims[i] :
-          raise IndexError('index out of range');
-        key[i] = (key[i],);
-        dims.append(1);
-      else :
-        raise TypeError('index type unsupported');
-    if single :
-      s = 0
-      for i in reversed(xrange(len(key))) :
-        s = s*self.__dims[i] + key[i][0];
-      return self.__v[s];
+    o,dims,s = _subscript(key,self.__dims,_strides(self.__dims));
+    if not dims :
+      return self.__v[o];
+    if not product(dims) :
+      raise IndexError('no items selected');
     # must return a submatrix...
-    v = [];
-    x = [0]*len(dims);
-    while True :
-      s = 0;
-      for i in reversed(xrange(len(key))) :
-        if len(key[i]) == 1 :
-          s = s*self.__dims[i] + key[i][0];
-        else :
-          s = s*self.__dims[i] + list(xrange(*key[i]))[x[i]];
-      v.append(self.__v[s]);
-      for i in xrange(len(dims)) :
-        x[i] = (x[i]+1)%dims[i];
-        if x[i] : break;
-      else : break;
-    for i in reversed(xrange(len(dims))) :
-      if len(key[i]) == 1 : del dims[i];
-    return type(self)(dims,v);
+    v = self.__v;
+    return type(self)(dims,[v[i] for i in _indices(o,dims,s)]);
 
   def __setitem__(self,key,value) :
     """Set an item or slice of the array, interpreting key as for __getitem__;
 when setting a slice, value must have length matching size of slice"""
+    self.__cache.clear();
     if not isinstance(key,tuple) :
       if isinstance(key,slice) :
         k = key.indices(len(self.__v));
@@ -525,57 +1526,28 @@ when setting a slice, value must have length matching size of slice"""
           raise TypeError('value must have same length as slice');
       self.__v[key] = value;    # linear indexing always allowed
       return;
-    if len(key) != len(self.__dims) :
-      raise ParameterError('length of index list must be number of dimensions');
-    # figure out dims of result, which depends on slices
-    key = list(key);    # so can modify it
-    # figure out dims of result, which depends on slices
-    dims = [];
-    single = True;
-    for i in xrange(len(self.__dims)) :
-      if isinstance(key[i],slice) :
-        key[i] = key[i].indices(self.__dims[i]);
-        dim = len(xrange(*key[i]));
-        dims.append(dim);
-        single = False;
-      elif isint(key[i]) :
-        if not 0 <= key[i] < self.__dims[i] :
-          raise IndexError('index out of range');
-        key[i] = (key[i],);
-        dims.append(1);
-      else :
-        raise TypeError('index type unsupported');
-    if single :
-      s = 0
-      for i in reversed(xrange(len(key))) :
-        s = s*self.__dims[i] + key[i][0];
-      self.__v[s] = value;
+    o,dims,s = _subscript(key,self.__dims,_strides(self.__dims));
+    if not dims :
+      self.__v[o] = value;
       return;
     # must set a submatrix...
-    pdims = product(dims);
-    if not isreal(value) and pdims != len(value) :
+    ix = _indices(o,dims,s);
+    if isreal(value) :
+      for i in ix :
+        self.__v[i] = value;
+      return;
+    if isinstance(value,matrixview) : value = list(value);    # may share elements
+    if len(ix) != len(value) :
       raise TypeError('value must have same length as slice');
-    x = [0]*len(dims);
-    for j in xrange(pdims) :
-      s = 0;
-      for i in reversed(xrange(len(key))) :
-        if len(key[i]) == 1 :
-          s = s*self.__dims[i] + key[i][0];
-        else :
-          s = s*self.__dims[i] + list(xrange(*key[i]))[x[i]];
-      self.__v[s] = value if isreal(value) else value[j];
-      for i in xrange(len(dims)) :
-        x[i] = (x[i]+1)%dims[i];
-        if x[i] : break;
-      else : break;
-    for i in reversed(xrange(len(dims))) :
-      if len(key[i]) == 1 : del dims[i];
+    for j,i in enumerate(ix) :
+      self.__v[i] = value[j];
     if isinstance(value,matrix) and dims != value.__dims :
       raise UserWarning('value and slice dimensions differ');
     return;
 
   def __delitem__(self,key) :
     """Remove a slab from the array; all but one of the keys must be a full slice"""
+    self.__cache.clear();
     if not isinstance(key,tuple) :
       key = (key,);
     if len(key) != len(self.__dims) :
@@ -683,6 +1655,11 @@ when setting a slice, value must have length matching size of slice"""
     """transpose"""
     return self.T;
 
+  @property
+  def view(self) :
+    """view of the whole array, sharing its elements"""
+    return matrixview(self.__v,self.__cache,0,self.__dims,_strides(self.__dims));
+
   @property
   def H(self) :
     """conjugate transpose"""
@@ -695,9 +1672,45 @@ when setting a slice, value must have length matching size of slice"""
     """conjugate transpose"""
     return self.H;
 
+  def _factor(self) :
+    """Return the cached LU factorization of the 2D matrix"""
+    try :
+      return self.__cache['lu'];
+    except KeyError :
+      pass;
+    if len(self.__dims) != 2 : raise TypeError('requires matrix');
+    lu = self.__cache['lu'] = _lufactor(self.__dims[0],self.__dims[1],self.__v);
+    return lu;
+
+  @property
+  def lu(self) :
+    """(P,L,U) such that P*M == L*U, where P is a permutation matrix,
+L is unit lower triangular, and U is in row echelon form"""
+    n,m = self.__dims if len(self.__dims) == 2 else (0,0);
+    k,a,perm,piv,s = lu = self._factor();
+    a = _luelements(lu);
+    z = self.__v[0]*0;
+    o = z+1;
+    P = [0]*(n*n);
+    for i in xrange(n) :
+      P[i+n*perm[i]] = 1;
+    L = [z]*(n*n);
+    L[::n+1] = (o,)*n;
+    U = [z]*(n*m);
+    for j,c in enumerate(piv) :
+      for i in xrange(j+1,n) :
+        L[i+n*j] = a[i][c];
+      for cc in xrange(c,m) :
+        U[j+n*cc] = a[j][cc];
+    return type(self)(n,n,P),type(self)(n,n,L),type(self)(n,m,U);
+
   @property
   def rank(self) :
     """rank"""
+    try :
+      return self.__cache['rank'];
+    except KeyError :
+      pass;
     if len(self.__v) <= 1 :
       return 1-(not self.__v[0]);
     n = self.__dims[0];    # number of rows
@@ -705,122 +1718,50 @@ when setting a slice, value must have length matching size of slice"""
       if len(self.__dims) == 1 :
         return 0 + any(self.__v);
       raise TypeError('requires matrix') ;
-    integral = 1;
-    v = self.__v[:];
-    for x in v :
-      if not isint(x) :
-        integral = 0;
-        break;
-    nc = self.__dims[1];    # number of columns
-    rank = 0;
-    rows = list(xrange(n));
-    if integral :
-      for c in xrange(nc) :    # for each column
-        if not rows : break;
-        x = float('inf');
-        for r in rows :    # find pivot row (smallest nonzero pivot element)
-          a = abs(v[r+n*c]);
-          if a and a < x :
-            x = a;
-            pr = r;
-        if isint(x) :
-          rank += 1;
-          x = v[pr+n*c];
-          rx = rows.index(pr);
-          del rows[rx];
-          for r in rows :
-            a = v[r+n*c];
-            g = gcd(a,x);
-            mx = a//g;
-            ma = x//g;
-            for cc in xrange(c+1,nc) :
-              v[r+n*cc] = ma*v[r+n*cc] - mx*v[pr+n*cc];
-    else :
-      for c in xrange(nc) :    # for each column
-        if not rows : break;
-        x = 0;
-        for r in rows :    # find pivot row (largest pivot element)
-          a = altabs(v[r+n*c]);
-          if a > x :
-            x = a;
-            pr = r;
-        if x :
-          rank += 1;
-          x = v[pr+n*c];
-          for pc in xrange(c+1,nc) :
-            v[pr+n*pc] /= x;
-          rx = rows.index(pr);
-          del rows[rx];
-          for r in rows :
-            a = v[r+n*c];
-            for cc in xrange(c+1,nc) :
-              v[r+n*cc] -= a*v[pr+n*cc];
+    rank = None;
+    if np and min(self.__dims) >= numpylimit :
+      rank = _nprank(n,self.__v);
+    if rank is None :
+      for x in self.__v :
+        if not isint(x) :
+          rank = len(self._factor()[3]);
+          break;
+      else :
+        if np and min(self.__dims) >= mmranklimit :
+          rank = _mmrank(n,self.__v);
+        else :
+          rank = _bareiss(n,self.__v)[0];
+    self.__cache['rank'] = rank;
     return rank;
 
   @property
   def det(self) :
     """determinant"""
+    try :
+      return self.__cache['det'];
+    except KeyError :
+      pass;
     if len(self.__v) <= 1 :
       return self.__v[0];
     n = self.__dims[0];
     if len(self.__dims) != 2 or n != self.__dims[1] :
       raise AttributeError('rank requires square matrix') ;
-    integral = 1;
-    v = self.__v[:];
-    for x in v :
-      if not isint(x) :
-        integral = 0;
-        break;
-    if integral :
-      d = 1;    # numerator
-      dd = 1;   # denominator
-      rows = list(xrange(n));
-      for c in xrange(n-1) :    # for each column
-        x = float('inf');
-        for r in rows :    # find pivot row (smallest nonzero pivot element)
-          a = abs(v[r+n*c]);
-          if a and a < x :
-            x = a;
-            pr = r;
-        if not isint(x) : return 0;
-        x = v[pr+n*c];
-        d *= x;
-        rx = rows.index(pr);
-        if rx & 1 :
-          d = -d;
-        del rows[rx];
-        for r in rows :
-          a = v[r+n*c];
-          g = gcd(a,x);
-          mx = a//g;
-          ma = x//g;
-          dd *= ma;
-          for cc in xrange(c+1,n) :
-            v[r+n*cc] = ma*v[r+n*cc] - mx*v[pr+n*cc];
-      return d*v[rows[0]+n*(n-1)]//dd;
-    d = 1;
-    rows = list(xrange(n));
-    for c in xrange(n-1) :    # for each column
-      x = 0;
-      for r in rows :    # find pivot row (largest pivot element)
-        a = altabs(v[r+n*c]);
-        if a > x :
-          x = a;
-          pr = r;
-      if not x : return 0;
-      x = v[pr+n*c];
-      d *= x;
-      for pc in xrange(c+1,n) :
-        v[pr+n*pc] /= x;
-      rx = rows.index(pr);
-      if rx & 1 :
-        d = -d;
-      del rows[rx];
-      for r in rows :
-        a = v[r+n*c];
-        for cc in xrange(c+1,n) :
-          v[r+n*cc] -= a*v[pr+n*cc];
-    return d*v[rows[0]+n*(n-1)];
+    d = None;
+    if np and n >= numpylimit :
+      d = _npdet(n,self.__v);
+    if d is None :
+      for x in self.__v :
+        if not isint(x) :
+          d = _ludet(self._factor(),n);
+          break;
+      else :
+        if np and n >= mmdetlimit :
+          d = _mmdet(n,self.__v);
+        else :
+          r,d = _bareiss(n,self.__v);
+          if r < n : d = 0;
+    self.__cache['det'] = d;
+    return d;
 
   @property
   def determinant(self) :
@@ -836,32 +1777,160 @@ when setting a slice, value must have length matching size of slice"""
     n = self.__dims[0];
     if len(self.__dims) != 2 or n != self.__dims[1] :
       raise AttributeError('requires square matrix') ;
-    n2 = n*n;
-    v = self.__v[:]+[0]*n2;
-    v[n2::n+1] = (1,)*n;
-    for c in xrange(n) :
-      x = 0;
-      for r in xrange(c,n) :
-        a = altabs(v[r+n*c]);
-        if a > x :
-          x = a;
-          pr = r;
-      if not x : raise ZeroDivisionError('matrix not invertible');
-      if pr != c : v[c::n],v[pr::n] = v[pr::n],v[c::n];
-      x = v[c*(n+1)];
-      if x != 1 :
-        y = 1/x;
-        for cc in xrange(c+1,2*n) : v[c+n*cc] = y*v[c+n*cc];
-      for r in xrange(c+1,n) :
-        x = v[r+n*c];
-        for cc in xrange(c+1,2*n) :
-          v[r+n*cc] -= x*v[c+n*cc];
-    for c in reversed(xrange(1,n)) :
-      for r in xrange(0,c) :
-        x = v[r+n*c];
-        for cc in xrange(n) :
-          v[n2+r+n*cc] -= x*v[n2+c+n*cc];
-    return type(self)(n,n,v[n2:2*n2]);
+    try :
+      return type(self)(n,n,self.__cache['inverse']);
+    except KeyError :
+      pass;
+    if set(map(type,self.__v)) <= _ints and self.rank < n :    # float tests are inexact
+      raise ZeroDivisionError('matrix not invertible');
+    v = None;
+    if np and n >= numpylimit :
+      v = _npinverse(n,self.__v);
+    if v is None and n >= dixonlimit :
+      v = _ratsolve(n,self.__v,[int(i == j) for i in xrange(n) for j in xrange(n)]);
+    if v is None :
+      k,a,perm,piv,s = lu = self._factor();
+      if len(piv) < n : raise ZeroDivisionError('matrix not invertible');
+      if k and not isffield(k) :
+        v = _lusolve(lu,np.eye(n,dtype=complex if k == 'c' else float)).T.ravel().tolist();
+      else :
+        b = [[0]*n for i in xrange(n)];
+        for i in xrange(n) :
+          b[i][i] = 1;
+        b = _lusolve(lu,b);
+        v = [x for j in xrange(n) for x in (r[j] for r in b)];
+        if k : v = list(map(k,v));
+    self.__cache['inverse'] = v;
+    return type(self)(n,n,v);
+
+  def solve(self,b) :
+    """Return x such that M*x == b, for M a nonsingular square matrix and b a vector
+(a 1D matrix, list, or tuple) or a matrix with as many rows as M;
+the LU factorization of M is cached, so solving repeatedly with M is cheap"""
+    if len(self.__v) <= 1 and len(self.__dims) != 2 :
+      return b/self.__v[0];
+    n = self.__dims[0];
+    if len(self.__dims) != 2 or n != self.__dims[1] :
+      raise AttributeError('requires square matrix') ;
+    if isinstance(b,matrix) :
+      dims,w = b.__dims,b.__v;
+    elif islistlike(b) :
+      dims,w = [len(b)],list(b);
+    else :
+      raise TypeError('requires vector or matrix');
+    if len(dims) > 2 or dims[0] != n :
+      raise ParameterError('inner dimensions must agree');
+    c = len(w)//n;
+    if n >= dixonlimit :
+      x = _ratsolve(n,self.__v,w);
+      if x is not None : return type(self)(dims,x);
+    if set(map(type,self.__v)) <= _ints and self.rank < n :    # float tests are inexact
+      raise ZeroDivisionError('matrix not invertible');
+    k,a,perm,piv,s = lu = self._factor();
+    if len(piv) < n : raise ZeroDivisionError('matrix not invertible');
+    if isffield(k) :
+      if _fftype(w) is k :
+        w = [e._x for e in w];
+      else :
+        k,a = None,_luelements(lu);
+    elif k :
+      t = _npkind(w)[0];
+      b = t and _nparray(w,'c' if 'c' in (k,t) else 'f',c);
+      if b is not None and t :
+        x = _lusolve(lu,b.T.copy());
+        return type(self)(dims,x.T.ravel().tolist());
+      k,a = None,_luelements(lu);
+    x = _lusolve((k,a,perm),[w[i::n] for i in xrange(n)]);
+    x = [z for j in xrange(c) for z in (r[j] for r in x)];
+    return type(self)(dims,list(map(k,x)) if k else x);
+
+  def charpoly(self) :
+    """Return the characteristic polynomial det(x*I-M) of the square matrix M, as a
+polynomial, by Hessenberg reduction if the elements are in a field, else by the
+division-free Berkowitz method"""
+    try :
+      return self.__cache['charpoly'];
+    except KeyError :
+      pass;
+    n = self.__dims[0];
+    if len(self.__dims) != 2 or n != self.__dims[1] :
+      raise AttributeError('requires square matrix');
+    from . poly import polynomial
+    v = self.__v;
+    t = _ratscale(v);
+    if t :    # charpoly(d*M)(d*x) = d**n*charpoly(M)(x)
+      d,w = t;
+      c = _berkowitz(n,w);
+      if d != 1 :
+        from . rational import rational
+        c = [rational(x,d**i) for i,x in enumerate(c)];
+    else :
+      c = _hesscharpoly(_hessenberg(n,v)) if _isfield(v) else _berkowitz(n,v);
+    z = v[0]*0;
+    p = self.__cache['charpoly'] = polynomial(*(x+z for x in c));
+    return p;
+
+  def minpoly(self) :
+    """Return the minimal polynomial of the square matrix, as a polynomial; the
+elements must be in a field, or be ints, giving a polynomial with int coefficients;
+elements of ints and rationals are scaled to ints"""
+    try :
+      return self.__cache['minpoly'];
+    except KeyError :
+      pass;
+    n = self.__dims[0];
+    if len(self.__dims) != 2 or n != self.__dims[1] :
+      raise AttributeError('requires square matrix');
+    from . poly import polynomial
+    v = self.__v;
+    t = _ratscale(v);
+    if t :    # minpoly(d*M)(d*x) = d**deg*minpoly(M)(x)
+      from . rational import rational
+      d,w = t;
+      c = [x/d**i for i,x in enumerate(_minpoly(n,list(map(rational,w))))];
+      if set(map(type,v)) <= _ints : c = list(map(int,c));
+    elif _isfield(v) :
+      c = _minpoly(n,v);
+    else :
+      raise TypeError('requires elements in a field, or ints');
+    z = v[0]*0;
+    p = self.__cache['minpoly'] = polynomial(*(x+z for x in c));
+    return p;
+
+  @property
+  def rref(self) :
+    """the reduced row echelon form"""
+    n,m = self.__dims if len(self.__dims) == 2 else (0,0);
+    piv = self._factor()[3];
+    U = self.lu[2];
+    a = [U.__v[i::n] for i in xrange(len(piv))];
+    for j,c in enumerate(piv) :
+      x = a[j];
+      y = 1/x[c];
+      a[j] = x = x[:c]+[y*z for z in x[c:]];
+      for i in xrange(j) :
+        f = a[i][c];
+        if f : a[i] = a[i][:c]+[u-f*w for u,w in zip(a[i][c:],x[c:])];
+    z = self.__v[0]*0;
+    return type(self)(n,m,[a[i][j] if i < len(a) else z for j in xrange(m) for i in xrange(n)]);
+
+  @property
+  def nullspace(self) :
+    """a list of vectors forming a basis for the null space"""
+    m = self.__dims[1] if len(self.__dims) == 2 else 0;
+    piv = self._factor()[3];
+    R = self.rref;
+    n = R.__dims[0];
+    z = self.__v[0]*0;
+    o = z+1;
+    basis = [];
+    for j in sorted(set(xrange(m))-set(piv)) :
+      v = [z]*m;
+      v[j] = o;
+      for i,c in enumerate(piv) :
+        v[c] = -R.__v[i+n*j];
+      basis.append(type(self)(m,v));
+    return basis;
 
   def reshape(self,*dims) :
     """Return a new array with the same elements but different dimensions,
@@ -891,50 +1960,68 @@ the product of the new dimensions must equal the product of the old dimensions""
       dims[x] = q;
     return type(self)(dims,self.__v);
 
+  def _reduce(self,f,d) :
+    """Return the reduction f of the array elements along the dimensions d,
+as an array of the remaining dimensions, or a scalar if there are none"""
+    g = _reducers[f];
+    if not d : return g(self.__v);
+    d = _axes(self.__dims,d);
+    if len(d) == len(self.__dims) : return g(self.__v);
+    w = np and len(self.__v) >= numpylimit**2 and \
+        _npreduce(f,self.__v,self.__dims,d);
+    dims,v = _axisgroups(self.__v,self.__dims,d);
+    return type(self)(dims,w or list(map(g,v)));
+
   def sum(self,*d) :
-    """Return the sum of the array elements"""
-    if d : raise NotImplementedError;
-    return sum(self.__v);
+    """Return the sum of the array elements, or, given dimension indices d,
+the array of sums along those dimensions"""
+    return self._reduce('sum',d);
 
   def product(self,*d) :
-    """Return the product of the array elements"""
-    if d : raise NotImplementedError;
-    return product(self.__v);
+    """Return the product of the array elements, or, given dimension indices d,
+the array of products along those dimensions"""
+    return self._reduce('product',d);
 
   def max(self,*d) :
-    """Return the max of the array elements"""
-    if d : raise NotImplementedError;
-    return max(self.__v);
+    """Return the max of the array elements, or, given dimension indices d,
+the array of maxes along those dimensions"""
+    return self._reduce('max',d);
 
   def min(self,*d) :
-    """Return the min of the array elements"""
-    if d : raise NotImplementedError;
-    return min(self.__v);
+    """Return the min of the array elements, or, given dimension indices d,
+the array of mins along those dimensions"""
+    return self._reduce('min',d);
 
   def median(self,*d) :
-    """Return the median of the array elements"""
-    if d : raise NotImplementedError;
-    s = sorted(self.__v);
-    z = len(s);
-    if not z : raise ZeroDivisionError;
-    return s[z//2] if z&1 else (s[z//2-1]+s[z//2])/2;
+    """Return the median of the array elements, or, given dimension indices d,
+the array of medians along those dimensions"""
+    return self._reduce('median',d);
 
   def mean(self,*d) :
-    """Return the mean of the array elements"""
-    if d : raise NotImplementedError;
-    return sum(self.__v) / len(self.__v);
+    """Return the mean of the array elements, or, given dimension indices d,
+the array of means along those dimensions"""
+    return self._reduce('mean',d);
 
   def map(self,map,*d) :
-    """Apply map to each element of the array"""
+    """Apply map to each element of the array, or, given dimension indices d,
+to each subarray along those dimensions, replacing the subarray with the result,
+which must be an array or list with the same number of elements"""
+    self.__cache.clear();
     # with no additional args, apply map to each element
     if not d :
       for i in xrange(len(self.__v)) :
         self.__v[i] = map(self.__v[i]);
       return;
-   # with one additional nonnegative integer arg, apply map to each vector
-    #  along dimension d[0], and replace that vector with the result
-    # with two ania, apply map to each 2D matrix along d[0] and d[1], ...
-    raise NotImplementedError;
+    d = _axes(self.__dims,d);
+    dims = [self.__dims[i] for i in d];
+    v = self.__v;
+    for x in _axisgroups(list(xrange(len(v))),self.__dims,d)[1] :
+      y = map(type(self)(dims,[v[i] for i in x]));
+      y = y.__v if isinstance(y,matrix) else y;
+      if len(y) != len(x) :
+        raise ParameterError('map must preserve the number of elements');
+      for i,z in zip(x,y) :
+        v[i] = z;
 
   mapply = map    # for backward compatiblity
 
@@ -969,6 +2056,410 @@ the product of the new dimensions must equal the product of the old dimensions""
         M[r,r:] = row[:n-r];
     return M;
 
+class matrixview(object) :
+
+  """strided view of a matrix"""
+
+  def __init__(self,v,cache,o,dims,s) :
+    """Create a view of the elements of column-major list v at offset o with dims
+and strides s; cache is cleared when an element is set;
+use matrix.view rather than calling this directly"""
+    self.__v = v;
+    self.__cache = cache;
+    self.__o = o;
+    self.__dims = list(dims);
+    self.__s = list(s);
+
+  def __repr__(self) :
+    return 'matrixview('+repr(self.__dims)+','+repr(list(self))+')';
+
+  def __str__(self) :
+    return str(self.copy());
+
+  def __len__(self) :
+    """Return the number of elements in the view"""
+    return product(self.__dims);
+
+  def __iter__(self) :
+    """Iterate over the elements in column-major order"""
+    v = self.__v;
+    return (v[i] for i in _indices(self.__o,self.__dims,self.__s));
+
+  def __eq__(self,other) :
+    """Return True iff other is a matrix or matrixview with the same dims and elements"""
+    return isinstance(other,(matrix,matrixview)) and \
+      tuple(self.__dims) == other.dims and list(self) == list(other);
+
+  def __ne__(self,other) :
+    return not self == other;
+
+  def _position(self,j) :
+    """Return the position in the shared list of the jth element of the view"""
+    if not -len(self) <= j < len(self) : raise IndexError('index out of range');
+    j %= len(self);
+    o = self.__o;
+    for n,x in zip(self.__dims,self.__s) :
+      j,r = divmod(j,n);
+      o += r*x;
+    return o;
+
+  def __getitem__(self,key) :
+    """Return an element, or a view of a subarray, given an int or slice for each
+dimension; an int alone gives an element in column-major order"""
+    if isint(key) :
+      return self.__v[self._position(key)];
+    if not isinstance(key,tuple) : key = (key,);
+    o,dims,s = _subscript(key,self.__dims,self.__s,self.__o);
+    if not dims :
+      return self.__v[o];
+    return matrixview(self.__v,self.__cache,o,dims,s);
+
+  def __setitem__(self,key,value) :
+    """Set an element, or the elements of a subarray, of the viewed matrix, given an
+int or slice for each dimension; value is a scalar, or has as many elements as the
+subarray, in column-major order"""
+    self.__cache.clear();
+    if isint(key) :
+      self.__v[self._position(key)] = value;
+      return;
+    if not isinstance(key,tuple) : key = (key,);
+    o,dims,s = _subscript(key,self.__dims,self.__s,self.__o);
+    if not dims :
+      self.__v[o] = value;
+      return;
+    ix = _indices(o,dims,s);
+    if isreal(value) :
+      for i in ix :
+        self.__v[i] = value;
+      return;
+    value = list(value);
+    if len(ix) != len(value) :
+      raise TypeError('value must have same length as slice');
+    for i,x in zip(ix,value) :
+      self.__v[i] = x;
+
+  @property
+  def dims(self) :
+    """tuple of dimensions"""
+    return tuple(self.__dims);
+
+  @property
+  def T(self) :
+    """transposed view"""
+    if len(self.__dims) > 2 :
+      raise AttributeError('transpose not defined for >2D matrices');
+    return matrixview(self.__v,self.__cache,self.__o,self.__dims[::-1],self.__s[::-1]);
+
+  @property
+  def transpose(self) :
+    """transposed view"""
+    return self.T;
+
+  @property
+  def squeeze(self) :
+    """view with length 1 dimensions elided"""
+    d = [(n,x) for n,x in zip(self.__dims,self.__s) if n != 1] or [(1,1)];
+    return matrixview(self.__v,self.__cache,self.__o,[n for n,x in d],[x for n,x in d]);
+
+  def copy(self) :
+    """Return a matrix with the elements of the view"""
+    return matrix(self.__dims,list(self));
+
+  def __neg__(self) :
+    return -self.copy();
+
+  def __add__(self,other) :
+    return self.copy()+other;
+
+  def __radd__(self,other) :
+    return other+self.copy();
+
+  def __sub__(self,other) :
+    return self.copy()-other;
+
+  def __rsub__(self,other) :
+    return other-self.copy();
+
+  def __mul__(self,other) :
+    return self.copy()*other;
+
+  def __rmul__(self,other) :
+    return other*self.copy();
+
+  def __truediv__(self,other) :
+    return self.copy()/other;
+
+  __div__ = __truediv__;
+
+################################################################
+# sparse matrices
+
+class smatrix(object) :
+
+  """sparse 2D matrix"""
+
+  def __init__(self,*dims) :
+    """Create a sparse 2D matrix, storing only its nonzero elements
+smatrix(smatrix_arg) makes a copy of smatrix_arg
+smatrix(matrix_arg) makes a sparse copy of 2D matrix_arg
+smatrix(rows,cols) makes a rows x cols smatrix of all 0s
+smatrix(rows,cols,{(row,col):element,...}) makes a rows x cols smatrix with the
+specified elements, zero elements being ignored
+Elements are not checked for type, as for matrix"""
+    if not dims : raise ParameterError('requires some arguments');
+    if isinstance(dims[0],smatrix) :
+      if len(dims) != 1 : raise ParameterError('smatrix arg must be only one');
+      self.__dims = list(dims[0].__dims);
+      self.__r = [dict(x) for x in dims[0].__r];
+      return;
+    if isinstance(dims[0],matrix) :
+      if len(dims) != 1 : raise ParameterError('matrix arg must be only one');
+      if len(dims[0].dims) != 2 : raise ParameterError('matrix must be 2D');
+      n,m = self.__dims = list(dims[0].dims);
+      v = list(dims[0]);
+      self.__r = [dict((j,v[i+n*j]) for j in xrange(m) if v[i+n*j])
+                  for i in xrange(n)];
+      return;
+    if len(dims) == 3 :
+      d = dims[2];
+      dims = dims[:2];
+    else :
+      d = {};
+    if len(dims) != 2 : raise ParameterError('smatrix must be 2D');
+    for n in dims :
+      if not isint(n) or n <= 0 :
+        raise TypeError('dimensions must be positive integers');
+    self.__dims = list(dims);
+    self.__r = [{} for i in xrange(dims[0])];
+    for (i,j),x in d.items() :
+      if not (0 <= i < dims[0] and 0 <= j < dims[1]) :
+        raise IndexError('index out of range');
+      if x : self.__r[i][j] = x;
+
+  def __repr__(self) :
+    return 'smatrix(%d,%d,%r)'%(self.__dims[0],self.__dims[1],self.dok);
+
+  def __str__(self) :
+    """Return a string showing the matrix as a matrix"""
+    return str(matrix(self));
+
+  def __len__(self) :
+    return self.__dims[0]*self.__dims[1];
+
+  def __bool__(self) :
+    return any(self.__r);
+
+  __nonzero__ = __bool__;
+
+  def __eq__(self,other) :
+    """Return True iff other is an smatrix with the same dimensions and elements"""
+    return isinstance(other,smatrix) and self.__dims == other.__dims and \
+      self.__r == other.__r;
+
+  def __ne__(self,other) :
+    return not self == other;
+
+  def __getitem__(self,key) :
+    """Return the element at key = (row,column)"""
+    r,c = key;
+    if not -self.__dims[1] <= c < self.__dims[1] : raise IndexError('index out of range');
+    return self.__r[r].get(c%self.__dims[1],0);
+
+  def __setitem__(self,key,value) :
+    """Set the element at key = (row,column)"""
+    r,c = key;
+    if not -self.__dims[1] <= c < self.__dims[1] : raise IndexError('index out of range');
+    c %= self.__dims[1];
+    if value :
+      self.__r[r][c] = value;
+    else :
+      self.__r[r].pop(c,None);
+
+  @property
+  def dims(self) :
+    """tuple of dimensions"""
+    return tuple(self.__dims);
+
+  @property
+  def nnz(self) :
+    """number of nonzero elements"""
+    return sum(len(x) for x in self.__r);
+
+  @property
+  def dok(self) :
+    """dict of the nonzero elements, keyed by (row,column)"""
+    return dict(((i,j),a) for i,x in enumerate(self.__r) for j,a in x.items());
+
+  @property
+  def csr(self) :
+    """compressed sparse row form (indptr,indices,data): the nonzero elements of
+row i are data[indptr[i]:indptr[i+1]], in the columns indices[indptr[i]:indptr[i+1]]"""
+    indptr = [0];
+    indices = [];
+    for x in self.__r :
+      indices.extend(sorted(x));
+      indptr.append(len(indices));
+    data = [self.__r[i][indices[k]] for i in xrange(self.__dims[0])
+            for k in xrange(indptr[i],indptr[i+1])];
+    return indptr,indices,data;
+
+  @staticmethod
+  def fromcsr(m,indptr,indices,data) :
+    """Return an smatrix with m columns given its compressed sparse row form"""
+    s = smatrix(len(indptr)-1,m);
+    for i,x in enumerate(s.__r) :
+      for k in xrange(indptr[i],indptr[i+1]) :
+        if not 0 <= indices[k] < m : raise IndexError('index out of range');
+        if data[k] : x[indices[k]] = data[k];
+    return s;
+
+  @property
+  def T(self) :
+    """transpose"""
+    s = smatrix(self.__dims[1],self.__dims[0]);
+    for i,x in enumerate(self.__r) :
+      for j,a in x.items() :
+        s.__r[j][i] = a;
+    return s;
+
+  @property
+  def transpose(self) :
+    """transpose"""
+    return self.T;
+
+  @property
+  def H(self) :
+    """conjugate transpose"""
+    s = self.T;
+    for x in s.__r :
+      for j in x :
+        x[j] = x[j].conjugate();
+    return s;
+
+  @property
+  def conjugate_transpose(self) :
+    """conjugate transpose"""
+    return self.H;
+
+  def __neg__(self) :
+    """Return the additive inverse of the matrix"""
+    s = smatrix(self);
+    for x in s.__r :
+      for j in x :
+        x[j] = -x[j];
+    return s;
+
+  def __iadd__(self,other) :
+    """Add an smatrix elementwise to this smatrix"""
+    if not isinstance(other,smatrix) :
+      raise TypeError('can only add smatrices in place');
+    if other.__dims != self.__dims :
+      raise ParameterError('matrices must have same dimensions');
+    for x,y in zip(self.__r,other.__r) :
+      for j,a in y.items() :
+        a = x[j]+a if j in x else a;
+        if a :
+          x[j] = a;
+        else :
+          x.pop(j,None);
+    return self;
+
+  def __add__(self,other) :
+    """Return the elementwise sum of self and other, an smatrix or a matrix;
+the sum is an smatrix only if other is"""
+    if isinstance(other,matrix) :
+      return matrix(self).__iadd__(other);
+    return smatrix(self).__iadd__(other);
+
+  __radd__ = __add__;
+
+  def __isub__(self,other) :
+    """Subtract an smatrix elementwise from this smatrix"""
+    if not isinstance(other,smatrix) :
+      raise TypeError('can only subtract smatrices in place');
+    return self.__iadd__(-other);
+
+  def __sub__(self,other) :
+    """Return the elementwise difference of self and other, an smatrix or a matrix"""
+    return self.__add__(-other);
+
+  def __rsub__(self,other) :
+    """Return -self+other"""
+    return self.__neg__().__add__(other);
+
+  def __mul__(self,other) :
+    """Return the product of self and other, an smatrix, a 2D matrix with as many
+rows as self has columns, a vector, or a scalar; products with matrices or vectors
+are matrices; the time taken is proportional to the number of products of nonzeros"""
+    n,m = self.__dims;
+    if isinstance(other,smatrix) :
+      if m != other.__dims[0] : raise ParameterError('inner dimensions must agree');
+      s = smatrix(n,other.__dims[1]);
+      for x,z in zip(self.__r,s.__r) :
+        for k,a in x.items() :
+          for j,b in other.__r[k].items() :
+            z[j] = z[j]+a*b if j in z else a*b;
+        for j in [j for j,c in z.items() if not c] :
+          del z[j];
+      return s;
+    if islistlike(other) :
+      other = matrix(len(other),other);
+    if isinstance(other,matrix) :
+      if other.dims[0] != m : raise ParameterError('inner dimensions must agree');
+      if len(other.dims) > 2 : raise TypeError('only matrices can be multiplied');
+      v = list(other);
+      p = 1 if len(other.dims) == 1 else other.dims[1];
+      w = [0]*(n*p);
+      for i,x in enumerate(self.__r) :
+        for l in xrange(p) :
+          s = 0;
+          for k,a in x.items() :
+            s += a*v[k+m*l];
+          w[i+n*l] = s;
+      return matrix(n,w) if p == 1 and len(other.dims) == 1 else matrix(n,p,w);
+    s = smatrix(n,m);
+    for x,z in zip(self.__r,s.__r) :
+      for j,a in x.items() :
+        a *= other;
+        if a : z[j] = a;
+    return s;
+
+  def __rmul__(self,other) :
+    """Return the product of other, a matrix, vector, or scalar, and self"""
+    n,m = self.__dims;
+    if islistlike(other) :
+      other = matrix(len(other),other);
+    if isinstance(other,matrix) :
+      if len(other.dims) == 1 :
+        if other.dims[0] != n : raise ParameterError('inner dimensions must agree');
+        v = list(other);
+        w = [0]*m;
+        for i,x in enumerate(self.__r) :
+          for j,a in x.items() :
+            w[j] += v[i]*a;
+        return matrix(m,w);
+      if len(other.dims) != 2 : raise TypeError('only matrices can be multiplied');
+      p = other.dims[0];
+      if other.dims[1] != n : raise ParameterError('inner dimensions must agree');
+      v = list(other);
+      w = [0]*(p*m);
+      for i,x in enumerate(self.__r) :
+        for j,a in x.items() :
+          for l in xrange(p) :
+            w[l+p*j] += v[l+p*i]*a;
+      return matrix(p,m,w);
+    s = smatrix(n,m);
+    for x,z in zip(self.__r,s.__r) :
+      for j,a in x.items() :
+        a = other*a;
+        if a : z[j] = a;
+    return s;
+
+  @staticmethod
+  def Identity(n,m=1) :
+    """Return an nxn sparse identity matrix multiplied by the scalar m"""
+    return smatrix(n,n,dict(((i,i),m) for i in xrange(n)));
+
 ################################################################
 # boolean [binary] matrices
 
@@ -980,6 +2471,123 @@ def parity(iterable,start=0) :
     start ^= i;
   return start;
 
+def _bsplit(v,n,k) :
+  """Return the list of the k consecutive n-bit fields of v, least significant first"""
+  if k <= 16 :
+    m = (1<<n)-1;
+    return [(v>>n*i)&m for i in xrange(k)];
+  h = k//2;
+  return _bsplit(v&((1<<n*h)-1),n,h)+_bsplit(v>>n*h,n,k-h);
+
+def _bjoin(a,n) :
+  """Return the int whose consecutive n-bit fields are the elements of a"""
+  if len(a) <= 16 :
+    v = 0;
+    for x in reversed(a) :
+      v = (v<<n)|x;
+    return v;
+  h = len(a)//2;
+  return _bjoin(a[:h],n)|(_bjoin(a[h:],n)<<n*h);
+
+def _graytable(a,b,t) :
+  """Return a list of 1<<t ints, with the xor of those elements of a selected by
+the nonzero bits of index sum(1<<b[i] for i in selected) in that entry, computed
+with one xor per entry by visiting the selections in Gray code order"""
+  w = [0]*(1<<t);
+  g = x = 0;
+  for i in xrange(1,1<<len(a)) :
+    j = bit_length(i&-i)-1;    # the bit that changes
+    g ^= 1<<b[j];
+    x ^= a[j];
+    w[g] = x;
+  return w;
+
+def _m4rm(a,b,n) :
+  """Return the columns of A*B, given the columns of A and of n-row B as lists of ints,
+using the method of four Russians"""
+  t = max(1,min(m4rmbits,bit_length(len(b))-1));
+  m = (1<<t)-1;
+  c = [0]*len(b);
+  for k in xrange(0,n,t) :
+    s = a[k:k+t];
+    w = _graytable(s,xrange(len(s)),len(s));
+    c = [x^w[(y>>k)&m] for x,y in zip(c,b)];
+  return c;
+
+def _m4ri(a,n,full=False) :
+  """Column reduce a, a list of ints representing the columns of an n-row matrix,
+in place, using the method of four Russians, so that pivot columns come first,
+in order of their pivot rows, and only the pivot column has a 1 in each pivot row
+at or after the pivot column (or anywhere, if full); return the list of pivot rows"""
+  m = len(a);
+  piv = [];
+  r = 0;    # first row of strip
+  while r < n and len(piv) < m :
+    k = len(piv);
+    t = min(m4rmbits,n-r);
+    mask = (1<<t)-1;
+    z = [(x>>r)&mask for x in a[k:]];    # strip of each unreduced column
+    y = z[:];    # strips, reduced by pivots as they are found
+    p = [];    # pivot rows, relative to r
+    for i in xrange(t) :
+      b = 1<<i;
+      q = len(p);
+      for j in xrange(q,len(y)) :    # find pivot column
+        if y[j]&b : break;
+      else :
+        continue;
+      if j != q :
+        y[j],y[q] = y[q],y[j];
+        z[j],z[q] = z[q],z[j];
+        a[k+j],a[k+q] = a[k+q],a[k+j];
+      x = y[q];
+      y[q+1:] = [u^x if u&b else u for u in y[q+1:]];
+      p.append(i);
+    if not p :
+      r += t;
+      continue;
+    q = len(p);
+    for j in xrange(q) :    # reduce pivot columns among themselves
+      b = 1<<p[j];
+      for i in xrange(q) :
+        if i != j and z[i]&b :
+          z[i] ^= z[j];
+          a[k+i] ^= a[k+j];
+    w = _graytable(a[k:k+q],p,t);
+    b = sum(1<<i for i in p);    # pivot rows of strip
+    for j in xrange(q,len(z)) :
+      i = z[j]&b;
+      if i : a[k+j] ^= w[i];
+    if full :
+      for j in xrange(k) :
+        i = (a[j]>>r)&b;
+        if i : a[j] ^= w[i];
+    piv.extend(r+i for i in p);
+    r += t;
+  return piv;
+
+def _brepeat(x,w,k) :
+  """Return the int consisting of k copies of the w-bit field x"""
+  j = 1;
+  while j < k :
+    i = min(j,k-j);
+    x |= (x&((1<<w*i)-1))<<w*j;
+    j += i;
+  return x;
+
+def _btblocks(v,s,k) :
+  """Transpose each of the k consecutive sxs column-major blocks of v, s a power of 2,
+by swapping off-diagonal subblocks of size s/2, s/4, ..., 1 with masked xors"""
+  h = s>>1;
+  while h :
+    m = _brepeat(((1<<h)-1)<<h,2*h,s//(2*h));    # rows with h bit set
+    m = _brepeat(_brepeat(m,s,h),2*h*s,k*s//(2*h));    # in columns with h bit clear
+    d = h*(s-1);    # distance to the mirror image
+    x = ((v>>d)^v)&m;
+    v ^= x^(x<<d);
+    h >>= 1;
+  return v;
+
 _v = '_bmatrix__v'
 
 class bmatrix(object) :
@@ -991,6 +2599,7 @@ class bmatrix(object) :
 bmatrix(bmatrix_arg) makes a copy of bmatrix_arg
 bmatrix(matrix_arg) make a bmatrix of same dimensions,
 replacing each element with whether or not it evaluates true, i.e. 1 if x else 0
+bmatrix(sbmatrix_arg) makes a dense copy of sbmatrix_arg
 bmatrix(d1,d2,...,dk) or
 bmatrix(d1,d2,...,dk,[one or prod(di) elements, column by column, ...])
 makes a bmatrix with dimension d1 x d2 x ... x dk having elements all 0 or
@@ -1012,6 +2621,12 @@ bmatrix([d1,d2,...dk],one or prod(di) args to be elements) also legal"""
       for x in reversed(dims[0]) : v = (v<<1)|(1 if x else 0);
       self.__dict__[_v] = v;
       return;
+    if isinstance(dims[0],sbmatrix) :
+      if len(dims) != 1 : raise ParameterError('sbmatrix arg must be only one');
+      self.__dims[:] = dims[0].dims;
+      self.__dict__[_v] = self.fromrows([sum(1<<c for c in x) for x in dims[0].rows],
+                                        self.__dims[1])._bits;
+      return;
     if islistlike(dims[0]) :
       w = dims[1] if len(dims) == 2 and islistlike(dims[1]) \
           else dims[1:] if dims[1:] else (0,);
@@ -1059,11 +2674,8 @@ with successive lines varying the remaining dimensions, earlier faster"""
       for i in xrange(n) :
         if n > 1 : s.append(str(tuple(q)) + ' :');
         v = (self.__v >> i*rc)&m;
-        for r in xrange(nr) :
-          b = 0;
-          for c in xrange(nc) :
-            b = 2*b|(v>>(nr*c+r))&1;
-          s.append('['+format(b,f)+']');
+        for b in _bsplit(self.bT(nr,nc,v),nc,nr) :    # rows
+          s.append('['+format(b,f)[::-1]+']');
         for j in xrange(len(q)) :
           q[j] = (q[j]+1) % d[j];
           if q[j] : break;
@@ -1135,6 +2747,18 @@ treat the array as a list of its elements in storage order"""
       for i in reversed(xrange(len(key))) :
         s = s*self.__dims[i] + key[i][0];
       return (self.__v>>s)&1;
+    if len(key) == 2 :    # select packed columns, then rows
+      r0,r1,rs = key[0] if len(key[0]) > 1 else (key[0][0],key[0][0]+1,1);
+      c0,c1,cs = key[1] if len(key[1]) > 1 else (key[1][0],key[1][0]+1,1);
+      a = self.columns;
+      a = [a[c] for c in xrange(c0,c1,cs)];
+      if rs == 1 :
+        m = (1<<r1-r0)-1;
+        v = _bjoin([(x>>r0)&m for x in a],r1-r0);
+      else :
+        a = self.fromcolumns(a,self.__dims[0]).rows;
+        v = self.fromrows([a[r] for r in xrange(r0,r1,rs)],dims[1])._bits;
+      return type(self)([d for d,k in zip(dims,key) if len(k) > 1],v);
     # must return a submatrix...
     v = 0;
     x = [0]*len(dims);
@@ -1224,19 +2848,39 @@ when setting a slice, value must have length matching size of slice"""
         raise TypeError('value must have same length as slice');
     elif pdims != len(value) :
       raise TypeError('value must have same length as slice');
-    x = [0]*len(dims);
-    for j in xrange(pdims) :
-      s = 0;
-      for i in reversed(xrange(len(key))) :
-        if len(key[i]) == 1 :
-          s = s*self.__dims[i] + key[i][0];
-        else :
-          s = s*self.__dims[i] + tuple(xrange(*key[i]))[x[i]];
-      self[s] = (value>>j)&1 if isint(value) else value[j];
-      for i in xrange(len(dims)) :
-        x[i] = (x[i]+1)%dims[i];
-        if x[i] : break;
-      else : break;
+    if len(key) == 2 and (isint(value) or isinstance(value,bmatrix)) :
+      # update packed columns
+      r0,r1,rs = key[0] if len(key[0]) > 1 else (key[0][0],key[0][0]+1,1);
+      c0,c1,cs = key[1] if len(key[1]) > 1 else (key[1][0],key[1][0]+1,1);
+      w = value&((1<<pdims)-1) if isint(value) else value.__v;
+      a = self.columns;
+      b = _bsplit(w,dims[0],dims[1]);
+      if rs == 1 :
+        m = ((1<<dims[0])-1)<<r0;
+        for c,x in zip(xrange(c0,c1,cs),b) :
+          a[c] = a[c]&~m|x<<r0;
+      else :
+        for c,x in zip(xrange(c0,c1,cs),b) :
+          y = a[c];
+          for r in xrange(r0,r1,rs) :
+            y = y|1<<r if x&1 else y&~(1<<r);
+            x >>= 1;
+          a[c] = y;
+      self.__dict__[_v] = _bjoin(a,self.__dims[0]);
+    else :
+      x = [0]*len(dims);
+      for j in xrange(pdims) :
+        s = 0;
+        for i in reversed(xrange(len(key))) :
+          if len(key[i]) == 1 :
+            s = s*self.__dims[i] + key[i][0];
+          else :
+            s = s*self.__dims[i] + tuple(xrange(*key[i]))[x[i]];
+        self[s] = (value>>j)&1 if isint(value) else value[j];
+        for i in xrange(len(dims)) :
+          x[i] = (x[i]+1)%dims[i];
+          if x[i] : break;
+        else : break;
     for i in reversed(xrange(len(dims))) :
       if len(key[i]) == 1 : del dims[i];
     if isinstance(value,bmatrix) and dims != value.__dims :
@@ -1368,24 +3012,7 @@ when setting a slice, value must have length matching size of slice"""
     n = self.__dims[0];
     if len(self.__dims) != 2 or n != self.__dims[1] :
       raise TypeError('requires square bmatrix') ;
-    v = self.__v;
-    m = (1<<n)-1;    # mask of column
-    for r in xrange(n) :
-      rv = 0;
-      b = 1<<r;    # row bit
-      for c in xrange(r,n) :    # find pivot column
-        cv = (v>>n*c)&m;
-        if b&cv :
-          if rv :
-            v ^= rv<<n*c;
-          else :
-            if r != c : 
-              # exchange this column with column r
-              x = cv ^ (v>>n*r)&m;
-              v ^= (x << n*r) ^ (x << n*c);
-            rv = cv;
-      if not rv : return 0;
-    return 1;
+    return 0+(len(_m4ri(self.columns,n)) == n);
 
   @property
   def determinant(self) :
@@ -1407,25 +3034,7 @@ when setting a slice, value must have length matching size of slice"""
         return 1-(not self.__v);
       raise TypeError('requires bmatrix') ;
     nc = self.__dims[1];   # number of columns
-    v = self.__v;
-    m = (1<<n)-1;    # mask of column
-    rank = 0;
-    for r in xrange(n) :
-      rv = 0;
-      b = 1<<r;    # row bit
-      for c in xrange(rank,nc) :    # find pivot column
-        cv = (v>>n*c)&m;
-        if b&cv :
-          if rv :
-            v ^= rv<<n*c;
-          else :
-            if rank != c : 
-              # exchange this column with column rank
-              x = cv ^ (v>>n*rank)&m;
-              v ^= (x << n*rank) ^ (x << n*c);
-            rv = cv;
-      if rv : rank += 1;
-    return rank;
+    return len(_m4ri(self.columns,n));
 
   @property
   def inverse(self) :
@@ -1438,42 +3047,29 @@ when setting a slice, value must have length matching size of slice"""
     n = self.__dims[0];
     if len(self.__dims) != 2 or n != self.__dims[1] :
       raise AttributeError('requires square bmatrix') ;
-    w = 1;    # make identity
-    for i in xrange(n-1) :
-      w = (w<<(n+1))|1;
-    v = self.__v;
-    m = (1<<n)-1;    # mask of column
-    for r in xrange(n) :    # for each row
-      rv = 0;
-      b = 1<<r;    # row bit
-      for c in xrange(r,n) :    # find pivot column
-        cv = (v>>n*c)&m;
-        if b&cv :
-          if rv :
-            v ^= rv<<n*c;
-            w ^= rw<<n*c;
-          else :
-            if r != c : 
-              # exchange this column with column r
-              x = cv ^ (v>>n*r)&m;
-              v ^= (x << n*r) ^ (x << n*c);
-              x = ((w>>n*c) ^ (w>>n*r)) & m;
-              w ^= (x << n*r) ^ (x << n*c);
-            rv = cv;
-            rw = (w>>n*r)&m;
-      if not rv : raise ZeroDivisionError('bmatrix not invertible');
-    for r in reversed(xrange(1,n)) :
-      rw = (w>>n*r)&m;
-      for c in xrange(r) :
-        if (v>>(n*c+r))&1 :
-          w ^= rw<<n*c;
-    return type(self)((n,n),w);
+    # column reduce [A;I] to [I;A**-1]
+    a = [x|1<<(n+c) for c,x in enumerate(self.columns)];
+    if len(_m4ri(a,n,True)) < n : raise ZeroDivisionError('bmatrix not invertible');
+    return type(self)((n,n),_bjoin([x>>n for x in a],n));
 
   @property
   def _bits(self) :
     """bmatrix as a binary number with lsb being first entry"""
     return self.__v;
 
+  @property
+  def columns(self) :
+    """list of the columns of the 2D bmatrix, each as an int with lsb being first row"""
+    if len(self.__dims) != 2 : raise AttributeError('requires 2D bmatrix');
+    return _bsplit(self.__v,*self.__dims);
+
+  @property
+  def rows(self) :
+    """list of the rows of the 2D bmatrix, each as an int with lsb being first column"""
+    if len(self.__dims) != 2 : raise AttributeError('requires 2D bmatrix');
+    n,m = self.__dims;
+    return _bsplit(self.bT(n,m,self.__v),m,n);
+
   def reshape(self,*dims) :
     """Return a new array with the same elements but different dimensions,
 one dimension may be left unspecified (0 or None) and will be filled in,
@@ -1680,10 +3276,9 @@ any * scalar :  scalar multiply
           if n != r :
             raise ParameterError('inner dimensions must agree');
           v = self.__v;
-          w = other.__v;
           x = 0;
-          for k in reversed(xrange(c)) :
-            x = (x<<1)|parity(v&(w>>k*n));
+          for w in reversed(_bsplit(other.__v,n,c)) :
+            x = (x<<1)|parity(v&w);
           self.__dims[:] = [c];
           self.__dict__[_v] = x;
         else : raise TypeError('only matrices can be multiplied');
@@ -1692,21 +3287,18 @@ any * scalar :  scalar multiply
         if len(other.__dims) <= 2 :        # 2D x 1D or 2D x 2D
           if js != other.__dims[0] :
             raise ParameterError('inner dimensions must agree');
-          t = self.bT(rows,js,self.__v);
-          v = other.__v;
           self.__dims[1] = cols = 1 if len(other.__dims) < 2 else other.__dims[1];
-          w = 0;
-          m = (1<<js)-1;
-          for c in reversed(xrange(cols)) :      # col of result
-            x = (v>>js*c)&m;
-            for r in reversed(xrange(rows)) :    # row of result
-              w = (w<<1)|parity(x&(t>>js*r));
-          self.__dict__[_v] = w;
+          self.__dict__[_v] = _bjoin(_m4rm(_bsplit(self.__v,rows,js),
+                                           _bsplit(other.__v,js,cols),js),rows);
           if len(other.__dims) < 2 : del self.__dims[1];   # preserve vectorness
         else : raise TypeError('only matrices can be multiplied');
       else : raise TypeError('only matrices can be multiplied');
     elif islistlike(other) :
       return self.__imul__(matrix(len(other),other));
+    elif isinstance(other,sbmatrix) :
+      other = other.__rmul__(self);
+      self.__dims[:] = other.__dims;
+      self.__dict__[_v] = other.__v;
     elif not (other&1 if isint(other) else other) :    # matrix * scalar
       self.__dict__[_v] = 0;
     return self;
@@ -1801,12 +3393,404 @@ any * scalar :  scalar multiply
         M[r,r:] = row[:n-r];
     return M;
 
+  @staticmethod
+  def fromcolumns(a,n) :
+    """Return the n-row bmatrix whose columns are the ints in a, with lsb being first row"""
+    return bmatrix((n,len(a)),_bjoin(a,n));
+
+  @staticmethod
+  def fromrows(a,m) :
+    """Return the m-column bmatrix whose rows are the ints in a, with lsb being first column"""
+    return bmatrix((len(a),m),bmatrix.bT(m,len(a),_bjoin(a,m)));
+
   @staticmethod
   def bT(rows,cols,v) :
     """Assuming v represents a bmatrix with the specified number of rows and columns,
   columnwise and little-endian bit-by-bit, return the representation of the transpose"""
-    t = 0;
-    for r in reversed(xrange(rows)) :
-      for c in reversed(xrange(cols)) :
-        t = (t<<1)|(v>>(c*rows+r))&1;
-    return t;
+    if rows == 1 or cols == 1 : return v;
+    if rows*cols < btlimit :
+      t = 0;
+      for r in reversed(xrange(rows)) :
+        for c in reversed(xrange(cols)) :
+          t = (t<<1)|(v>>(c*rows+r))&1;
+      return t;
+    # pad to a row of k sxs blocks, transpose each block, and reassemble
+    if rows <= cols :
+      s = 1<<bit_length(rows-1);
+      k = (cols+s-1)//s;
+      a = _bsplit(_btblocks(_bjoin(_bsplit(v,rows,cols),s),s,k),s,k*s);
+      return _bjoin([_bjoin(a[r::s],s) for r in xrange(rows)],cols);
+    s = 1<<bit_length(cols-1);
+    k = (rows+s-1)//s;
+    a = _bsplit(_bjoin(_bsplit(v,rows,cols),k*s),s,k*cols);
+    a = [a[c*k+j] if c < cols else 0 for j in xrange(k) for c in xrange(s)];
+    return _bjoin(_bsplit(_btblocks(_bjoin(a,s),s,k),s,k*s)[:rows],cols);
+
+################################################################
+# sparse boolean [binary] matrices
+
+# block Lanczos works on blocks of 64 vectors of length n, each block stored as a
+# list (or, with numpy, a uint64 array) of n 64-bit rows; 64x64 matrices are lists
+# of 64 ints, row i having bit j set iff entry (i,j) is 1
+
+_I64 = [1<<i for i in xrange(64)];    # 64x64 identity
+
+def _sbindex(ix) :
+  """Return the row index lists ix in the form used by _sbgather"""
+  if not np : return ix;
+  p = np.cumsum([0]+[len(r) for r in ix]);
+  return (np.array([c for r in ix for c in r],dtype=np.intp),p,np.flatnonzero(p[1:]-p[:-1]));
+
+def _sbgather(ix,v) :
+  """Return the block whose ith row is the xor of the rows of block v listed in ix[i]"""
+  if np :
+    j,p,z = ix;
+    y = np.zeros(len(p)-1,dtype=np.uint64);
+    if len(j) : y[z] = np.bitwise_xor.reduceat(v[j],p[z]);
+    return y;
+  return [reduce(_xor,[v[c] for c in r],0) for r in ix];
+
+def _sbxor(*a) :
+  """Return the xor of blocks"""
+  if np : return reduce(_xor,a);
+  return [reduce(_xor,x) for x in zip(*a)];
+
+def _sbmask(v,m) :
+  """Return block v with all but the columns in mask m cleared"""
+  if np : return v&np.uint64(m);
+  return [x&m for x in v];
+
+def _sbrandom(n) :
+  """Return a random block of n rows"""
+  v = [getrandbits(64) for i in xrange(n)];
+  return np.array(v,dtype=np.uint64) if np else v;
+
+def _sbtw(v,w) :
+  """Return the 64x64 product v.T*w of blocks v and w"""
+  if np :
+    one = np.uint64(1);
+    return [int(np.bitwise_xor.reduce(w[(v>>np.uint64(i))&one != 0])) for i in xrange(64)];
+  b = [[0]*256 for k in xrange(8)];    # xor of rows of w by each byte of rows of v
+  for x,y in zip(v,w) :
+    k = 0;
+    while x :
+      b[k][x&255] ^= y;
+      x >>= 8;
+      k += 1;
+  t = [0]*64;
+  for k in xrange(8) :
+    for x in xrange(1,256) :
+      y = b[k][x];
+      if y :
+        for j in xrange(8) :
+          if x>>j&1 : t[8*k+j] ^= y;
+  return t;
+
+def _sbmul(v,d) :
+  """Return the product of block v and 64x64 matrix d"""
+  t = [];    # for each byte of rows of v, table of xors of rows of d
+  for k in xrange(0,64,8) :
+    w = [0]*256;
+    for x in xrange(1,256) :
+      w[x] = w[x&(x-1)]^d[k+bit_length(x&-x)-1];
+    t.append(w);
+  if np :
+    t = np.array(t,dtype=np.uint64);
+    m = np.uint64(255);
+    return reduce(_xor,(t[k][(v>>np.uint64(8*k))&m] for k in xrange(8)));
+  t0,t1,t2,t3,t4,t5,t6,t7 = t;
+  return [t0[x&255]^t1[x>>8&255]^t2[x>>16&255]^t3[x>>24&255]^
+          t4[x>>32&255]^t5[x>>40&255]^t6[x>>48&255]^t7[x>>56] for x in v];
+
+def _sbcolumns(v,n) :
+  """Return the 64 columns of the n-row block v as n-bit ints"""
+  if np : v = v.tolist();
+  return bmatrix.fromrows(v,64).columns;
+
+def _dmul(a,b) :
+  """Return the product of 64x64 matrices a and b"""
+  return [reduce(_xor,[y for j,y in enumerate(b) if x>>j&1],0) for x in a];
+
+def _nonsingular(t,last) :
+  """Return (w,s) for symmetric 64x64 matrix t: s lists the columns of a maximal
+nonsingular submatrix of t, choosing columns not in list last first, and w is the
+inverse of that submatrix, zero elsewhere; s is empty if there is none"""
+  m = [[x,1<<i] for i,x in enumerate(t)];    # [t | I]
+  s = [i for i in xrange(64) if i not in last]+last[::-1];
+  c = [];
+  for i in xrange(64) :
+    b = 1<<s[i];
+    for h in (0,1) :    # pivot in t part, else in I part
+      for j in xrange(i,64) :
+        if m[s[j]][h]&b : break;
+      else :
+        continue;
+      m[s[i]],m[s[j]] = m[s[j]],m[s[i]];
+      r = m[s[i]];
+      for x in m :
+        if x is not r and x[h]&b :
+          x[0] ^= r[0];
+          x[1] ^= r[1];
+      if h :
+        r[0] = r[1] = 0;
+      else :
+        c.append(s[i]);
+      break;
+    else :
+      return None,[];
+  return [x[1] for x in m],c;
+
+def _lanczos(ix,jx,n) :
+  """Return blocks (x,v) of n rows from block Lanczos on A = B.T*B, where
+B's rows are given by ix and its columns by jx in _sbindex form; if all went well,
+A*x is in the span of A*v, so dependencies among the columns of B*x and B*v
+give vectors in the null space of B"""
+  A = lambda v : _sbgather(jx,_sbgather(ix,v));
+  z = [0]*64;
+  x = _sbrandom(n);
+  v0 = A(x);
+  v = [v0,_sbmask(v0,0),_sbmask(v0,0)];    # v[0], and previous two
+  w = [None,z,z];    # winv
+  t = [None,z];    # v.T*A*v
+  t2 = [None,z];    # v.T*A*A*v
+  s1 = list(xrange(64));
+  m1 = (1<<64)-1;
+  for i in xrange(n//32+16) :
+    av = A(v[0]);
+    t[0] = _sbtw(v[0],av);
+    if not any(t[0]) : return x,v[0];
+    t2[0] = _sbtw(av,av);
+    w[0],s0 = _nonsingular(t[0],s1);
+    m0 = sum(1<<j for j in s0);
+    if not s0 or m0|m1 != (1<<64)-1 : break;    # usual only near the end
+    d = _dmul(w[0],[a&m0^b for a,b in zip(t2[0],t[0])]);
+    d = [a^b for a,b in zip(d,_I64)];
+    e = [a&m0 for a in _dmul(w[1],t[0])];
+    f = _dmul(w[2],[a^b for a,b in zip(_dmul(t[1],w[1]),_I64)]);
+    f = _dmul(f,[(a&m1^b)&m0 for a,b in zip(t2[1],t[1])]);
+    x = _sbxor(x,_sbmul(v[0],_dmul(w[0],_sbtw(v[0],v0))));
+    v[:] = _sbxor(_sbmask(av,m0),_sbmul(v[0],d),_sbmul(v[1],e),_sbmul(v[2],f)),v[0],v[1];
+    w[1:] = w[:2];
+    t[1] = t[0];
+    t2[1] = t2[0];
+    s1,m1 = s0,m0;
+  return x,v[0];
+
+def _sbnull(ix,jx,m,n,tries=4) :
+  """Return a list of independent n-bit ints in the null space of the m x n matrix B
+whose rows are given by ix and columns by jx in _sbindex form, retrying block Lanczos
+up to tries times until some are found"""
+  for _ in xrange(tries) :
+    b = _sbnull1(ix,jx,m,n);
+    if b : break;
+  return b;
+
+def _sbnull1(ix,jx,m,n) :
+  """Return _sbnull(ix,jx,m,n) from one block Lanczos attempt"""
+  x,v = _lanczos(ix,jx,n);
+  # find combinations c of the columns of [x|v] with B*[x|v]*c = 0
+  a = [y|1<<(m+i) for i,y in enumerate(_sbcolumns(_sbgather(ix,x),m)+
+                                       _sbcolumns(_sbgather(ix,v),m))];
+  c = [y>>m for y in a[len(_m4ri(a,m)):]][:64];
+  d = [sum(1<<k for k,y in enumerate(c) if y>>j&1) for j in xrange(128)];
+  y = _sbcolumns(_sbxor(_sbmul(x,d[:64]),_sbmul(v,d[64:])),n);
+  b = [];    # reduce to independent vectors
+  for y in y :
+    for p,u in b :
+      if y>>p&1 : y ^= u;
+    if y : b.append((bit_length(y&-y)-1,y));
+  return [u for p,u in b];
+
+class sbmatrix(object) :
+
+  """sparse boolean matrix"""
+
+  def __init__(self,*dims) :
+    """Create a sparse 2D boolean matrix
+sbmatrix(sbmatrix_arg) makes a copy of sbmatrix_arg
+sbmatrix(bmatrix_arg) makes a sparse copy of 2D bmatrix_arg
+sbmatrix(rows,cols) makes a rows x cols sbmatrix of all 0s
+sbmatrix(rows,cols,[row 0 column indices,row 1 column indices,...]) makes a
+rows x cols sbmatrix with 1s at the specified positions, duplicates being ignored"""
+    if not dims : raise ParameterError('requires some arguments');
+    if isinstance(dims[0],sbmatrix) :
+      if len(dims) != 1 : raise ParameterError('sbmatrix arg must be only one');
+      self.__dims = list(dims[0].__dims);
+      self.__r = [list(r) for r in dims[0].__r];
+      return;
+    if isinstance(dims[0],bmatrix) :
+      if len(dims) != 1 : raise ParameterError('bmatrix arg must be only one');
+      if len(dims[0].dims) != 2 : raise ParameterError('bmatrix must be 2D');
+      self.__dims = list(dims[0].dims);
+      self.__r = [[c for c,b in enumerate(format(x,'0%db'%(self.__dims[1]))[::-1])
+                   if b == '1'] for x in dims[0].rows];
+      return;
+    if len(dims) == 3 :
+      r = dims[2];
+      dims = dims[:2];
+    else :
+      r = None;
+    if len(dims) != 2 : raise ParameterError('sbmatrix must be 2D');
+    for n in dims :
+      if not isint(n) or n <= 0 :
+        raise TypeError('dimensions must be positive integers');
+    self.__dims = list(dims);
+    if r is None :
+      self.__r = [[] for i in xrange(dims[0])];
+      return;
+    if len(r) != dims[0] :
+      raise ParameterError('number of rows must match sbmatrix dimensions');
+    self.__r = [sorted(set(x)) for x in r];
+    for x in self.__r :
+      if x and not (0 <= x[0] and x[-1] < dims[1]) :
+        raise IndexError('column index out of range');
+
+  def __repr__(self) :
+    return 'sbmatrix(%d,%d,%r)'%(self.__dims[0],self.__dims[1],self.__r);
+
+  def __str__(self) :
+    """Return a string showing the matrix as a bmatrix"""
+    return str(bmatrix(self));
+
+  def __len__(self) :
+    return self.__dims[0]*self.__dims[1];
+
+  def __eq__(self,other) :
+    """Return True iff other is an sbmatrix with the same dimensions and elements"""
+    return isinstance(other,sbmatrix) and self.__dims == other.__dims and \
+      self.__r == other.__r;
+
+  def __ne__(self,other) :
+    return not self == other;
+
+  def __getitem__(self,key) :
+    """Return the element at key = (row,column)"""
+    r,c = key;
+    if not -self.__dims[1] <= c < self.__dims[1] : raise IndexError('index out of range');
+    return 0+(c%self.__dims[1] in self.__r[r]);
+
+  def __setitem__(self,key,value) :
+    """Set the element at key = (row,column) to the bit value"""
+    r,c = key;
+    if not -self.__dims[1] <= c < self.__dims[1] : raise IndexError('index out of range');
+    c %= self.__dims[1];
+    x = self.__r[r];
+    if (value&1 if isint(value) else value) :
+      if not c in x :
+        x.append(c);
+        x.sort();
+    elif c in x :
+      x.remove(c);
+
+  @property
+  def dims(self) :
+    """tuple of dimensions"""
+    return tuple(self.__dims);
+
+  @property
+  def nnz(self) :
+    """number of nonzero elements"""
+    return sum(len(x) for x in self.__r);
+
+  @property
+  def rows(self) :
+    """list of tuples of the column indices of the 1s in each row"""
+    return [tuple(x) for x in self.__r];
+
+  @property
+  def T(self) :
+    """transpose"""
+    c = [[] for i in xrange(self.__dims[1])];
+    for i,x in enumerate(self.__r) :
+      for j in x :
+        c[j].append(i);
+    s = sbmatrix(self.__dims[1],self.__dims[0]);
+    s.__r = c;
+    return s;
+
+  @property
+  def transpose(self) :
+    """transpose"""
+    return self.T;
+
+  def __iadd__(self,other) :
+    """Add an sbmatrix elementwise (mod 2) to this sbmatrix"""
+    if not isinstance(other,sbmatrix) : raise TypeError('can only add sbmatrices');
+    if other.__dims != self.__dims :
+      raise ParameterError('matrices must have same dimensions');
+    self.__r = [sorted(set(x).symmetric_difference(y)) if y else x
+                for x,y in zip(self.__r,other.__r)];
+    return self;
+
+  def __add__(self,other) :
+    """Return the elementwise sum (mod 2) of two sbmatrices"""
+    return sbmatrix(self).__iadd__(other);
+
+  __isub__ = __ixor__ = __iadd__;
+  __sub__ = __xor__ = __add__;
+
+  def __mul__(self,other) :
+    """Return the product of self and other, an sbmatrix, a bmatrix with as many
+rows as self has columns, a vector, or a scalar; products with bmatrices are bmatrices"""
+    n,m = self.__dims;
+    if isinstance(other,sbmatrix) :
+      if m != other.__dims[0] : raise ParameterError('inner dimensions must agree');
+      o = [set(x) for x in other.__r];
+      s = sbmatrix(n,other.__dims[1]);
+      for i,x in enumerate(self.__r) :
+        y = set();
+        for c in x :
+          y ^= o[c];
+        s.__r[i] = sorted(y);
+      return s;
+    if islistlike(other) :
+      other = bmatrix((len(other),),other);
+    if isinstance(other,bmatrix) :
+      if other.dims[0] != m : raise ParameterError('inner dimensions must agree');
+      if len(other.dims) == 1 :
+        b = format(other._bits,'0%db'%(m))[::-1];
+        return bmatrix((n,),int(''.join('01'[[b[c] for c in x].count('1')&1]
+                                        for x in reversed(self.__r)),2));
+      if len(other.dims) == 2 :
+        o = other.rows;
+        return bmatrix.fromrows([reduce(_xor,[o[c] for c in x],0) for x in self.__r],
+                                other.dims[1]);
+      raise TypeError('only matrices can be multiplied');
+    if isint(other) :
+      return sbmatrix(self) if other&1 else sbmatrix(n,m);
+    raise TypeError('only matrices can be multiplied');
+
+  def __rmul__(self,other) :
+    """Return the product of other, a bmatrix, vector, or scalar, and self"""
+    if islistlike(other) :
+      other = bmatrix((len(other),),other);
+    if isinstance(other,bmatrix) :
+      if len(other.dims) == 1 : return self.T*other;
+      return (self.T*other.T).T;
+    return self*other;
+
+  def nullspace(self) :
+    """Return a list of independent vectors (1D bmatrices) in the null space,
+found by block Lanczos in time proportional to the number of nonzeros per
+iteration; this is usually, but not necessarily, a basis if it has fewer than 64"""
+    n,m = self.__dims;
+    c = self.T.__r;
+    return [bmatrix((m,),x) for x in
+            _sbnull(_sbindex(self.__r),_sbindex(c),n,m)];
+
+  def solve(self,b) :
+    """Return a vector (1D bmatrix) x with self*x == b, found by block Lanczos;
+raise ValueError if none is found"""
+    n,m = self.__dims;
+    if islistlike(b) :
+      b = bmatrix((len(b),),b);
+    if not isinstance(b,bmatrix) or b.dims != (n,) :
+      raise ParameterError('requires vector with length the number of rows');
+    b = b._bits;
+    if not b : return bmatrix((m,));
+    r = [x+[m] if b>>i&1 else x for i,x in enumerate(self.__r)];
+    c = self.T.__r+[[i for i in xrange(n) if b>>i&1]];
+    for x in _sbnull(_sbindex(r),_sbindex(c),n,m+1) :
+      if x>>m :
+        return bmatrix((m,),x&((1<<m)-1));
+    raise ValueError('no solution found');
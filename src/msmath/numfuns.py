@@ -354,6 +354,31 @@ def fmerge(*args) :
         del d[x];
   return;
 
+kroneckerlimit = 32;    # multiply longer polynomials by Kronecker substitution
+
+def _hexpack(a,w) :
+  """Return the integer whose w-hexit fields are the nonnegative ints in a"""
+  return int(''.join(['%0*x'%(w,c) for c in a]) or '0',16);
+
+def kmul(f,g) :
+  """Return, as a list, the product of f and g, polynomials with integer
+     coefficients, computed by Kronecker substitution:
+     each polynomial is packed into a single integer and those are multiplied"""
+  if not f or not g : return [];
+  n = len(f)+len(g)-1;
+  if min(f) >= 0 and min(g) >= 0 :
+    w = (bit_length(max(f)*max(g)*min(len(f),len(g)))+3)//4 or 1;
+    z = '%0*x'%(n*w,_hexpack(f,w)*_hexpack(g,w));
+    return [int(z[i:i+w],16) for i in xrange(0,n*w,w)];
+  b = bit_length(max(map(abs,f))*max(map(abs,g))*min(len(f),len(g)))+1;
+  w = (b+3)//4;    # hexits per coefficient, leaving room for sign
+  x = _hexpack([max(c,0) for c in f],w)-_hexpack([max(-c,0) for c in f],w);
+  y = _hexpack([max(c,0) for c in g],w)-_hexpack([max(-c,0) for c in g],w);
+  h = 1<<(4*w-1);
+  o = int(('%x'%(h))*n,16);    # offset making every field nonnegative
+  z = '%0*x'%(n*w,x*y+o);
+  return [int(z[i:i+w],16)-h for i in xrange(0,n*w,w)];
+
 def mpmul(p,f,g,m=None,c=None) :
   """Return the product of f and g, polynomials over GF(p), modulo polynomial m;
      if c, add c to the constant term of the product."""
@@ -365,10 +390,13 @@ def mpmul(p,f,g,m=None,c=None) :
       if m : return ();
       raise ZeroDivisionError;
   if not f or not g : return (c,) if c else ();
-  fg = (len(f)+len(g)-1)*[0];
-  for i in xrange(len(f)) :
-    for j in xrange(len(g)) :
-      fg[i+j] = (fg[i+j]+f[i]*g[j])%p;
+  if min(len(f),len(g)) > kroneckerlimit :
+    fg = [x%p for x in kmul(f,g)];
+  else :
+    fg = (len(f)+len(g)-1)*[0];
+    for i in xrange(len(f)) :
+      for j in xrange(len(g)) :
+        fg[i+j] = (fg[i+j]+f[i]*g[j])%p;
   if c : fg[-1] += c;
   return mpmod(p,fg,m) if m else tuple(lstrip(fg));
 
@@ -398,6 +426,32 @@ def mpneg(p,f) :
   """Return the additive inverse of f, a polynomial over GF(p)"""
   return tuple(-x%p for x in lstrip(f));
 
+_mpinverses = {};    # (p,g) -> reciprocal series of g, for Kronecker division
+
+def _mpinverse(p,g,k) :
+  """Return the first k coefficients of the power series 1/g(1/x)*x**deg(g),
+     polynomial g over GF(p) with nonzero leading coefficient, by Newton iteration"""
+  try :
+    h = _mpinverses[p,g];
+    if len(h) >= k : return h[:k];
+  except KeyError :
+    if len(_mpinverses) >= 64 : _mpinverses.clear();
+  h = [pow(g[0],p-2,p)];
+  while len(h) < k :
+    l = min(2*len(h),k);
+    e = [-x%p for x in kmul(g[:l],h)[:l]];
+    e[0] += 2;
+    h = [x%p for x in kmul(h,e)[:l]];
+  _mpinverses[p,g] = h;
+  return h;
+
+def _mpdivrem(p,r,g) :
+  """Return the quotient and remainder, as lists, from dividing r by g,
+     polynomials over GF(p) with r at least as long as g, by Kronecker substitution"""
+  k = len(r)-len(g)+1;
+  q = [x%p for x in kmul(r[:k],_mpinverse(p,tuple(g),k))[:k]];
+  return q,[(x-y)%p for x,y in zip(r[k:],kmul(q,g)[k:])];
+
 def mpmod(p,f,g) :
   """Return f mod g, polynomials over GF(p)"""
   g = lstrip(g);
@@ -407,6 +461,8 @@ def mpmod(p,f,g) :
   dg = len(g)-1;
   if dr < dg :
     return tuple(r);
+  if min(dr+1-dg,dg) > kroneckerlimit :
+    return tuple(lstrip(_mpdivrem(p,r,g)[1]));
   ig = pow(g[0],p-2,p);
   for i in xrange(dr+1-dg) :
     if r[i] :
@@ -428,6 +484,9 @@ def mpdivrem(p,f,g) :
   dg = len(g)-1;
   if dr < dg :
     return (),tuple(r);
+  if min(dr+1-dg,dg) > kroneckerlimit :
+    q,r = _mpdivrem(p,r,g);
+    return tuple(q),tuple(lstrip(r));
   ig = pow(g[0],p-2,p);
   q = [];
   for i in xrange(dr+1-dg) :
@@ -493,36 +552,117 @@ def m2add(a,b) :
 
 m2sub = m2add;
 
+m2karatsubalimit = 4096;    # multiply longer packed GF(2) polys by Karatsuba splitting
+m2reducelimit = 16;    # reduce by table-free bit loop if quotient is no longer
+
+def _m2table(a,w) :
+  """Return the list of products of a, a packed GF(2) polynomial, with all
+     packed GF(2) polynomials of degree < w"""
+  t = [0,a];
+  for i in xrange(2,1<<w) :
+    t.append(t[i>>1]<<1 ^ t[i&1]);
+  return t;
+
+def _m2tmul(t,w,b) :
+  """Return the product of b and a, packed GF(2) polynomials, where t = _m2table(a,w)"""
+  M = (1<<w)-1;
+  s = (bit_length(b)+w-1)//w*w;
+  p = 0;
+  while s :
+    s -= w;
+    p = p<<w ^ t[b>>s&M];
+  return p;
+
+def _m2mul(a,b) :
+  """Return the product of a and b, packed GF(2) polynomials, b no longer than a,
+     using a table of the products of a with all polynomials of degree < w"""
+  lb = bit_length(b);
+  if lb <= 8 :
+    p = 0;
+    while b :
+      if b&1 : p ^= a;
+      b >>= 1;
+      a <<= 1;
+    return p;
+  w = 4 if lb <= 2048 else 8;
+  return _m2tmul(_m2table(a,w),w,b);
+
 def m2mul(a,b,m=0) :
   """Return the product of a and b, packed GF(2) polynomials, mod m"""
   if not a or not b : return 0;
-  p = 0;
-  if m :
-    M = 1<<(bit_length(m)-1);    # hi order bit of m
-    g = M^m;
-    M >>= 1;
-    N = M-1;
-    m = M;
-    while m :
-      p = ((p&N)<<1)^g if p&M else p<<1;
-      if b&m : p ^= a;
-      m >>= 1;
-    return p;
-  while b :
-    if b&1 : p ^= a;
-    b >>= 1;
-    a <<= 1;
-  return p;
+  la = bit_length(a);
+  lb = bit_length(b);
+  if la < lb : a,b,la,lb = b,a,lb,la;
+  if lb > m2karatsubalimit :
+    h = la>>1;
+    M = (1<<h)-1;
+    a1 = a>>h;
+    a0 = a&M;
+    if lb <= h :
+      p = m2mul(a1,b)<<h ^ m2mul(a0,b);
+    else :
+      b1 = b>>h;
+      b0 = b&M;
+      p2 = m2mul(a1,b1);
+      p0 = m2mul(a0,b0);
+      p = (p2<<h ^ m2mul(a1^a0,b1^b0)^p2^p0)<<h ^ p0;
+  else :
+    p = _m2mul(a,b);
+  return m2mod(p,m) if m else p;
 
 def m2sq(a,m=0) :
   """Return the square of a, a packed GF(2) polynomial, mod m"""
   p = int(bin(a)[2:],4);
   return m2mod(p,m) if m else p;
 
+_m2reducers = {};    # modulus -> exponents of its low terms if sparse, else
+                     # 8-bit window tables of x**2n//modulus and of modulus
+
+def _m2divrem(a,b) :
+  """Return the quotient and remainder from dividing a by b, packed GF(2) polynomials:
+     if b = x**n+r with r sparse and of degree <= n/2 (e.g., a trinomial or pentanomial),
+     by repeatedly replacing x**n with r; else by Barrett reduction, n bits at a time"""
+  try :
+    e = _m2reducers[b];
+  except KeyError :
+    if len(_m2reducers) >= 64 : _m2reducers.clear();
+    n = bit_length(b)-1;
+    r = b^(1<<n);
+    if bit_count(r) <= 8 and bit_length(r) <= n//2+1 :
+      e = tuple(i for i in xrange(bit_length(r)) if r>>i&1);
+    else :    # Barrett quotient, by bit loop
+      e = 0;
+      a2 = 1<<2*n;
+      while bit_length(a2) > n :
+        d = bit_length(a2)-n-1;
+        a2 ^= b<<d;
+        e |= 1<<d;
+      e = [_m2table(e,8),_m2table(b,8)];
+    _m2reducers[b] = e;
+  n = bit_length(b)-1;
+  M = (1<<n)-1;
+  q = 0;
+  if isinstance(e,tuple) :
+    while a > M :
+      h = a>>n;
+      q ^= h;
+      a &= M;
+      for i in e :
+        a ^= h<<i;
+    return q,a;
+  while a > M :
+    s = max(bit_length(a)-2*n,0);
+    c = _m2tmul(e[0],8,a>>s+n)>>n;
+    a ^= _m2tmul(e[1],8,c)<<s;
+    q ^= c<<s;
+  return q,a;
+
 def m2mod(a,b) :
   """Return a mod b, packed GF(2) polynomials"""
   if not b : raise ZeroDivisionError;
   lb = bit_length(b);
+  if lb > m2reducelimit and bit_length(a)-lb > m2reducelimit :
+    return _m2divrem(a,b)[1];
   while True :
     la = bit_length(a);
     if la < lb : break;
@@ -533,8 +673,10 @@ def m2mod(a,b) :
 def m2divrem(a,b) :
   """Return the quotient and remainder from dividing a by b, packed GF(2) polynomials"""
   if not b : raise ZeroDivisionError;
-  c = 0;
   lb = bit_length(b);
+  if lb > m2reducelimit and bit_length(a)-lb > m2reducelimit :
+    return _m2divrem(a,b);
+  c = 0;
   while True :
     la = bit_length(a);
     if la < lb : break;
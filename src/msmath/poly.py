@@ -9,7 +9,8 @@ from collections import defaultdict
 from . matrix import product
 from . rational import rational, xrational, inf, realize, root
 from . conversions import bit_length, xrange, isint, iteritems, isffield, lmap
-from . numfuns import factor, factors, leastfactor, ffactors, primepower, modpow, isirreducible, isprimitive, gcda, lcma, divisors, primes
+from . import numfuns
+from . numfuns import kmul, factor, factors, leastfactor, ffactors, primepower, modpow, isirreducible, isprimitive, gcda, lcma, divisors, primes
 from random import randrange,randint
 
 def select(a,b) :
@@ -35,6 +36,15 @@ XRATIONAL = set((rational,xrational));
 int_float = lambda x: x if isint(x) else x.a if abs(x.b)==1 else float(x);
 
 def nzpolymul(f,g) :
+  if min(len(f),len(g)) > numfuns.kroneckerlimit :    # integer or GF(p) coeffs?
+    types = set(map(type,chain(f,g)));
+    if types <= INT :
+      return kmul(f,g);
+    if len(types) == 1 :
+      t = types.pop();
+      if isffield(t) and t._n == 1 :
+        p = t._p;
+        return [t(x%p) for x in kmul([x._x for x in f],[x._x for x in g])];
   fg = (len(f)+len(g)-1)*[0*f[0]];
   for i in xrange(len(f)) :
     for j in xrange(len(g)) :
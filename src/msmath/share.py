@@ -3,7 +3,7 @@
 import sys
 
 from . ffield import ffield
-from . matrix import matrix
+from . matrix import matrix, product, batch_inverse
 from random import randrange
 
 if sys.version_info[0] < 3 :
@@ -18,8 +18,8 @@ else :
     """Python 2 version of map"""
     return list(map(*x));
 
-from . conversions import stradix
-from . rational import ceil,log,log2
+from . conversions import stradix, isint
+from . rational import rational,ceil,log,log2
 
 def hexify(r,radix=16) :
   """Given a finite field, make its __str__ output in radix radix """
@@ -90,10 +90,21 @@ Note that built-in numeric classes might not recover the secret exactly."""
     while q <= abs(s) : q *= 2;
   return zp(sharers,Vandermonde(sharers,k)*([s]+[type(s)(randrange(q)) for i in range(k-1)]));
 
+def lagrange0(xs) :
+  """Given a list of k distinct "numbers", return the list of coefficients
+of the Lagrange interpolation at 0 (the first row of the inverse Vandermonde),
+using one inversion"""
+  k = len(xs);
+  o = xs[0]**0;    # one, so empty products are "numbers" too
+  if isint(o) : o = rational(o);    # exact inverses
+  ns = [product((xs[j] for j in range(k) if j != i),o) for i in range(k)];
+  ds = [product((xs[j]-xs[i] for j in range(k) if j != i),o) for i in range(k)];
+  return [n*d for n,d in zip(ns,batch_inverse(ds))];
+
 def secret(xs) :
   """Given a list of k (sharer,share) pairs, return the secret"""
   z = zp(*xs);
-  return str((Vandermonde(z[0])**-1*z[1])[0]);
+  return str(sum(l*y for l,y in zip(lagrange0(z[0]),z[1])));
 
 def printshares(ss) :
   """Given list of (sharer,share) pairs, print it as a matrix"""
@@ -109,6 +120,6 @@ def mungeshare(xs,j,t) :
   if isinstance(t,str) :
     t = G(iicsa(t));
   z = zp(*xs);
-  v = Vandermonde(z[0])**-1;
-  ds = (t-(v*z[1])[0])/v[0,j];
+  v = lagrange0(z[0]);
+  ds = (t-sum(l*y for l,y in zip(v,z[1])))/v[j];
   return [s if i!=j else (s[0],s[1]+ds) for i,s in enumerate(xs)];
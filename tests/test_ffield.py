@@ -14,10 +14,15 @@ except Exception :
   process_time = default_timer;
 
 from msmath.ffield import *
+from msmath.ffield import tablemax, _frobenius, _inverse
+from msmath.ffarray import ffarray
+from msmath.fring import zm
 from msmath.conversions import unpack, zits, gcd, xrange
-from msmath.numfuns import isprime, isirreducible, irreducibles, irreducible_count, isprimitive, factor, unfactor, factors, lcm, gcda, lcma, phi, lam, sigma, numdivisors, divisors, getorder, primes
+from msmath import numfuns, fftables
+from msmath.numfuns import m2mul, m2divrem, m2mod, isprime, isirreducible, irreducibles, irreducible_count, isprimitive, factor, unfactor, factors, lcm, gcda, lcma, phi, lam, sigma, numdivisors, divisors, getorder, primes
 from msmath.matrix import *
 from msmath.poly import *
+from msmath.share import shares, secret
 
 MAXCHAR = 10;    # limit on characteristics to test
 LIMIT2 = 64;     # limit on ff size for full pair testing
@@ -69,6 +74,8 @@ def atest(g) :
   mtest(g);
   ptest(g);
   ltest(g);  
+  ttest(g);
+  artest(g);
 
 def otest(g) :
   global z,o
@@ -146,6 +153,114 @@ def ltest(g) :    # log test
         v = v[-1::-1];
         vo = vo[-1::-1];
 
+def settables(g,tables) :
+  if isinstance(g,ffield) :
+    ffield(*g.id,tables=tables);
+  else :
+    ffieldx(g.polynomial,tables=tables);
+
+def ttest(g) :    # exp/log table test
+  q = g.q;
+  if q > tablemax : return;
+  print('  table tests');
+  z = g(0);
+  tabled = '_exp' in g.__dict__;
+  r = tuple(g(randrange(q)) for i in xrange(LIMIT2));
+  e = tuple(randrange(-q,q) for i in xrange(LIMIT2));
+  v = [];
+  for tables in (True,False) :
+    settables(g,tables);
+    v.append(tuple((x*y,x*2,x/y if y else z,x**k if x else z,1/x if x else z,3/x if x else z)
+                   for x,y,k in zip(r,r[1:],e)));
+  settables(g,tabled);
+  ceq('v[0]==v[1]',*v);
+
+def artest(g) :    # ffarray test
+  print('  array tests');
+  q = g.q;
+  r = [g(randrange(q)) for i in xrange(LIMIT2)];
+  s = [x or x+1 for x in r[1:]+r[:1]];
+  e = randrange(-q,q);
+  a = ffarray(g,r);
+  b = ffarray(g,s);
+  c = g(randrange(q));
+  ceq('v[0].tolist()==v[1]',a,r);
+  ceq('ffarray(v[0].field,v[0].x)==v[0]',a);
+  ceq('(v[0]+v[1]).tolist()==[x+y for x,y in zip(v[2],v[3])]',a,b,r,s);
+  ceq('(v[0]-v[1]).tolist()==[x-y for x,y in zip(v[2],v[3])]',a,b,r,s);
+  ceq('(v[0]*v[1]).tolist()==[x*y for x,y in zip(v[2],v[3])]',a,b,r,s);
+  ceq('(v[0]/v[1]).tolist()==[x/y for x,y in zip(v[2],v[3])]',a,b,r,s);
+  ceq('(-v[0]).tolist()==[-x for x in v[1]]',a,r);
+  ceq('(v[0]-v[1]).tolist()==v[2]',a,c,[x-c for x in r]);
+  ceq('(v[1]-v[0]).tolist()==v[2]',a,c,[c-x for x in r]);
+  ceq('(3*v[0]).tolist()==v[1]',a,[3*x for x in r]);
+  ceq('(1/v[0]).tolist()==[1/x for x in v[1]]',b,s);
+  ceq('batch_inverse(v[0])==v[1]',s,[1/x for x in s]);
+  ceq('(v[0]**v[1]).tolist()==v[2]',b,e,[x**e for x in s]);
+  ceq('(v[0]**v[1]).tolist()==v[2]',a,abs(e),[x**abs(e) for x in r]);
+  ceq('(v[0]**0).tolist()==[x**0 for x in v[1]]',a,r);
+  ceq('v[0].dot(v[1])==sum((x*y for x,y in zip(v[2],v[3])),v[0].field(0))',a,b,r,s);
+  ceq('v[0][1:3].tolist()==v[1][1:3]',a,r);
+
+def spow(x,e) :    # reference square and multiply
+  y = 1;
+  while e :
+    if e&1 : y = x*y;
+    x *= x;
+    e >>= 1;
+  return y;
+
+def frtest(g) :    # Frobenius, inverse, and minpoly tests
+  p,n = g.p,g.n;
+  dotprint('  Frobenius/inverse/minpoly tests');
+  for i in xrange(16) :
+    x = g(randrange(1,g.q));
+    for k in (1,2,n-1,n+1) :
+      ceq('v[0](_frobenius(v[0],v[1].x,v[2]))==spow(v[1],v[3])',g,x,k,p**(k%n));
+    e = randrange(g.q**2);
+    ceq('v[0]**v[1]==spow(v[0],v[1])',x,e);
+    ceq('v[1](_inverse(v[1],v[0].x))*v[0]==1',x,g);
+    ceq('v[0]*(1/v[0])==1 and 1/v[0]==v[0]**-1 and 2/v[0]==2*v[0]**-1',x);
+    m = x.minpoly();
+    ceq('not v[2]%(len(v[0])-1) and not polynomial(*v[0])(v[1])',m,x,n);
+    dotprint();
+  print();
+
+def randtower(F,k) :    # random degree k extension of F
+  while True :
+    P = polynomial(*[F(1)]+[F(randrange(F.q)) for i in xrange(k)]);
+    if P.isirreducible() : return ffieldx(P);
+
+def rxtest(g) :    # packed ffieldx arithmetic vs polynomial arithmetic, without tables
+  tabled = '_exp' in g.__dict__;
+  settables(g,False);
+  dotprint('  packed arithmetic tests');
+  q = g.q;
+  P = g.polynomial;
+  for i in xrange(256) :
+    x = g(randrange(q));
+    y = g(randrange(1,q));
+    e = randrange(q*q);
+    ceq('(v[0]*v[1]).polynomial==v[0].polynomial*v[1].polynomial%v[2]',x,y,P);
+    ceq('v[0]/v[1]*v[1]==v[0] and 1/v[1]*v[1]==1 and 2/v[1]==2*v[1]**-1',x,y);
+    ceq('v[0]**v[1]==spow(v[0],v[1])',y,e);
+    if not i%32 : dotprint();
+  print();
+  settables(g,tabled);
+
+def bltest(*gs) :    # log test in bigger fields
+  dotprint('big field log test');
+  for g in gs :
+    x = g.generator;
+    for i in xrange(4) :
+      y = g(randrange(1,g.q));
+      ceq('v[0]==v[1]**v[0].log(v[1])',y,x);
+      ceq('v[0]==v[1]**v[0].log(v[1],True)',y,x);
+      ceq('v[0]==v[1]**v[0].log(v[1])',y**30,x**10);
+      ceq('v[0]==v[1]**v[0].log(v[1],True)',y**30,x**10);
+    dotprint();
+  print();
+
 def ctest(g) :    # comparison and contains tests
   print('  field comparison and contains tests')
   ceq('v[0].basefield<=v[0]',g);
@@ -173,6 +288,13 @@ def mtest(g) :    # matrix tests
     if M.det :
       ceq('1/v[0]*v[0]==matrix.Identity(3,o)==v[0]*v[0].inverse',M);
       break;
+  d = 12;    # big enough for numpy elimination over prime fields
+  M0,M1 = (matrix((d,d),tuple(g(randrange(q)) for i in xrange(d*d))) for _ in xrange(2));
+  M2 = matrix((d,d),tuple(g(randrange(q)) if i%d else z for i in xrange(d*d)));
+  ceq('(v[0]*v[1]).det==v[0].det*v[1].det==v[1].T.det*v[0].T.det',M0,M1);
+  ceq('not v[0].det and v[0].rank<12 and (v[0]*v[1]).rank<=v[0].rank',M2,M1);
+  if M0.det :
+    ceq('v[0].rank==12 and v[0]*v[0].inverse==matrix.Identity(12,o)',M0);
   d = min(q-1,LIMITM);    # check Vandermonde matrix determinant
   M = matrix.Identity(d,z);
   x = o;
@@ -367,6 +489,29 @@ def ftest1(n) :
       print('non primepower factor %d**%d in factor(%d)'%(p,k,n));
       break;
 
+def m2test() :
+  dotprint('(packed GF(2) polynomial) multiply/divide test');
+  limit = numfuns.m2karatsubalimit;
+  for numfuns.m2karatsubalimit in (limit,64) :
+    for i in xrange(256) :
+      a = randrange(1<<randrange(1,1200));
+      b = randrange(1,1<<randrange(1,1200));
+      m = (1<<randrange(32,600))|randrange(1<<16)|1;    # sparse modulus
+      p,x,y = 0,a,b;
+      while y :    # reference product
+        if y&1 : p ^= x;
+        x <<= 1;
+        y >>= 1;
+      ceq('m2mul(v[0],v[1])==v[2]',a,b,p);
+      q,r = m2divrem(a,b);
+      ceq('m2mul(v[2],v[1])^v[3]==v[0] and v[3].bit_length()<v[1].bit_length()',a,b,q,r);
+      ceq('m2mod(v[0],v[1])==v[2]',a,b,r);
+      q,r = m2divrem(p,m);
+      ceq('m2mul(v[2],v[1])^v[3]==v[0] and v[3].bit_length()<v[1].bit_length()',p,m,q,r);
+      if not i%32 : dotprint();
+  numfuns.m2karatsubalimit = limit;
+  print();
+
 def gtest() :
   dotprint('gcda/lcma test');
   for i in xrange(32) :
@@ -421,6 +566,38 @@ def dtest1(n) :
 R=Random();
 R.seed(0);
 
+def pttest() :    # precomputed and cached polynomial tables vs search
+  import os, tempfile
+  dotprint('polynomial table test');
+  m = sys.modules[ffield.__module__];
+  polys,cache = m._polys,m.polycache;
+  m._polys,m.polycache = {},None;
+  for k in fftables.kinds :
+    t = [x for x in sorted(getattr(fftables,k).items()) if x[0][0]**x[0][1] < 1<<16];
+    for (p,n),g in sample(t,min(16,len(t))) :
+      ceq('v[0]==v[1]',g,conwaypoly(p**n) if k == 'conway' else m._leastpoly(p,n,k),k,p,n);
+    dotprint();
+  h = m._leastpoly(53,2,'primitive');    # p >= 50 is not in fftables
+  c = conwaypoly(53**2);
+  fd,m.polycache = tempfile.mkstemp();
+  os.close(fd);
+  g = m._leastpoly(53,2,'irreducible');    # appended to polycache
+  with open(m.polycache,'a') as f :
+    f.write('bad line\nirreducible 53 2 12\n');    # not written by _polystore; ignored
+    f.write(m._polyline('primitive',53,2,0)+'\n'+m._polyline('primitive',53,2,2)+'\n');    # checked and replaced
+    f.write(m._polyline('sparse',2,130,15)+'\n'+m._polyline('conway',53,2,0)+'\n');    # not fewest 1s; ignored
+  m._polys = None;
+  ceq('v[0]==v[1] and v[2]',g,m._polylookup('irreducible',53,2),('irreducible',53,2) in m._unchecked);
+  ceq('v[0]==v[1]',g,m._leastpoly(53,2,'irreducible'));
+  ceq('v[0]==v[1]',h,m._leastpoly(53,2,'primitive'));    # x**2+2 is irreducible, not primitive
+  ceq('v[0]==v[1]',9,m._leastpoly(2,130,'sparse'));    # x**130+x**3+1
+  ceq('v[0]==v[1]',c,conwaypoly(53**2));
+  m._polys = None;
+  ceq('v[0]==v[1]',h,m._polylookup('primitive',53,2));    # later lines win
+  os.remove(m.polycache);
+  m._polys,m.polycache = polys,cache;
+  print();
+
 def timing(name,G,stmt,repeats=16,nargs=1) :
   """Print time taken by stmt with nargs random args selected from G"""
   t = timeit(
@@ -440,10 +617,62 @@ def timetest(g) :
   timing('x/y',g,'r[i]/(r[i+1] or r[i+1]+1)',1<<10,2);
   timing('x**y',g,'r[i]**r[i+1].x',1<<10,2);
   timing('minpoly',g,'r[i].minpoly()',1<<7);
-  if g.q <= 1<<10 :
+  if max(factors(g.q-1)) < 1<<40 :
     timing('log',g,'(r[i] or r[i]+1).log()',1<<7);
     timing('logalt',g,'(r[i] or r[i]+1).log(alt=1)',1<<7);
 
+def tabletimetest(g) :    # compare timing without and with exp/log tables
+  tabled = '_exp' in g.__dict__;
+  for tables in (False,True) :
+    settables(g,tables);
+    print('%s\ttables=%s'%(g.__name__,tables));
+    timing('1/x',g,'1/(r[i] or r[i]+1)',1<<10);
+    timing('x*y',g,'r[i]*r[i+1]',1<<10,2);
+    timing('x/y',g,'r[i]/(r[i+1] or r[i+1]+1)',1<<10,2);
+    timing('x**y',g,'r[i]**r[i+1].x',1<<10,2);
+  settables(g,tabled);
+
+def arraytimetest(g,m=1<<14) :    # compare timing of elements and ffarrays
+  r = [g(randrange(g.q)) for i in xrange(m)];
+  s = [x or x+1 for x in r[1:]+r[:1]];
+  a = ffarray(g,r);
+  b = ffarray(g,s);
+  for name,stmt,astmt in (('x*y',lambda:[x*y for x,y in zip(r,s)],lambda:a*b),
+                          ('x/y',lambda:[x/y for x,y in zip(r,s)],lambda:a/b),
+                          ('x**y',lambda:[x**12345 for x in r],lambda:a**12345)) :
+    print('%s\t%s\t%.9f\tffarray\t%.9f'%(g.__name__,name,
+          timeit(stmt,timer=process_time,number=1)/m,
+          timeit(astmt,timer=process_time,number=1)/m));
+
+def batchtimetest(g,m=1<<10) :    # compare timing of 1/x and batch_inverse
+  r = [g(randrange(1,g.q)) for i in xrange(m)];
+  print('%s\t1/x\t%.9f\tbatch_inverse\t%.9f'%(g.__name__,
+        timeit(lambda:[1/x for x in r],timer=process_time,number=1)/m,
+        timeit(lambda:batch_inverse(r),timer=process_time,number=1)/m));
+
+def memtimetest(g,m=1<<10) :    # memory per element and multiply time
+  try :
+    import tracemalloc
+  except ImportError :
+    tracemalloc = None;
+  r = [g(randrange(1,getattr(g,'q',0) or g.m)) for i in xrange(m)];
+  s = r[1:]+r[:1];
+  if tracemalloc :
+    tracemalloc.start();
+    a = [x*y for x,y in zip(r,s)];
+    b = tracemalloc.get_traced_memory()[0]/m;
+    tracemalloc.stop();
+  else :
+    b = float('nan');
+  print('%s\t%.1f bytes/element\tx*y\t%.9f'%(g.__name__,b,
+        timeit(lambda:[x*y for x,y in zip(r,s)],timer=process_time,number=1)/m));
+
+def sharetest() :    # secret sharing test
+  for s,n,k in (('hello world',4,1),('hello world',5,3),(12345,4,1),(12345,4,2),(12345,5,3)) :
+    x = shares(s,n,k);
+    for i in xrange(n-k+1) :
+      ceq('secret(v[0]) == v[1]',x[i:i+k],str(s));
+
 if __name__=='__main__' :
 
   def usage() :
@@ -465,6 +694,8 @@ Usage: python test_ffield.py [options]
     sys.exit();
   if not 'x' in optdict :
     gtest();
+    m2test();
+    pttest();
     dtest();
     ftest(xrange(1,2**12+2),(2**i-1 for i in xrange(13,65)),(2**i+1 for i in xrange(13,65)));
   q = int(optdict.get('z',3**4));
@@ -472,6 +703,14 @@ Usage: python test_ffield.py [options]
     if isprime(p) :
       for i in range(1,7) :
         if p**i <= q : test(p,i);
+  bltest(ffield(2,64),ffield(2**61-1),ffield(3,20));
+  for g in (ffield(2,64),ffield(2**61-1),ffield(3,20),ffield(2,80)) :
+    print(g.__name__);
+    artest(g);
+  for g in (ffield(2,12),ffield(3,20),ffield(5,4),ffield(7,3),ffield(101,3),ffield(2**31-1,2)) :
+    print(g.__name__);
+    frtest(g);
+  sharetest();
   if 'r' in optdict :
     F4 = ffield(4);
     F9 = ffield(9);
@@ -479,6 +718,10 @@ Usage: python test_ffield.py [options]
     F81 = ffieldx(polynomial(1,F9(4),1));
     F256 = ffieldx(polynomial(1,F16(4),1));
     for g in (F81,F256) : atest(g);
+    for g in (F81,F256,randtower(ffield(2,8),2),randtower(ffield(3,4),3),
+              randtower(ffield(5,2),4),randtower(ffield(2,16),2),randtower(F16,3)) :
+      print(g.__name__);
+      rxtest(g);
   if 'c' in optdict :
     print('Conway polynomials')
     q = int(optdict['c']);
@@ -497,6 +740,16 @@ Usage: python test_ffield.py [options]
       timetest(g);
     if 'r' in optdict :
       for g in (F81,F256) : timetest(g);
+    for g in (ffield(2,8),ffield(3,5),ffield(2,16),ffield(3,10)) :
+      tabletimetest(g);
+    if 'r' in optdict :
+      for g in (F81,F256) : tabletimetest(g);
+    for g in (ffield(2,8),ffield(2,16),ffield(2**31-1),ffield(2,64)) :
+      arraytimetest(g);
+    for g in (ffield(3,5),ffield(2**61-1),ffield(3,20),ffield(2,64),ffield(2,256)) :
+      batchtimetest(g);
+    for g in (ffield(2,8),ffield(251),zm(256),zm(1<<16),ffield(2,16),ffield(2,64)) :
+      memtimetest(g);
 
 # NOTE: we should test whether gcd is faster than exp for computing inverse
 #   We did, and gcd is faster
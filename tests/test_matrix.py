@@ -1,17 +1,22 @@
 from __future__ import print_function
 from __future__ import division
 
-from msmath.conversions import xrange
+from msmath.conversions import xrange, gcd, isint
 from msmath.matrix import *
+import msmath.matrix as mmatrix
 from msmath.poly import *
 from msmath.rational import *
+from msmath.fring import zm
+from msmath.ffield import ffield
 from random import random, randint, randrange
+from timeit import default_timer
 
 MINDIM = 1    # min square matrix dimension for test
 MAXDIM = 4    # max square matrix dimension for test
 REPEATS = 10    # number of times to repeat test
 
 x = polynomial(1,0);    # the polynomial x
+GF2 = ffield(2);
 
 def testcp(dim,verbose=False) :    # characteristic polynomial test
   X = matrix.Identity(dim,x);
@@ -40,6 +45,67 @@ def testcp(dim,verbose=False) :    # characteristic polynomial test
   if cpMT :    # check that transposed matrix satisfies characteristic polynomial
     print(MT,cpMT);
 
+def testmp(dim) :    # charpoly and minpoly test, against det(x*I-M)
+  F = ffield(7,2);
+  for e in (lambda : randint(-9,9), lambda : rational(randint(-9,9),randint(1,9)),
+            lambda : F(randrange(49)), lambda : xrational(randint(-3,3),randint(-3,3))) :
+    M = matrix(dim,dim,[e() for i in xrange(dim*dim)]);
+    ceq('v[0].charpoly() == (matrix.Identity(v[1],x)-v[0]).det',M,dim);
+    ceq('not v[0].minpoly()(v[0]) and not v[0].charpoly()%v[0].minpoly()',M);
+    B = matrix(2*dim,2*dim,[M[0]*0]);    # block diagonal, so derogatory
+    B[:dim,:dim] = B[dim:,dim:] = M;
+    ceq('v[0].minpoly() == v[1].minpoly() and v[0].charpoly() == v[1].charpoly()**2',B,M);
+  M = matrix(2,2,[rational(1,0),rational(1,2),1,2]);    # infinity: not scaled to ints
+  ceq('isinstance(v[0].charpoly(),polynomial)',M);
+
+def testsw(dim) :    # Strassen-Winograd test, against schoolbook
+  limit = mmatrix.strassenlimit;
+  p,q,r = (randint(dim,4*dim) for _ in xrange(3));
+  F = ffield(2,16);
+  for e in (lambda : xrational(randint(-9,9),randint(-9,9)), lambda : F(randrange(1<<16)),
+            lambda : rational(randint(-9,9),randint(1,9))) :
+    M0 = matrix(p,q,[e() for i in xrange(p*q)]);
+    M1 = matrix(q,r,[e() for i in xrange(q*r)]);
+    mmatrix.strassenlimit = 1<<30;
+    M = M0*M1;
+    mmatrix.strassenlimit = 2;
+    ceq('v[0]*v[1] == v[2]',M0,M1,M);
+  mmatrix.strassenlimit = limit;
+  M0 = matrix(2,2,[rational(1,0),rational(1,2),1,2]);    # infinity: schoolbook
+  M1 = matrix(2,2,[1,rational(1,3),0,1]);
+  M = matrix(2,2,[rational(1,0),rational(7,6),rational(0,0),2]);
+  ceq('str(v[0]*v[1]) == str(v[2])',M0,M1,M);
+
+def testdixon(dim) :    # p-adic lifting solve and inverse test, against LU
+  limit = mmatrix.dixonlimit;
+  for e in (lambda : rational(randint(-9,9),randint(1,9)),
+            lambda : rational(randint(-1<<70,1<<70),randint(1,1<<40))) :
+    M = matrix(dim,dim,[e() for i in xrange(dim*dim)]);
+    M[0,0] = rational(1,2);    # not all ints
+    b = matrix(dim,[randint(-9,9) for i in xrange(dim)]);
+    B = matrix(dim,2,[e() for i in xrange(2*dim)]);
+    if not M.det : continue;
+    mmatrix.dixonlimit = 1<<30;
+    x,X,I = M.solve(b),M.solve(B),M.inverse;
+    mmatrix.dixonlimit = 1;
+    ceq('v[0].solve(v[1]) == v[2]',matrix(M),b,x);
+    ceq('v[0].solve(v[1]) == v[2]',matrix(M),B,X);
+    ceq('v[0].inverse == v[1]',matrix(M),I);
+  mmatrix.dixonlimit = 1;
+  M = matrix(dim,dim,[rational(1,i+1) for i in xrange(dim*dim)]);
+  M[dim-1,:] = M[0,:]*(2 if dim > 1 else 0);    # singular
+  try :
+    M.solve([1]*dim);
+    print('solve of singular matrix succeeded');
+  except ZeroDivisionError :
+    pass;
+  M = matrix(2,2,[rational(1,0),rational(1,2),1,2]);    # infinity: solved by LU
+  x = M.solve([1,2]);
+  mmatrix.dixonlimit = 1<<30;
+  ceq('str(v[0].solve([1,2])) == str(v[1])',matrix(M),x);
+  mmatrix.dixonlimit = limit;
+  ceq('v[0] == (-3,7)',mmatrix._ratrecon(-3*pow(7,1000001,1000003),1000003,1<<9,1<<9));
+
 def testinv(dim,verbose=False) :    # matrix inverse test
   I = matrix.Identity(dim);
   M = matrix(dim,dim,tuple(xrational(random(),random()) for i in xrange(dim*dim)));
@@ -53,6 +119,92 @@ def testinv(dim,verbose=False) :    # matrix inverse test
       print('matrix inverse failed for');
       print(M);
     
+def testbi(dim) :    # batch inverse test
+  v = [xrational(random(),random()) for i in xrange(dim)];
+  ceq('batch_inverse(v[0]) == [1/x for x in v[0]]',v);
+  m = 2*3*5*7*11*13;
+  R = zm(m);
+  v = [R(x) for x in (randrange(m) for i in xrange(dim)) if gcd(x,m) == 1];
+  ceq('batch_inverse(v[0]) == [1/x for x in v[0]]',v);
+  ceq('batch_inverse([]) == []');
+
+def testnp(dim) :    # numpy fast path test, against the object path
+  n = 2*mmatrix.numpylimit+dim;
+  I = matrix.Identity(n);
+  for f in (lambda : randint(-1,1), lambda : randint(-1<<40,1<<40),
+            random, lambda : complex(random(),random())) :
+    M0,M1 = (matrix(n,n,tuple(f() for i in xrange(n*n))) for _ in xrange(2));
+    P,d,r = M0*M1,M0.det,M0.rank;
+    numpylimit,mmatrix.numpylimit = mmatrix.numpylimit,1<<30;
+    try :
+      M = matrix(M0);    # without cached det and rank
+      Q,e,s = M0*M1,M.det,M.rank;
+    finally :
+      mmatrix.numpylimit = numpylimit;
+    if isinstance(M0[0,0],int) :
+      ceq('v[0] == v[1] and v[2] == v[3] and v[4] == v[5]',P,Q,d,e,r,s);
+    else :
+      ceq('abs(v[0]-v[1]).real < 1e-9*abs(v[0]).real',P,Q);
+      ceq('abs(v[0]-v[1]) < 1e-9*abs(v[0])',d,e);
+    if r == n :
+      ceq('abs(v[0]*v[0].inverse-v[1]).real < 1e-6',M0,I);
+  M = matrix(n,n,tuple(randint(-9,9) for i in xrange(n*n)));
+  M[:,n-1] = M[:,0]+M[:,1];    # singular, but float elimination may not see it
+  try :
+    M.inverse;
+    print('inverse of singular integer matrix succeeded');
+  except ZeroDivisionError :
+    pass;
+
+def testint(dim) :    # exact integer rank and det test, against Bareiss elimination
+  for n in (dim,mmatrix.mmranklimit+dim,mmatrix.mmdetlimit+dim) :
+    M0,M1 = (matrix(n,n,tuple(randint(-9,9) for i in xrange(n*n))) for _ in xrange(2));
+    M2 = matrix(M0);
+    for i in xrange(n) :
+      M2[i,n-1] = M2[i,0]-3*M2[i,(n-1)//2] if n > 1 else 0;
+    ceq('(v[0]*v[1]).det == v[0].det*v[1].det',M0,M1);
+    x = [(M.det,M.rank) for M in (M0,M2)];
+    limits = mmatrix.mmranklimit,mmatrix.mmdetlimit;
+    mmatrix.mmranklimit = mmatrix.mmdetlimit = 1<<30;
+    try :
+      y = [(M.det,M.rank) for M in map(matrix,(M0,M2))];
+    finally :
+      mmatrix.mmranklimit,mmatrix.mmdetlimit = limits;
+    ceq('v[0] == v[1] and v[0][1][0] == 0',x,y);
+
+def testsolve(dim) :    # solve, lu, rref, nullspace test
+  R = zm(101);
+  for f in (lambda : xrational(random(),random()), lambda : R(randrange(101))) :
+    M,B = (matrix(dim,dim,tuple(f() for i in xrange(dim*dim))) for _ in xrange(2));
+    b = matrix(dim,tuple(f() for i in xrange(dim)));
+    P,L,U = M.lu;
+    ceq('v[0]*v[1] == v[2]*v[3]',P,M,L,U);
+    ceq('v[0].rref.rank == v[0].rank == v[0].rref.T.rank',M);
+    if M.rank == dim :
+      ceq('v[0]*v[0].solve(v[1]) == v[1]',M,b);
+      ceq('v[0]*v[0].solve(v[1]) == v[1]',M,B);
+      ceq('v[0]/v[1]*v[1] == v[0]',B,M);
+      ceq('v[0]/v[1]*v[1] == v[0]',b,M);
+    M[dim-1,:] = M[0,:]*(2 if dim > 1 else 0);    # make singular, invalidating cached factorization
+    N = M.nullspace;
+    ceq('len(v[1]) == v[2]-v[0].rank > 0',M,N,dim);
+    ceq('not any(map(v[0].__mul__,v[1]))',M,N);
+    ceq('v[0].rref == v[0].rref.rref',M);
+    ceq('v[0].det == 0*v[0][0,0] and type(v[0].det) == type(v[0][0,0])',M);
+  n = dim+2;
+  for f in (lambda : randint(-5,5), random) :    # equal columns
+    M = matrix(n,n,tuple(f() for i in xrange(n*n)));
+    M[:,n-1] = M[:,0];
+    ceq('v[0].rank == v[1]-1',M,n);
+    if not isint(M[0,0]) : continue;    # float singularity tests are inexact
+    for g in ('v[0].inverse','v[0].solve([1]*v[1])') :
+      try :
+        eval(g,None,{'v':(matrix(M),n)});
+        print('%s succeeded for singular matrix'%(g));
+        print(M);
+      except ZeroDivisionError :
+        pass;
+
 def testattr(dim,verbose=False) :    # matrix attribute test
   I = matrix.Identity(dim);
   if I.dims != (dim,dim) :
@@ -128,6 +280,122 @@ def testb(dim) :
   ceq('(v[0]+v[1]).tr == (v[0].tr+v[1].tr)%2',M0,M1);
   testtr(M0,M1,M2);
 
+def testbm(dim) :
+  # bmatrix four Russians tests, against matrix over GF(2)
+  n = 2*mmatrix.m4rmbits+dim;
+  for k in (n,dim) :    # full and low rank
+    M0,M1 = bmatrix((n,k),randrange(1<<(n*k))),bmatrix((k,n+1),randrange(1<<(k*n+k)));
+    M2 = M0*M1;
+    N2 = matrix(M0)*matrix(M1);
+    N2.map(lambda x : GF2(x&1));
+    ceq('v[0] == bmatrix(v[1])',M2,N2);
+    ceq('v[0].rank == v[1].rank',M2,N2);
+    ceq('v[0].T == bmatrix(matrix(v[0]).T) and v[1].T == bmatrix(matrix(v[1]).T)',M0,M1);
+    ceq('bmatrix.fromrows(v[0].rows,v[1]) == v[0] == bmatrix.fromcolumns(v[0].columns,v[2])',M0,k,n);
+    ceq('v[0][1::2,-1::-3] == bmatrix(matrix(v[0])[1::2,-1::-3])',M0);
+    N0 = bmatrix(M0);
+    N0[1::2,:] = M0[:n//2,:];
+    ceq('v[0][1::2,:] == v[1][:v[2]//2,:] and v[0][::2,:] == v[1][::2,:]',N0,M0,n);
+    M2 = M2[:,:n];
+    if M2.det :
+      ceq('v[0]*v[0].inverse == v[0].Identity(v[1])',M2,n);
+    else :
+      ceq('v[0].rank < v[1]',M2,n);
+
+def testsb(dim) :
+  # sbmatrix tests, against bmatrix
+  n,m = 64+8*dim,80+8*dim;
+  S = sbmatrix(n,m,[[randrange(m) for j in xrange(randint(0,6))] for i in xrange(n)]);
+  D = bmatrix(S);
+  x,y = bmatrix((m,),randrange(1<<m)),bmatrix((n,),randrange(1<<n));
+  M = bmatrix((m,dim),randrange(1<<(m*dim)));
+  ceq('v[0] == sbmatrix(v[1]) and v[0].T == sbmatrix(v[1].T)',S,D);
+  ceq('v[0]*v[2] == v[1]*v[2] and v[3]*v[0] == v[3]*v[1] and v[0]*v[4] == v[1]*v[4]',
+      S,D,x,y,M);
+  ceq('bmatrix(v[0]*v[0].T) == v[1]*v[1].T',S,D);
+  N = S.nullspace();
+  ceq('0 < len(v[0]) <= min(64,v[1].dims[1]-v[1].rank) and not v[2]',
+      N,D,sum((S*x)._bits for x in N));
+  ceq('v[0]*v[0].solve(v[0]*v[1]) == v[0]*v[1]',S,x);
+  S = sbmatrix(2,3,[[2],[]]);
+  ceq('v[0][0,2] == v[0][0,-1] == 1 and v[0][1,-1] == 0',S);
+  try :
+    S[0,3];
+    print('sbmatrix index out of range succeeded');
+  except IndexError :
+    pass;
+
+def testsm(dim) :
+  # smatrix tests, against matrix, over rationals, a finite field, and ints
+  n,m,p = 3+dim,2+2*dim,dim;
+  F = ffield(5,2);
+  for e in (lambda : rational(randint(-9,9),randint(1,9)), lambda : F(randrange(25)),
+            lambda : randint(-9,9)) :
+    S = smatrix(n,m,dict(((randrange(n),randrange(m)),e()) for i in xrange(2*n)));
+    D = matrix(S);
+    S1 = smatrix(m,p,dict(((randrange(m),randrange(p)),e()) for i in xrange(m)));
+    A,B = matrix(m,p,[e() for i in xrange(m*p)]),matrix(p,n,[e() for i in xrange(p*n)]);
+    x,y = matrix(m,[e() for i in xrange(m)]),matrix(n,[e() for i in xrange(n)]);
+    ceq('v[0] == smatrix(v[1]) and v[0].T == smatrix(v[1].T)',S,D);
+    ceq('v[0] == smatrix.fromcsr(v[0].dims[1],*v[0].csr) and v[0].nnz == len(v[0].dok)',S);
+    ceq('v[0]*v[2] == v[1]*v[2] and v[3]*v[0] == v[3]*v[1]',S,D,A,B);
+    ceq('v[0]*v[2] == v[1]*v[2] and v[3]*v[0] == v[3]*v[1]',S,D,x,y);
+    ceq('matrix(v[0]*v[2]) == v[1]*matrix(v[2])',S,D,S1);
+    ceq('matrix(v[0]+v[0]) == v[1]+v[1] and v[0]+v[1] == v[1]+v[0] == v[1]+v[1]',S,D);
+    ceq('not v[0]-v[0] and matrix(3*v[0]) == 3*v[1] and matrix(-v[0]) == -v[1]',S,D);
+
+def testaxes(dim) :
+  # reductions and map along dimensions, against slices
+  a,b,c = dim,dim+1,dim+2;
+  for e in (lambda : rational(randint(-9,9),randint(1,9)), lambda : randint(-9,9)) :
+    M = matrix(a,b,c,[e() for i in xrange(a*b*c)]);
+    for f in ('sum','product','max','min','median','mean') :
+      R = getattr(M,f)(2);
+      ceq('v[0] == v[1]',[R[i,j] for j in xrange(b) for i in xrange(a)],
+          [getattr(M[i,j,:],f)() for j in xrange(b) for i in xrange(a)]);
+      R = getattr(M,f)(0,2);
+      ceq('v[0] == v[1]',[R[j] for j in xrange(b)],
+          [getattr(M[:,j,:].reshape(a*c),f)() for j in xrange(b)]);
+    N = matrix(M);
+    N.map(lambda x : x[::-1],1);
+    ceq('v[0] == v[1]',[N[i,j,k] for i in xrange(a) for j in xrange(b) for k in xrange(c)],
+        [M[i,b-1-j,k] for i in xrange(a) for j in xrange(b) for k in xrange(c)]);
+  n = 4*mmatrix.numpylimit+dim;    # large enough for numpy, but float sums are python's
+  M = matrix(n,n,[random() for i in xrange(n*n)]);
+  R = M.sum(0);
+  ceq('v[0] == v[1]',[R[j] for j in xrange(n)],[sum(M[:,j]) for j in xrange(n)]);
+
+def testview(dim) :
+  # matrixview tests, against copying slices
+  a,b,c = dim+1,dim+2,dim;
+  M = matrix(a,b,c,[randint(-9,9) for i in xrange(a*b*c)]);
+  V = M.view;
+  ceq('v[0][1:,::-2,0].copy() == v[1][1:,::-2,0] and v[0][:,0,:].T.copy() == v[1][:,0,:].T',
+      V,M);
+  ceq('v[0].squeeze.copy() == v[1].squeeze and v[0][-1::-1,:,::2] == v[1][-1::-1,:,::2]',
+      V,M);
+  W = V[::-1,1,:].T;    # c x a
+  N = matrix(M);
+  W[:,:] = range(a*c);
+  W[c-1,0] = 99;
+  for i in xrange(a) :
+    for k in xrange(c) :
+      N[a-1-i,1,k] = 99 if (k,i) == (c-1,0) else k+c*i;
+  ceq('v[0] == v[1] and v[2] == v[3]',M,N,W,N[::-1,1,:].T);
+
+def testexpm(dim) :
+  # matrix exponential tests
+  M = matrix(dim,dim,[random()*4-2 for i in xrange(dim*dim)]);
+  ceq('abs(v[0].expm()*(-v[0]).expm()-matrix.Identity(v[1])) < 1e-12*v[1]',M,dim);
+  R = matrix(dim,dim,[rational(x).approximate(1<<16) for x in M[:]]);
+  ceq('abs(v[0].expm()-v[1].expm().mapped(float)) < 1e-13*abs(v[0].expm())',
+      matrix(R).mapped(float),R);
+  D = matrix.Identity(dim,rational(1,3));
+  D[0,0] = rational(-5,2);
+  E = matrix.Identity(dim,exp(rational(1,3)));
+  E[0,0] = exp(rational(-5,2));
+  ceq('max(map(abs,(v[0].expm()-v[1])[:])) < 2**-72',D,E);
+
 def testm(dim) :
   # simple matrix tests
   M0,M1,M2 = (matrix(dim,dim,
@@ -149,15 +417,57 @@ def testtr(M0,M1,M2) :
   ceq('(v[0]*v[1]*v[2]).tr == (v[1]*v[2]*v[0]).tr == (v[2]*v[0]*v[1]).tr',M0,M1,M2)
   ceq('v[0]**3 == v[0]*v[0]*v[0]',M0);
 
+def btimetest(n) :    # bmatrix transpose and multiply timing
+  M0,M1 = (bmatrix((n,n),randrange(1<<(n*n))) for _ in xrange(2));
+  t = default_timer();
+  M0.T;
+  t,u = default_timer(),default_timer()-t;
+  M0*M1;
+  print('%d\tT\t%.3f\tmultiply\t%.3f'%(n,u,default_timer()-t));
+
+def stimetest(n) :    # exact matrix multiply timing, against schoolbook dot products
+  F = ffield(2,64);
+  for name,e in (('rational',lambda : rational(randint(-99,99),randint(1,99))),
+                 ('GF(2^64)',lambda : F(randrange(1<<64)))) :
+    M0,M1 = (matrix(n,n,[e() for i in xrange(n*n)]) for _ in xrange(2));
+    v0,v1 = M0[:],M1[:];
+    t = default_timer();
+    v = [mmatrix.dot(v0[i::n],v1[k*n:(k+1)*n]) for k in xrange(n) for i in xrange(n)];
+    t,u = default_timer(),default_timer()-t;
+    M = M0*M1;
+    print('%d\t%s\tschoolbook\t%.3f\tmatmul\t%.3f'%(n,name,u,default_timer()-t));
+    ceq('v[0] == v[1]',M[:],v);
+
 if __name__=='__main__' :
+  import sys
+  if '-t' in sys.argv[1:] :    # timing only
+    for n in (1<<10,1<<11,1<<12,1<<13,1<<14) :
+      btimetest(n);
+    sys.exit();
+  if '-s' in sys.argv[1:] :    # timing only
+    stimetest(256);
+    sys.exit();
   for i in xrange(REPEATS) :
     dim = randint(MINDIM,MAXDIM);
     print(dim);
     testattr(dim);
     testm(dim);
     testb(dim);
+    testbm(dim);
+    testsb(dim);
+    testsm(dim);
+    testaxes(dim);
+    testview(dim);
+    testexpm(dim);
     testcp(dim);
+    testmp(dim);
+    testsw(dim);
+    testdixon(dim);
     testinv(dim);
+    testbi(dim);
+    testsolve(dim);
+    if mmatrix.np : testnp(dim);
+    testint(dim);
     djm = randint(MINDIM,MAXDIM);
     dkm = randint(MINDIM,MAXDIM);
     dlm = randint(MINDIM,MAXDIM);
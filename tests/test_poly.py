@@ -6,7 +6,8 @@ import sys
 from random import Random
 from msmath.rational import rational
 from msmath.conversions import zits
-from msmath.numfuns import primepower, divisors, isirreducible, irreducible_count
+from msmath import numfuns
+from msmath.numfuns import primepower, divisors, isirreducible, irreducible_count, mpmul, mpmod, mpdivrem
 from msmath.poly import polynomial, rationalfunction
 from msmath.ffield import ffield
 from msmath.ffpoly import irreducibles
@@ -160,6 +161,23 @@ def optests() :
     testpops(*r);
     testpgcd(*r[:2]);
 
+def kroneckertest() :    # compare Kronecker substitution with schoolbook products
+  limit = numfuns.kroneckerlimit;
+  for p in (2,3,251,2**61-1) :
+    F = ffield(p);
+    for i in range(OPREPEATS) :
+      f = tuple(randrange(p) for j in range(randint(1,4*limit)));
+      g = (randrange(1,p),)+tuple(randrange(p) for j in range(randint(0,2*limit)));
+      r = [];
+      for numfuns.kroneckerlimit in (limit,1<<30) :
+        r.append((mpmul(p,f,g),mpmod(p,f,g),mpdivrem(p,f,g),mpmul(p,f,f,g),
+                  polynomial(*f).mapcoeffs(F)*polynomial(*g).mapcoeffs(F),
+                  polynomial(*f)*polynomial(*(-x for x in g))));
+      numfuns.kroneckerlimit = limit;
+      if r[0] != r[1] :
+        error('Kronecker substitution failure for %d, %s, %s'%(p,f,g));
+    dotprint();
+
 def testattr() :
   x = polynomial(1,0);
   o = polynomial(1);
@@ -190,4 +208,6 @@ if __name__ == '__main__' :
     if primepower(q) : testir(ffield(q));
   print('\nrandom polynomial ops test, gcd test')
   optests();
+  dotprint('\nKronecker substitution test');
+  kroneckertest();
   print('\nCompleted');